@@ -1,5 +1,16 @@
 from .uteis import *
+from .movimentos import *
+from .orcamento import *
+from .rastro import *
+from .amostragem import *
+from .ranqueamento import *
+from .enxame import *
+from .limites import *
 from .construtivos import *
 from .metaheuristicas import *
 from .refinamento import *
-from .levy import *
\ No newline at end of file
+# Nomes explícitos: o módulo e a função dinkelbach têm o mesmo nome, e Metodos.dinkelbach fica sendo a função.
+from .dinkelbach import MAXIMO_VARIAVEIS_MILP, TEMPO_LIMITE_MILP, dinkelbach, dinkelbach_milp, maximiza_parametrico, valor_parametrico
+from .levy import *
+from .paralelo import *
+from .instrumentacao import *
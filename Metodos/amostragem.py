@@ -0,0 +1,109 @@
+from random import random, randrange
+from typing import List
+
+class AmostradorPonderado:
+    """
+    Roleta sobre os índices 0..n-1 com pesos não negativos, armazenada em árvores de Fenwick (uma dos pesos e outra dos índices ativos). Sorteio, atualização de peso e remoção custam O(log n), então a roleta não precisa ser reconstruída a cada corredor escolhido.
+
+    O sorteio consome um único random(), como o random.choices, e percorre os índices ativos em ordem crescente (a mesma ordem de um dicionário índice -> peso construído em ordem e do qual os escolhidos são retirados).
+
+    Args:
+        pesos (List[float]): Peso inicial de cada índice (todos começam ativos).
+    """
+
+    def __init__(self, pesos: List[float]):
+        self.n = len(pesos)
+        self.pesos = list(pesos)
+        self.quantidade = self.n        # Quantidade de índices ativos.
+
+        # Construindo as árvores em O(n).
+        self.arvore = [0] + self.pesos
+        self.ativos = [0] + [1] * self.n
+        for posicao in range(1, self.n + 1):
+            pai = posicao + (posicao & -posicao)
+            if pai <= self.n:
+                self.arvore[pai] += self.arvore[posicao]
+                self.ativos[pai] += self.ativos[posicao]
+
+        self.passo_inicial = 1 << (self.n.bit_length() - 1) if self.n else 0
+
+    def _soma(self, arvore: list, posicao: int):
+        soma = 0
+        while posicao > 0:
+            soma += arvore[posicao]
+            posicao -= posicao & -posicao
+        return soma
+
+    def _altera(self, arvore: list, indice: int, delta):
+        posicao = indice + 1
+        while posicao <= self.n:
+            arvore[posicao] += delta
+            posicao += posicao & -posicao
+
+    def _busca(self, arvore: list, valor) -> int:
+        # Maior posição cuja soma acumulada é menor ou igual ao valor, ou seja, o índice do primeiro elemento cuja soma acumulada passa do valor.
+        posicao = 0
+        passo = self.passo_inicial
+        while passo:
+            proxima = posicao + passo
+            if proxima <= self.n and arvore[proxima] <= valor:
+                posicao = proxima
+                valor -= arvore[proxima]
+            passo >>= 1
+        return posicao
+
+    def total(self):
+        """
+        Returns:
+            total (float): Soma dos pesos dos índices ativos.
+        """
+
+        return self._soma(self.arvore, self.n)
+
+    def atualiza(self, indice: int, peso: float):
+        """
+        Função responsável por alterar o peso de um índice ativo.
+
+        Args:
+            indice (int): Índice.
+            peso (float): Novo peso.
+        """
+
+        self._altera(self.arvore, indice, peso - self.pesos[indice])
+        self.pesos[indice] = peso
+
+    def remove(self, indice: int):
+        """
+        Função responsável por retirar um índice da roleta.
+
+        Args:
+            indice (int): Índice ativo.
+        """
+
+        self.atualiza(indice, 0)
+        self._altera(self.ativos, indice, -1)
+        self.quantidade -= 1
+
+    def k_esimo(self, k: int) -> int:
+        """
+        Returns:
+            indice (int): k-ésimo índice ativo (a partir de 0), em ordem crescente.
+        """
+
+        return self._busca(self.ativos, k)
+
+    def sorteia(self) -> int:
+        """
+        Função responsável por sortear um índice ativo com probabilidade proporcional ao peso (o primeiro índice cuja soma acumulada é maior que o valor sorteado, como no random.choices). Se todos os pesos forem zero, sorteia um índice ativo de forma uniforme (como random.choice).
+
+        Returns:
+            indice (int): Índice sorteado.
+        """
+
+        total = self.total()
+        if total == 0:
+            return self.k_esimo(randrange(self.quantidade))
+
+        # Por arredondamento, o valor sorteado pode passar da soma total, e então o último índice ativo é escolhido.
+        indice = self._busca(self.arvore, random() * total)
+        return indice if indice < self.n else self.k_esimo(self.quantidade - 1)
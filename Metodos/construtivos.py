@@ -1,7 +1,8 @@
 import Metodos
+import numpy as np
 import Processa
-from collections import defaultdict, deque
-from random import choice, choices, randint, shuffle
+from collections import deque
+from random import randint, shuffle
 from time import perf_counter
 
 def hibrida(problema: Processa.Problema) -> Metodos.Solucao:
@@ -17,61 +18,31 @@ def hibrida(problema: Processa.Problema) -> Metodos.Solucao:
         solucao (Solucao): Dataclass representando a solução construída, incluindo estruturas auxiliares.
     """
 
-    sol = Metodos.Solucao(
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        [],
-        [0 for _ in range(problema.a)],
-        [],
-        [0 for _ in range(problema.o)],
-        0,
-        0,
-        0.0,
-        perf_counter()
-    )
-
-    # Calculando a demanda de cada item.
-    demanda_por_item = defaultdict(int)             # Dicionário da soma total da demanda de cada item em todos os pedidos.
-    for pedido in problema.orders:
-        for item, qtd in pedido.items():
-            demanda_por_item[item] += qtd
-
-    # Calculando o peso de cada corredor com base na demanda e na quantidade ofertada.
-    # Peso de cada corredor é calculado com base na demanda dos itens e na quantidade que ele oferece.
-    peso_corredores = {indice: sum(demanda_por_item[item] * qnt for item, qnt in problema.aisles[indice].items()) for indice in range(problema.a)}
-
-    # Buscando a melhor solução até ficar 3 iterações seguidas sem encontrar uma melhor.
+    sol = Metodos.Solucao.vazia(problema, perf_counter())
+
+    # Roleta dos corredores, com o peso calculado com base na demanda dos itens e na quantidade que ele oferece (calculado uma única vez por problema).
+    roleta = Metodos.AmostradorPonderado(problema.peso_corredores.tolist())
+
+    # Buscando a melhor solução até ficar 3 iterações seguidas sem encontrar uma melhor (ou até o limite superior provar que nenhum corredor a mais melhora o objetivo).
     tentativas_sem_melhora = 0
-    while tentativas_sem_melhora < 3 and peso_corredores:
+    while tentativas_sem_melhora < 3 and roleta.quantidade and not Metodos.poda_corredor(problema, sol):
         copiaSol = sol.clone()
 
         # Selecionando um corredor ainda não utilizado.
         # Se todos os pesos forem zero, escolhe aleatoriamente. Caso contrário, utiliza seleção ponderada proporcional ao peso.
-        total = sum(peso_corredores.values())
-        if total == 0:
-            corredor = choice(list(peso_corredores.keys()))
-        else:
-            escolhas, prob = zip(*[(indice, peso / total) for indice, peso in peso_corredores.items()])
-            corredor = choices(escolhas, weights=prob, k=1)[0]
+        corredor = roleta.sorteia()
 
         # Atualizando universo dos corredores.
-        copiaSol.corredores.append(corredor)
-        copiaSol.corredoresDisp[corredor] = 1
-        copiaSol.qntCorredores += 1
-
-        for item, qnt in problema.aisles[corredor].items():
-            copiaSol.itensC[item] += qnt
-            copiaSol.universoC[item] += qnt
+        Metodos.adiciona_corredor(problema, copiaSol, corredor)
 
         # Adicionando pedidos se possível.
         Metodos.adiciona_pedidos(problema, copiaSol)
 
         # Comparando as soluções, e salvando a atual caso seja melhor.
-        copiaSol.objetivo = Metodos.funcao_objetivo(problema, copiaSol.itensP, copiaSol.itensC) / copiaSol.qntCorredores
+        copiaSol.objetivo = Metodos.funcao_objetivo_incremental(problema, copiaSol) / copiaSol.qntCorredores
         if copiaSol.objetivo > sol.objetivo or copiaSol.qntItens < problema.lb or copiaSol.qntItens == 0:
             sol = copiaSol
-            peso_corredores.pop(corredor)
+            roleta.remove(corredor)
             tentativas_sem_melhora = 0
         else:
             tentativas_sem_melhora += 1
@@ -97,49 +68,22 @@ def aleatorio(problema: Processa.Problema) -> Metodos.Solucao:
         solucao (Solucao): Dataclass representando a solução construída, incluindo estruturas auxiliares.
     """
 
-    solucao = Metodos.Solucao(
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        [],
-        [0 for _ in range(problema.a)],
-        [],
-        [0 for _ in range(problema.o)],
-        0,
-        0,
-        0.0,
-        perf_counter()
-    )
+    solucao = Metodos.Solucao.vazia(problema, perf_counter())
 
     corredores_selecionados = list(range(problema.a))       # Lista dos corredores embaralhados.
     shuffle(corredores_selecionados)
+    tamanho = problema.tamanho_pedidos.tolist()             # Quantidade total de itens de cada pedido.
 
     # Percorrendo os corredores.
     for corredor in corredores_selecionados:
         nova_solucao = solucao.clone()
 
         # Atualizando universo dos corredores.
-        nova_solucao.corredores.append(corredor)
-        nova_solucao.corredoresDisp[corredor] = 1
-        nova_solucao.qntCorredores += 1
-
-        for item, qnt in problema.aisles[corredor].items():
-            nova_solucao.itensC[item] += qnt
-            nova_solucao.universoC[item] += qnt
+        Metodos.adiciona_corredor(problema, nova_solucao, corredor)
 
         # Verificando os pedidos disponíveis.
-        pedidos_sorteados = []                              # Lista dos pedidos possíveis aleatórios.
-        quantidade = 0                                      # Quantidade de pedidos possíveis.
-        for indice in range(problema.o):
-            if not nova_solucao.pedidosDisp[indice]:
-                valida = True
-                for item, qnt in problema.orders[indice].items():
-                    if qnt > nova_solucao.universoC[item]:
-                        valida = False
-                        break
-                if valida:
-                    pedidos_sorteados.append(indice)
-                    quantidade += 1
+        pedidos_sorteados = Metodos.pedidos_viaveis(problema, nova_solucao)     # Lista dos pedidos possíveis aleatórios.
+        quantidade = len(pedidos_sorteados)                 # Quantidade de pedidos possíveis.
 
         # Adicionando os pedidos.
         if quantidade:
@@ -150,24 +94,11 @@ def aleatorio(problema: Processa.Problema) -> Metodos.Solucao:
             limite_pedidos = randint(1, quantidade) if nova_solucao.qntItens > problema.lb else quantidade
 
             for indice in pedidos_sorteados[:limite_pedidos]:
-                if not nova_solucao.pedidosDisp[indice]:
-                    valida = True
-                    soma = 0
-                    for item, qnt in problema.orders[indice].items():
-                        soma += qnt
-                        if qnt > nova_solucao.universoC[item]:
-                            valida = False
-                            break
-                    if valida and nova_solucao.qntItens + soma <= problema.ub:
-                        nova_solucao.qntItens += soma
-                        nova_solucao.pedidosDisp[indice] = 1
-                        nova_solucao.pedidos.append(indice)
-                        for item, qnt in problema.orders[indice].items():
-                            nova_solucao.universoC[item] -= qnt
-                            nova_solucao.itensP[item] += qnt
+                if not nova_solucao.pedidosDisp[indice] and nova_solucao.qntItens + tamanho[indice] <= problema.ub and Metodos.pedido_viavel(problema, nova_solucao, indice):
+                    Metodos.adiciona_pedido(problema, nova_solucao, indice)
 
         # Verificando a nova solução.
-        nova_solucao.objetivo = Metodos.funcao_objetivo(problema, nova_solucao.itensP, nova_solucao.itensC) / nova_solucao.qntCorredores
+        nova_solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, nova_solucao) / nova_solucao.qntCorredores
         if nova_solucao.objetivo > solucao.objetivo or nova_solucao.qntItens < problema.lb or nova_solucao.qntItens == 0:
             solucao = nova_solucao
         else:
@@ -193,81 +124,101 @@ def gulosa(problema: Processa.Problema) -> Metodos.Solucao:
         solucao (Solucao): Dataclass representando a solução construída, incluindo estruturas auxiliares.
     """
     # Inicializa solução
-    solucao = Metodos.Solucao(
-        {i: 0 for i in range(problema.i)},  # universoC
-        {i: 0 for i in range(problema.i)},  # itensC
-        {i: 0 for i in range(problema.i)},  # itensP
-        [],  # corredores selecionados
-        [0] * problema.a,  # corredoresDisp
-        [],  # pedidos selecionados
-        [0] * problema.o,  # pedidosDisp
-        0,  # qntItens
-        0,  # qntCorredores
-        0.0,  # objetivo
-        perf_counter()  # tempo inicial
-    )
-
-    # Buscando a melhor solução até ficar 3 iterações seguidas sem encontrar uma melhor.
+    solucao = Metodos.Solucao.vazia(problema, perf_counter())
+
+    # Buscando a melhor solução até ficar 3 iterações seguidas sem encontrar uma melhor (ou até o limite superior provar que nenhum corredor a mais melhora o objetivo).
     tentativas_sem_melhora = 0
 
-    # Ranqueando pedidos e corredores.
-    pedidos_ranqueados, corredores_ranqueados = Metodos.ranqueamento_guloso(problema, solucao)
+    # Ranqueando pedidos e corredores (atualizado de forma incremental a cada corredor e pedidos aceitos).
+    ranqueamento = Metodos.RanqueamentoGuloso(problema, solucao)
+    tamanho = problema.tamanho_pedidos.tolist()     # Quantidade total de itens de cada pedido.
+    corredor = ranqueamento.melhor_corredor()
 
-    while tentativas_sem_melhora < 3 and corredores_ranqueados:
+    while tentativas_sem_melhora < 3 and corredor >= 0 and not Metodos.poda_corredor(problema, solucao):
 
         # Selecionando o corredor de maior nota
         copiaSolucao = solucao.clone()
-        corredor = corredores_ranqueados.pop()
 
         # Atualizando universo dos corredores
-        copiaSolucao.corredores.append(corredor)
-        copiaSolucao.corredoresDisp[corredor] = 1
-        copiaSolucao.qntCorredores += 1
-
-        # Atualizando itens dos corredores selecionados
-        for item, qnt in problema.aisles[corredor].items():
-            copiaSolucao.itensC[item] += qnt
-            copiaSolucao.universoC[item] += qnt
+        Metodos.adiciona_corredor(problema, copiaSolucao, corredor)
 
         # Adicionando pedidos
-        pedidos_viaveis = []                        # Lista de pedidos viáveis com os corredores atualmente selecionados.
-        for indice in pedidos_ranqueados:
-            if not copiaSolucao.pedidosDisp[indice]:
-                valida = True
-                itens_totais = 0
-                for item, qnt in problema.orders[indice].items():
-                    itens_totais += qnt
-                    if qnt > copiaSolucao.universoC[item]:
-                        valida = False
-                        break
-                if valida:
-                    pedidos_viaveis.append([indice, itens_totais])
+        pedidos_viaveis = [[indice, tamanho[indice]] for indice in ranqueamento.ordena_pedidos(Metodos.pedidos_viaveis(problema, copiaSolucao))]     # Lista de pedidos viáveis com os corredores atualmente selecionados, na ordem do ranqueamento.
 
         for pedido in pedidos_viaveis:
-            valida = True
-            for item, qnt in problema.orders[pedido[0]].items():
-                if qnt > copiaSolucao.universoC[item]:
-                    valida = False
-                    break
-            if valida and copiaSolucao.qntItens + pedido[1] <= problema.ub:
-                copiaSolucao.qntItens += pedido[1]
-                copiaSolucao.pedidosDisp[pedido[0]] = 1
-                copiaSolucao.pedidos.append(pedido[0])
-                for item, qnt in problema.orders[pedido[0]].items():
-                    copiaSolucao.universoC[item] -= qnt
-                    copiaSolucao.itensP[item] += qnt
+            if copiaSolucao.qntItens + pedido[1] <= problema.ub and Metodos.pedido_viavel(problema, copiaSolucao, pedido[0]):
+                Metodos.adiciona_pedido(problema, copiaSolucao, pedido[0])
 
         # Comparando as soluções, e salvando a atual caso seja melhor
-        copiaSolucao.objetivo = Metodos.funcao_objetivo(problema, copiaSolucao.itensP, copiaSolucao.itensC) / copiaSolucao.qntCorredores
+        copiaSolucao.objetivo = Metodos.funcao_objetivo_incremental(problema, copiaSolucao) / copiaSolucao.qntCorredores
         if copiaSolucao.objetivo > solucao.objetivo or copiaSolucao.qntItens < problema.lb:
+            # Retirando o corredor e os novos pedidos do ranqueamento.
+            ranqueamento.remove_corredor(corredor)
+            ranqueamento.remove_pedidos(copiaSolucao.pedidos[len(solucao.pedidos):])
             solucao = copiaSolucao
             tentativas_sem_melhora = 0
         else:
             tentativas_sem_melhora += 1
-        
-        # Ranqueando pedidos e corredores novamente.
-        pedidos_ranqueados, corredores_ranqueados = Metodos.ranqueamento_guloso(problema, solucao)
+
+        corredor = ranqueamento.melhor_corredor()
 
     solucao.tempo = perf_counter() - solucao.tempo
 
-    return solucao
\ No newline at end of file
+    return solucao
+
+def parametrica(problema: Processa.Problema, orcamento: Metodos.Orcamento = None) -> Metodos.Solucao:
+    """
+    Heurística construtiva paramétrica na quantidade de corredores.
+
+    Segue a sequência da gulosa (corredor de maior nota no ranqueamento e pedidos viáveis na ordem do ranqueamento), mas, em vez de parar na primeira adição sem melhora, continua adicionando corredores enquanto alguma quantidade maior de corredores ainda puder superar a melhor solução encontrada, segundo os limites superiores (ver limites_superiores).
+
+    As quantidades de corredores cujo limite não passa da melhor solução são puladas: o corredor é adicionado, mas os pedidos só são alocados na próxima quantidade avaliada.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
+
+    Returns:
+        solucao (Solucao): Dataclass representando a melhor solução da sequência, incluindo estruturas auxiliares.
+    """
+
+    inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+    solucao = Metodos.Solucao.vazia(problema)
+    melhor = Metodos.Solucao.vazia(problema)
+
+    # Limite de cada quantidade de corredores e maior limite de cada quantidade em diante.
+    limites = Metodos.limites_superiores(problema)
+    restantes = np.maximum.accumulate(limites[::-1])[::-1]
+
+    ranqueamento = Metodos.RanqueamentoGuloso(problema, solucao)
+    tamanho = problema.tamanho_pedidos.tolist()     # Quantidade total de itens de cada pedido.
+    corredor = ranqueamento.melhor_corredor()
+
+    while corredor >= 0 and restantes[solucao.qntCorredores + 1] > melhor.objetivo and not orcamento.esgotado():
+        # Adicionando o corredor de maior nota.
+        Metodos.adiciona_corredor(problema, solucao, corredor)
+        quantidade = len(solucao.pedidos)
+
+        # Alocando os pedidos apenas se esta quantidade de corredores ainda pode superar a melhor solução.
+        if limites[solucao.qntCorredores] > melhor.objetivo:
+            for pedido in ranqueamento.ordena_pedidos(Metodos.pedidos_viaveis(problema, solucao)):
+                if solucao.qntItens + tamanho[pedido] <= problema.ub and Metodos.pedido_viavel(problema, solucao, pedido):
+                    Metodos.adiciona_pedido(problema, solucao, pedido)
+
+            solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+            if solucao.objetivo > melhor.objetivo:
+                melhor = solucao.clone()
+
+        # Retirando o corredor e os novos pedidos do ranqueamento (depois da alocação, como na gulosa).
+        ranqueamento.remove_corredor(corredor)
+        ranqueamento.remove_pedidos(solucao.pedidos[quantidade:])
+
+        corredor = ranqueamento.melhor_corredor()
+
+    # Sem nenhuma solução viável, retorna a última da sequência.
+    if melhor.qntCorredores == 0:
+        melhor = solucao
+    melhor.tempo = perf_counter() - inicio
+
+    return melhor
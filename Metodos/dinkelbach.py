@@ -0,0 +1,213 @@
+import Metodos
+import numpy as np
+import Processa
+from math import inf
+from time import perf_counter
+
+TEMPO_LIMITE_MILP = 60.0        # Tempo máximo padrão, em segundos, para todos os modelos do dinkelbach_milp.
+MAXIMO_VARIAVEIS_MILP = 20000   # Quantidade máxima padrão de variáveis (pedidos + corredores) para usar o modelo exato.
+
+def valor_parametrico(problema: Processa.Problema, solucao: Metodos.Solucao, lam: float) -> float:
+    """
+    Função responsável por calcular o objetivo do subproblema paramétrico de Dinkelbach: itens - lam * corredores.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        lam (float): Parâmetro (razão itens / corredores da solução incumbente).
+
+    Returns:
+        valor (float): Valor do subproblema (-inf se a solução for inviável).
+    """
+
+    itens = Metodos.funcao_objetivo_incremental(problema, solucao)
+    if not itens or not solucao.qntCorredores:
+        return -inf
+    return itens - lam * solucao.qntCorredores
+
+def _candidatos(problema: Processa.Problema, solucao: Metodos.Solucao, vizinhos: int):
+    # Corredores candidatos para adicionar (os que mais cobrem a demanda dos pedidos fora da solução que a capacidade restante não cobre) e para remover (os que deixam menos itens descobertos).
+    itens_c, qnts_c, _ = problema.corredores_csr
+    restante = Metodos.vetor_itens(problema, solucao.universoC)
+    falta = np.maximum(problema.demanda_por_item - Metodos.vetor_itens(problema, solucao.itensP) - restante, 0)
+    selecionados = np.frombuffer(solucao.corredoresDisp, dtype=np.uint8).astype(bool)
+
+    ganho = np.bincount(problema.corredores_linha, weights=np.minimum(qnts_c, falta[itens_c]), minlength=problema.a)
+    livres = np.flatnonzero(~selecionados & (ganho > 0))
+    adicionar = livres[np.lexsort((livres, -ganho[livres]))][:vizinhos].tolist()
+
+    perda = np.bincount(problema.corredores_linha, weights=np.maximum(qnts_c - restante[itens_c], 0), minlength=problema.a)
+    usados = np.flatnonzero(selecionados)
+    remover = usados[np.lexsort((usados, perda[usados]))][:vizinhos].tolist() if len(usados) > 1 else []
+
+    return adicionar, remover
+
+def maximiza_parametrico(problema: Processa.Problema, solucao: Metodos.Solucao, lam: float, vizinhos: int = 10, orcamento: Metodos.Orcamento = None, movimento: Metodos.Movimento = None) -> Metodos.Solucao:
+    """
+    Busca local de melhor melhora para o subproblema paramétrico max(itens - lam * corredores).
+
+    A cada passo, avalia a adição dos corredores que mais cobrem a demanda ainda não atendida (seguida da adição gulosa de pedidos) e a remoção dos corredores que deixam menos itens descobertos (seguida da realocação gulosa dos pedidos), aplicando o melhor movimento enquanto ele aumentar o valor do subproblema. Como lam é fixo, o ganho de cada corredor é linear: um corredor compensa se trouxer mais de lam itens.
+
+    Cada vizinho é aplicado na própria solução, avaliado e desfeito (ver Movimento), e o melhor é aplicado de novo no fim do passo (as adições e remoções são determinísticas), sem clonar a solução.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares (alterada na própria solução).
+        lam (float): Parâmetro do subproblema.
+        vizinhos (int): Quantidade de corredores candidatos avaliados para adição e para remoção a cada passo.
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a solução atual.
+        movimento (Movimento | None): Registro em que os movimentos aplicados são acumulados, para desfazê-los (None não registra).
+
+    Returns:
+        solucao (Solucao): Dataclass representando a melhor solução encontrada para o subproblema (a própria solução informada).
+    """
+
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+    valor = valor_parametrico(problema, solucao, lam)
+    while not orcamento.esgotado():
+        adicionar, remover = _candidatos(problema, solucao, vizinhos)
+
+        melhor, melhor_valor = None, valor
+        for operacao, corredores in ((Metodos.adiciona_corredor_reversivel, adicionar), (Metodos.remove_corredor_reversivel, remover)):
+            for corredor in corredores:
+                passo = operacao(problema, solucao, corredor)
+                Metodos.adiciona_pedidos_reversivel(problema, solucao, passo)
+                vizinho_valor = valor_parametrico(problema, solucao, lam)
+                Metodos.desfaz_movimento(problema, solucao, passo)
+                if vizinho_valor > melhor_valor:
+                    melhor, melhor_valor = (operacao, corredor), vizinho_valor
+
+        if melhor is None:
+            break
+        operacao, corredor = melhor
+        passo = operacao(problema, solucao, corredor, movimento)
+        Metodos.adiciona_pedidos_reversivel(problema, solucao, passo)
+        valor = melhor_valor
+
+    return solucao
+
+def dinkelbach(problema: Processa.Problema, solucao: Metodos.Solucao, orcamento: Metodos.Orcamento = None, vizinhos: int = 10, rodadas: int = 50, rastro: Metodos.Rastro = None) -> Metodos.Solucao:
+    """
+    Método de Dinkelbach para o objetivo fracionário (itens / corredores).
+
+    A cada rodada, lam recebe a razão da solução incumbente e o subproblema linear max(itens - lam * corredores) é resolvido a partir dela (maximiza_parametrico). A incumbente tem valor 0 no subproblema, então qualquer solução com valor positivo tem razão maior que lam e se torna a nova incumbente. O método para quando o subproblema não encontra valor positivo (a razão não melhora).
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares (alterada na própria solução, que é retornada).
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
+        vizinhos (int): Quantidade de corredores candidatos avaliados para adição e para remoção a cada passo do subproblema.
+        rodadas (int): Quantidade máxima de atualizações de lam.
+        rastro (Rastro | None): Registro da convergência, com a razão da solução do subproblema, a melhor razão e lam de cada rodada.
+
+    Returns:
+        solucao (Solucao): Dataclass representando a melhor solução encontrada, incluindo estruturas auxiliares.
+    """
+
+    inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores if solucao.qntCorredores else 0.0
+
+    for rodada in range(rodadas):
+        if orcamento.esgotado():
+            break
+
+        # Resolvendo o subproblema com lam igual à razão da incumbente, na própria solução.
+        lam = solucao.objetivo
+        movimento = Metodos.Movimento(solucao)
+        maximiza_parametrico(problema, solucao, lam, vizinhos, orcamento, movimento)
+        objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+
+        if rastro is not None:
+            rastro.registra("Dinkelbach", rodada, objetivo, max(objetivo, lam), lam)
+
+        # Sem valor positivo no subproblema, a razão não melhora mais (e a incumbente é restaurada).
+        if objetivo <= lam:
+            Metodos.desfaz_movimento(problema, solucao, movimento)
+            break
+        solucao.objetivo = objetivo
+
+    solucao.tempo += perf_counter() - inicio
+    return solucao
+
+def _restricoes_milp(problema: Processa.Problema, sparse, LinearConstraint) -> list:
+    # Restrições do modelo, com as variáveis x (pedidos) seguidas de y (corredores): cobertura de cada item, limites lb e ub da quantidade de itens e pelo menos um corredor.
+    itens_p, qnts_p, _ = problema.pedidos_csr
+    itens_c, qnts_c, _ = problema.corredores_csr
+    linhas = np.concatenate((itens_p, itens_c))
+    colunas = np.concatenate((problema.pedidos_linha, problema.o + problema.corredores_linha.astype(np.int64)))
+    valores = np.concatenate((qnts_p, -qnts_c.astype(np.int64))).astype(np.float64)
+    cobertura = sparse.csr_array((valores, (linhas, colunas)), shape=(problema.i, problema.o + problema.a))
+
+    tamanho = np.concatenate((problema.tamanho_pedidos, np.zeros(problema.a))).astype(np.float64)
+    corredores = np.concatenate((np.zeros(problema.o), np.ones(problema.a)))
+    return [LinearConstraint(cobertura, -np.inf, 0), LinearConstraint(tamanho, problema.lb, problema.ub), LinearConstraint(corredores, 1, np.inf)]
+
+def dinkelbach_milp(problema: Processa.Problema, solucao: Metodos.Solucao, orcamento: Metodos.Orcamento = None, tempo_limite: float = TEMPO_LIMITE_MILP, rodadas: int = 20, maximo_variaveis: int = MAXIMO_VARIAVEIS_MILP, rastro: Metodos.Rastro = None) -> Metodos.Solucao:
+    """
+    Método de Dinkelbach com o subproblema max(itens - lam * corredores) resolvido de forma exata, como um modelo inteiro misto (MILP) resolvido pelo HiGHS (scipy.optimize.milp).
+
+    O modelo tem uma variável binária por pedido (x) e por corredor (y): cada item pedido precisa estar nos corredores selecionados (soma de x por item <= soma de y por item), a quantidade de itens fica entre lb e ub e há pelo menos um corredor. A solução inicial (normalmente a da gulosa) define o primeiro lam, então o primeiro modelo já só busca soluções melhores que ela.
+
+    Cada modelo recebe o tempo restante como limite (o pré-processamento do HiGHS pode passar um pouco dele). Se ele acabar, a melhor solução viável do modelo é usada (se houver); caso contrário, a solução heurística é retornada. Quando um modelo é resolvido até o fim sem valor positivo, a solução é ótima (dentro da tolerância do HiGHS). Instâncias grandes demais para o modelo exato retornam a solução heurística sem resolver nenhum modelo.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
+        tempo_limite (float): Tempo máximo, em segundos, para todos os modelos (além do orçamento).
+        rodadas (int): Quantidade máxima de modelos resolvidos.
+        maximo_variaveis (int): Quantidade máxima de variáveis (pedidos + corredores) para usar o modelo exato.
+        rastro (Rastro | None): Registro da convergência, com a razão da solução de cada modelo, a melhor razão e lam.
+
+    Returns:
+        solucao (Solucao): Dataclass representando a melhor solução encontrada, incluindo estruturas auxiliares.
+    """
+
+    inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+    prazo = Metodos.Orcamento(tempo_limite)
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores if solucao.qntCorredores else 0.0
+    if problema.o + problema.a > maximo_variaveis:
+        return solucao
+
+    from scipy import sparse
+    from scipy.optimize import Bounds, LinearConstraint, milp
+
+    restricoes = _restricoes_milp(problema, sparse, LinearConstraint)
+    tamanho = problema.tamanho_pedidos.astype(np.float64)
+    integralidade = np.ones(problema.o + problema.a)
+    limites = Bounds(0, 1)
+
+    for rodada in range(rodadas):
+        restante = min(orcamento.restante(), prazo.restante())
+        if restante <= 0:
+            break
+
+        # Maximizando itens - lam * corredores (o milp minimiza, então o objetivo é negado).
+        lam = solucao.objetivo
+        custo = np.concatenate((-tamanho, np.full(problema.a, lam)))
+        resultado = milp(custo, integrality=integralidade, bounds=limites, constraints=restricoes, options={"time_limit": restante})
+        if resultado.x is None:
+            break
+
+        # Montando a solução do modelo.
+        escolhidos = resultado.x > 0.5
+        candidata = Metodos.Solucao.vazia(problema)
+        for corredor in np.flatnonzero(escolhidos[problema.o:]).tolist():
+            Metodos.adiciona_corredor(problema, candidata, corredor)
+        for pedido in np.flatnonzero(escolhidos[:problema.o]).tolist():
+            Metodos.adiciona_pedido(problema, candidata, pedido)
+        candidata.objetivo = Metodos.funcao_objetivo_incremental(problema, candidata) / candidata.qntCorredores
+
+        if rastro is not None:
+            rastro.registra("MILP", rodada, candidata.objetivo, max(candidata.objetivo, lam), lam)
+
+        # Sem valor positivo no subproblema (ou com o modelo interrompido sem melhora), a razão não melhora mais.
+        if candidata.objetivo <= lam:
+            break
+        candidata.tempo = solucao.tempo     # A nova solução herda o tempo da heurística de partida.
+        solucao = candidata
+
+    solucao.tempo += perf_counter() - inicio
+    return solucao
@@ -0,0 +1,146 @@
+import Metodos
+import numpy as np
+import Processa
+from typing import List
+
+class EnxameCorredores:
+    """
+    Estado compacto do enxame do PSO: os corredores de cada partícula ficam em uma matriz de bits (partículas x corredores), e apenas as listas de corredores e pedidos, a quantidade de itens e o objetivo de cada partícula são mantidos (sem as estruturas auxiliares da Solucao).
+
+    A cada geração, a capacidade de itens de todas as partículas alteradas é calculada por um único produto da matriz de bits com a matriz esparsa corredores x itens. Em seguida, os pedidos candidatos de cada partícula são filtrados e ordenados de forma vetorizada, e a alocação gulosa (a mesma do adiciona_pedidos) só desconta a capacidade restante, sem atualizar os universos da Solucao. A Solucao completa só é montada para as partículas que se tornam a melhor do enxame.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucoes (List[Solucao]): Soluções iniciais das partículas.
+    """
+
+    def __init__(self, problema: Processa.Problema, solucoes: List[Metodos.Solucao]):
+        from scipy import sparse
+
+        self.problema = problema
+        self.sparse = sparse
+        itens_c, qnts_c, ptr_c = problema.corredores_csr
+        self.matriz_corredores = sparse.csr_matrix((qnts_c.astype(np.int64), itens_c, ptr_c), shape=(problema.a, problema.i))
+
+        self.bits = np.zeros((len(solucoes), problema.a), dtype=np.uint8)     # Matriz de bits partículas x corredores.
+        self.corredores = []                                                  # Corredores de cada partícula, na ordem de inserção.
+        self.pedidos = []                                                     # Pedidos de cada partícula, na ordem de inserção.
+        self.qntItens = []
+        self.objetivos = []
+        self.alteradas = np.ones(len(solucoes), dtype=bool)                   # Partículas cujos pedidos precisam ser realocados.
+        for particula, solucao in enumerate(solucoes):
+            self.bits[particula] = np.frombuffer(solucao.corredoresDisp, dtype=np.uint8)
+            self.corredores.append(solucao.corredores[:])
+            self.pedidos.append(solucao.pedidos[:])
+            self.qntItens.append(solucao.qntItens)
+            self.objetivos.append(solucao.objetivo)
+
+    def move(self, particula: int, velocidade: set):
+        """
+        Função responsável por aplicar uma velocidade na partícula, com a mesma semântica do adiciona_corredor e do remove_corredor (a partícula nunca fica sem corredores). Os pedidos são realocados no próximo avalia (partículas sem velocidade mantêm os pedidos já alocados).
+
+        Args:
+            particula (int): Índice da partícula.
+            velocidade (set): Corredores que serão adicionados (positivos) ou removidos (negativos, com problema.a representando o corredor 0).
+        """
+
+        corredores = self.corredores[particula]
+        bits = self.bits[particula]
+        for corredor in velocidade:
+            if corredor < 0 or corredor == self.problema.a:
+                # Removendo corredor.
+                corredor = -corredor if corredor < 0 else 0
+                if len(corredores) > 1:
+                    corredores.remove(corredor)
+                    bits[corredor] = 0
+            elif corredor < self.problema.a:
+                # Adicionando corredor.
+                corredores.append(corredor)
+                bits[corredor] = 1
+        if velocidade:
+            self.alteradas[particula] = True
+
+    def avalia(self, orcamento: Metodos.Orcamento = None) -> List[int]:
+        """
+        Função responsável por realocar os pedidos das partículas alteradas e calcular seus objetivos. Se o prazo acabar, as partículas restantes não são avaliadas.
+
+        Args:
+            orcamento (Orcamento | None): Prazo de execução.
+
+        Returns:
+            avaliadas (List[int]): Índices das partículas avaliadas.
+        """
+
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+        alteradas = np.flatnonzero(self.alteradas)
+        if not len(alteradas):
+            return []
+
+        # Calculando a capacidade de itens de todas as partículas alteradas com um único produto de matrizes.
+        capacidades = (self.sparse.csr_matrix(self.bits[alteradas], dtype=np.int64) @ self.matriz_corredores).toarray()
+
+        avaliadas = []
+        for particula, capacidade in zip(alteradas.tolist(), capacidades):
+            if orcamento.esgotado():
+                break
+            pedidos, qntItens = self._aloca_pedidos(capacidade)
+            self.pedidos[particula] = pedidos
+            self.qntItens[particula] = qntItens
+            self.objetivos[particula] = (qntItens if self.problema.lb <= qntItens <= self.problema.ub else 0) / len(self.corredores[particula])
+            self.alteradas[particula] = False
+            avaliadas.append(particula)
+
+        return avaliadas
+
+    def _aloca_pedidos(self, capacidade: np.ndarray):
+        # Alocação gulosa do adiciona_pedidos: pedidos que cabem na capacidade, do maior para o menor (empates pelo índice), aceitos se não quebram o ub nem a capacidade restante.
+        problema = self.problema
+        itens_p, qnts_p, _ = problema.pedidos_csr
+        tamanho = problema.tamanho_pedidos
+
+        # Filtrando e ordenando os candidatos de forma vetorizada.
+        faltantes = np.bincount(problema.pedidos_linha, weights=capacidade[itens_p] < qnts_p, minlength=problema.o)
+        candidatos = np.flatnonzero(faltantes == 0)
+        candidatos = candidatos[np.argsort(-tamanho[candidatos], kind="stable")]
+
+        # Selecionando os pedidos sobre a capacidade restante (lista, para o acesso por item ser barato).
+        orders = problema.orders
+        ub = problema.ub
+        resto = capacidade.tolist()
+        qntItens = 0
+        pedidos = []
+        for pedido, total in zip(candidatos.tolist(), tamanho[candidatos].tolist()):
+            if qntItens + total > ub:
+                continue
+            itens = orders[pedido].items()
+            for item, qnt in itens:
+                if qnt > resto[item]:
+                    break
+            else:
+                for item, qnt in itens:
+                    resto[item] -= qnt
+                pedidos.append(pedido)
+                qntItens += total
+                if qntItens == ub:
+                    break
+
+        return pedidos, qntItens
+
+    def solucao(self, particula: int) -> Metodos.Solucao:
+        """
+        Função responsável por montar a Solucao completa de uma partícula.
+
+        Args:
+            particula (int): Índice da partícula.
+
+        Returns:
+            solucao (Solucao): Dataclass representando a solução da partícula, incluindo estruturas auxiliares.
+        """
+
+        solucao = Metodos.Solucao.vazia(self.problema)
+        for corredor in self.corredores[particula]:
+            Metodos.adiciona_corredor(self.problema, solucao, corredor)
+        for pedido in self.pedidos[particula]:
+            Metodos.adiciona_pedido(self.problema, solucao, pedido)
+        solucao.objetivo = self.objetivos[particula]
+        return solucao
@@ -0,0 +1,139 @@
+import functools
+from time import perf_counter
+
+# Funções e métodos instrumentados: (caminho do módulo ou classe dentro de Metodos, nome).
+_FUNCOES = [
+    ("uteis", "adiciona_pedidos"),
+    ("uteis", "adiciona_corredor"),
+    ("uteis", "pedidos_removidos"),
+    ("uteis", "funcao_objetivo_incremental"),
+    ("movimentos", "adiciona_corredor_reversivel"),
+    ("movimentos", "remove_corredor_reversivel"),
+    ("movimentos", "troca_corredor_reversivel"),
+    ("movimentos", "adiciona_pedidos_reversivel"),
+    ("movimentos", "desfaz_movimento"),
+    ("metaheuristicas", "calcula_componente"),
+]
+_METODOS = [
+    ("Solucao", "clone"),
+    ("RanqueamentoGuloso", "melhor_corredor"),
+    ("RanqueamentoGuloso", "ordena_pedidos"),
+    ("RanqueamentoGuloso", "remove_corredor"),
+    ("RanqueamentoGuloso", "remove_pedidos"),
+    ("EnxameCorredores", "move"),
+    ("EnxameCorredores", "avalia"),
+    ("FPA", "poliniza"),
+    ("ALNS", "destruidor_aleatorio"),
+    ("ALNS", "destruidor_bx_prod"),
+    ("ALNS", "construtor_guloso"),
+    ("ALNS", "construtor_hibrido"),
+    ("ALNS", "construtor_aleatorio"),
+]
+
+_contadores = {}        # Nome -> [chamadas, tempo acumulado].
+_operadores = {}        # Operador do ALNS -> [vezes selecionado, vezes aceito].
+_originais = []         # (objeto, atributo, valor original) de tudo que foi substituído.
+
+def _envolve(nome: str, funcao):
+    # Conta as chamadas e acumula o tempo (inclusivo: chamadas aninhadas contam nas duas funções).
+    contador = _contadores.setdefault(nome, [0, 0.0])
+
+    @functools.wraps(funcao)
+    def envolvida(*args, **kwargs):
+        inicio = perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            contador[0] += 1
+            contador[1] += perf_counter() - inicio
+
+    return envolvida
+
+def _substitui(objeto, atributo: str, valor):
+    _originais.append((objeto, atributo, getattr(objeto, atributo)))
+    setattr(objeto, atributo, valor)
+
+def instrumentacao_ativa() -> bool:
+    return bool(_originais)
+
+def ativa_instrumentacao():
+    """
+    Função responsável por ativar a instrumentação: as funções e métodos monitorados são substituídos por versões que contam as chamadas e o tempo, e a seleção e a aceitação dos operadores do ALNS passam a ser contadas.
+
+    Sem ativar, nada é substituído e a execução não tem nenhum custo extra. Deve ser chamada antes da execução dos métodos (os operadores do ALNS são ligados na criação da instância).
+    """
+
+    import Metodos
+
+    if instrumentacao_ativa():
+        return
+
+    for modulo, nome in _FUNCOES:
+        envolvida = _envolve(nome, getattr(getattr(Metodos, modulo), nome))
+        _substitui(getattr(Metodos, modulo), nome, envolvida)       # Chamadas internas do módulo.
+        _substitui(Metodos, nome, envolvida)                        # Chamadas Metodos.nome.
+
+    for classe, nome in _METODOS:
+        _substitui(getattr(Metodos, classe), nome, _envolve(f"{classe}.{nome}", getattr(getattr(Metodos, classe), nome)))
+
+    # Contando a seleção e a aceitação de cada operador do ALNS (a aceitação é o único caso em que os pesos são atualizados).
+    seleciona_operador = Metodos.ALNS.seleciona_operador
+    atualiza_pesos = Metodos.ALNS.atualiza_pesos
+
+    def seleciona_contando(self, operadores, pesos):
+        indice, operador = seleciona_operador(self, operadores, pesos)
+        _operadores.setdefault(operador.__name__, [0, 0])[0] += 1
+        return indice, operador
+
+    def atualiza_contando(self, indice, pesos, recompensa, rho=0.1):
+        operadores = self.destruidores if pesos is self.peso_dest else self.reconstrutores
+        _operadores.setdefault(operadores[indice].__name__, [0, 0])[1] += 1
+        return atualiza_pesos(self, indice, pesos, recompensa, rho)
+
+    _substitui(Metodos.ALNS, "seleciona_operador", seleciona_contando)
+    _substitui(Metodos.ALNS, "atualiza_pesos", atualiza_contando)
+
+def desativa_instrumentacao():
+    """
+    Função responsável por restaurar as funções e métodos originais. Os contadores são mantidos.
+    """
+
+    while _originais:
+        objeto, atributo, valor = _originais.pop()
+        setattr(objeto, atributo, valor)
+
+def reinicia_instrumentacao():
+    """
+    Função responsável por zerar os contadores (mantendo a instrumentação ativa, se estiver).
+    """
+
+    for contador in _contadores.values():
+        contador[0], contador[1] = 0, 0.0
+    _operadores.clear()
+
+def perfil_instrumentacao() -> dict:
+    """
+    Returns:
+        perfil (dict): Chamadas, tempo total e tempo médio de cada função instrumentada chamada pelo menos uma vez, e seleções, aceitações e taxa de aceitação de cada operador do ALNS.
+    """
+
+    funcoes = {nome: {"chamadas": chamadas, "tempo": tempo, "tempo_medio": tempo / chamadas} for nome, (chamadas, tempo) in _contadores.items() if chamadas}
+    operadores = {nome: {"selecionado": selecionado, "aceito": aceito, "taxa_aceitacao": aceito / selecionado if selecionado else 0.0} for nome, (selecionado, aceito) in _operadores.items()}
+    return {"funcoes": funcoes, "operadores": operadores}
+
+def acumula_perfil(perfil: dict):
+    """
+    Função responsável por somar um perfil (por exemplo, de outro processo) aos contadores deste processo.
+
+    Args:
+        perfil (dict): Perfil no formato de perfil_instrumentacao.
+    """
+
+    for nome, dados in perfil["funcoes"].items():
+        contador = _contadores.setdefault(nome, [0, 0.0])
+        contador[0] += dados["chamadas"]
+        contador[1] += dados["tempo"]
+    for nome, dados in perfil["operadores"].items():
+        contador = _operadores.setdefault(nome, [0, 0])
+        contador[0] += dados["selecionado"]
+        contador[1] += dados["aceito"]
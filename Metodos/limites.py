@@ -0,0 +1,50 @@
+import Metodos
+import numpy as np
+import Processa
+
+def limite_superior(problema: Processa.Problema, k: int) -> float:
+    """
+    Função responsável por calcular um limite superior do objetivo de qualquer solução com exatamente k corredores.
+
+    Com k corredores, cada item é coletado no máximo até a soma das k maiores ofertas dele (nos corredores que mais o oferecem) e até a demanda total dele nos pedidos (problema.itens_maximos). A quantidade de itens também é limitada pelo ub e, se nem assim atingir o lb, nenhuma solução com k corredores é viável.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        k (int): Quantidade de corredores (de 1 até problema.a).
+
+    Returns:
+        limite (float): Maior objetivo possível com k corredores (0 se nenhuma solução com k corredores é viável).
+    """
+
+    itens = int(problema.itens_maximos[k])
+    if itens < problema.lb:
+        return 0.0
+    return min(itens, problema.ub) / k
+
+def limites_superiores(problema: Processa.Problema) -> np.ndarray:
+    """
+    Returns:
+        limites (np.ndarray): Limite superior do objetivo para cada quantidade de corredores k (posição k, com a posição 0 igual a 0), com os mesmos valores do limite_superior.
+    """
+
+    itens = problema.itens_maximos
+    k = np.arange(problema.a + 1)
+    limites = np.divide(np.minimum(itens, problema.ub), k, out=np.zeros(problema.a + 1), where=k > 0)
+    limites[itens < problema.lb] = 0.0
+    return limites
+
+def poda_corredor(problema: Processa.Problema, solucao: Metodos.Solucao) -> bool:
+    """
+    Função responsável por verificar se adicionar um corredor (e pedidos) à solução pode melhorar o objetivo.
+
+    Os construtores aceitam um corredor a mais quando o objetivo melhora ou quando a solução ainda não atingiu o lb (ou não tem itens). Como os pedidos da solução são mantidos, a nova solução também atinge o lb, então, se o limite superior com um corredor a mais não passa do objetivo atual, nenhum corredor pode ser aceito.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Solução atual.
+
+    Returns:
+        poda (bool): True se nenhuma solução com um corredor a mais pode ser aceita.
+    """
+
+    return solucao.qntItens >= problema.lb and solucao.qntItens > 0 and solucao.qntCorredores < problema.a and limite_superior(problema, solucao.qntCorredores + 1) <= solucao.objetivo
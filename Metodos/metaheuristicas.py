@@ -1,14 +1,17 @@
-import matplotlib.pyplot as plt
 import Metodos
 import numpy as np
 import Processa
 import statistics
 import math
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from itertools import islice
-from random import choice, randint, random, sample, uniform, shuffle, choices
+from multiprocessing import get_all_start_methods, get_context
+from random import choice, getrandbits, getstate, randint, random, sample, setstate, uniform, shuffle
 from time import perf_counter
 
+_problema_processos = None    # Problema usado pelos processos do FPA e do ALNS paralelos (herdado pelo fork ou recebido uma única vez pelo inicializador).
+
 def inicializa_particula(problema: Processa.Problema, quantidade_corredores: int, corredores: list) -> Metodos.Solucao:
     """
     Função responsável por inicializar uma partícula inicial com corredores aleatórios.
@@ -23,34 +26,19 @@ def inicializa_particula(problema: Processa.Problema, quantidade_corredores: int
     """
 
     # Gerando partícula apenas com os corredores.
-    particula = Metodos.Solucao(
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        dict.fromkeys(range(problema.i), 0),
-        sample(corredores, quantidade_corredores),
-        [0 for _ in range(problema.a)],
-        [],
-        [0 for _ in range(problema.o)],
-        0,
-        quantidade_corredores,
-        0.0,
-        0.0
-    )
+    particula = Metodos.Solucao.vazia(problema)
 
     # Atualizando universo de corredores.
-    for c in particula.corredores:
-        particula.corredoresDisp[c] = 1
-        for item, qnt in problema.aisles[c].items():
-            particula.itensC[item] += qnt
-            particula.universoC[item] += qnt
+    for c in sample(corredores, quantidade_corredores):
+        Metodos.adiciona_corredor(problema, particula, c)
 
     # Adicionando os pedidos e calculando a função objetivo.
     Metodos.adiciona_pedidos(problema, particula)
-    particula.objetivo = Metodos.funcao_objetivo(problema, particula.itensP, particula.itensC) / particula.qntCorredores
+    particula.objetivo = Metodos.funcao_objetivo_incremental(problema, particula) / particula.qntCorredores
 
     return particula
 
-def gera_populacao_incial(problema: Processa.Problema, total: int, percentual: float, enxame: list, objetivos: list) -> Metodos.Solucao:
+def gera_populacao_incial(problema: Processa.Problema, total: int, percentual: float, enxame: list, objetivos: list, orcamento: Metodos.Orcamento = None) -> Metodos.Solucao:
     """
     Função responsável por gerar o enxame de partículas do PSO.
 
@@ -65,11 +53,13 @@ def gera_populacao_incial(problema: Processa.Problema, total: int, percentual: f
         percentual (float): Quantidade de partículas que serão geradas de forma construtiva (uma partícula será gerada pela gulosa, e o restante pela híbrida).
         enxame (list): Lista que irá salvar cada partícula.
         objetivos (list): Lista que irá salvar o valor da função objetivo de cada partícula.
+        orcamento (Orcamento | None): Prazo de execução. Se ele acabar, as partículas híbridas e aleatórias limitadas restantes não são geradas (o enxame fica com pelo menos a partícula gulosa e a aleatória ilimitada).
 
     Returns:
         melhor_particula (Solucao): Clone da melhor partícula do enxame.
     """
 
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
     corredores = [c for c in range(problema.a)]
 
     # Calculando a quantidade de partículas para cada percentual. Pelo menos uma partícula de cada será gerada.
@@ -90,12 +80,14 @@ def gera_populacao_incial(problema: Processa.Problema, total: int, percentual: f
 
     # Gerando população híbrida.
     for i in range(1, construtiva):
+        if orcamento.esgotado():
+            break
         particula = Metodos.hibrida(problema)
 
         objetivos.append(particula.objetivo)
         enxame.append({"solucao": particula, "Xt": set(particula.corredores), "P": set(particula.corredores), "Op": particula.objetivo, "Vt_1": set(particula.corredores), "Vt": set(particula.corredores)})
-        if enxame[i]["solucao"].objetivo > melhor_particula.objetivo:
-            melhor_particula = enxame[i]["solucao"].clone()
+        if enxame[-1]["solucao"].objetivo > melhor_particula.objetivo:
+            melhor_particula = enxame[-1]["solucao"].clone()
 
     # Gerando população aleatória ilimitada.
     quantidade = randint(1, problema.a)
@@ -104,22 +96,24 @@ def gera_populacao_incial(problema: Processa.Problema, total: int, percentual: f
 
     objetivos.append(particula.objetivo)
     enxame.append({"solucao": particula, "Xt": set(particula.corredores), "P": set(particula.corredores), "Op": particula.objetivo, "Vt_1": set(particula.corredores), "Vt": set(particula.corredores)})
-    if enxame[construtiva]["solucao"].objetivo > melhor_particula.objetivo:
-        melhor_particula = enxame[construtiva]["solucao"].clone()
+    if enxame[-1]["solucao"].objetivo > melhor_particula.objetivo:
+        melhor_particula = enxame[-1]["solucao"].clone()
 
     # Gerando população aleatória limitada.
     qnt_min = 1
     qnt_max = math.floor(problema.a * 0.3)
 
     for i in range(construtiva + aleatoria_ilimitada, construtiva + aleatoria_ilimitada + aleatoria_limitada):
+        if orcamento.esgotado():
+            break
         quantidade = min(qnt_max, qnt_min + int(math.log(1 - random()) / math.log(1 - 0.85) * (qnt_max - qnt_min)))
 
         particula = inicializa_particula(problema, quantidade, corredores)
 
         objetivos.append(particula.objetivo)
         enxame.append({"solucao": particula, "Xt": set(particula.corredores), "P": set(particula.corredores), "Op": particula.objetivo, "Vt_1": set(particula.corredores), "Vt": set(particula.corredores)})
-        if enxame[i]["solucao"].objetivo > melhor_particula.objetivo:
-            melhor_particula = enxame[i]["solucao"].clone()
+        if enxame[-1]["solucao"].objetivo > melhor_particula.objetivo:
+            melhor_particula = enxame[-1]["solucao"].clone()
 
     return melhor_particula
 
@@ -154,7 +148,7 @@ def calcula_componente(problema: Processa.Problema, componente_atual: set, parti
 
     return componente
 
-def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: int, constante_social: int, inercia: int, geracao_maxima: int) -> Metodos.Solucao:
+def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: int, constante_social: int, inercia: int, geracao_maxima: int, orcamento: Metodos.Orcamento = None, rastro: Metodos.Rastro = None) -> Metodos.Solucao:
     """
     Metaheurística PSO adaptada para o problema discreto de wave picking.
 
@@ -166,7 +160,7 @@ def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: i
 
     O peso de inércia define quantos corredores da velocidade anterior (isto é, corredores que não foram considerados anteriormente por causa da aleatoriedade) serão reaproveitados na nova velocidade.
 
-    Após o movimento, a alocação de pedidos é realizada de forma gulosa sobre o novo conjunto de corredores.
+    Após o movimento, a alocação de pedidos é realizada de forma gulosa sobre o novo conjunto de corredores, para todas as partículas de uma vez (ver EnxameCorredores).
 
     Args:
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
@@ -175,18 +169,23 @@ def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: i
         constante_social (int): Componente social do PSO (c2).
         inercia (int): Peso da inércia (w).
         geracao_maxima (int): Número máximo de iterações que serão realizadas caso não ocorra a convergência.
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor partícula encontrada até o momento.
+        rastro (Rastro | None): Registro da convergência, com a média do enxame, o melhor objetivo e a inércia de cada geração.
 
     Returns:
         melhor_particula (Solucao): Dataclass representando a melhor solução da população, incluindo estruturas auxiliares.
     """
 
     inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
 
     # Gerando soluções iniciais.
     objetivos = []                                              # Lista com todas as funções objetivos do enxame atual, para o cálculo desvio padrão.
     enxame = []                                                 # Lista armazenando todas as partículas do enxame (dicionários).
 
-    melhor_particula = gera_populacao_incial(problema, tamanho_enxame, 0.3, enxame, objetivos)
+    melhor_particula = gera_populacao_incial(problema, tamanho_enxame, 0.3, enxame, objetivos, orcamento)
+    tamanho_enxame = len(enxame)
+    particulas = Metodos.EnxameCorredores(problema, [particula.pop("solucao") for particula in enxame])     # Corredores e pedidos de todas as partículas.
     melhor_posicao = set(melhor_particula.corredores)
 
     # Iniciando iterações.
@@ -195,7 +194,7 @@ def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: i
     geracao_atual = 0                                           # Geração atual do enxame.
     geracoes_sem_melhora = 0                                    # Quantidade de iterações seguida sem melhora na solução global.
     geracao_convergencia = math.floor(geracao_maxima * 0.25)    # Número de gerações sem melhora necessárias para reduzir a inércia.
-    while geracao_atual < geracao_maxima and desvio > 0.001:
+    while geracao_atual < geracao_maxima and desvio > 0.001 and not orcamento.esgotado():
         melhora = False                                         # Indica se houve melhora na solução global.
 
         # Verificando inércia.
@@ -234,52 +233,37 @@ def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: i
                     else:
                         velocidade_positiva = velocidade_positiva | velocidades
 
-            if len(velocidade_negativa) - len(velocidade_positiva) >= enxame[i]["solucao"].qntCorredores:
-                velocidade_negativa = set(islice(velocidade_negativa, enxame[i]["solucao"].qntCorredores - 1))
+            if len(velocidade_negativa) - len(velocidade_positiva) >= len(particulas.corredores[i]):
+                velocidade_negativa = set(islice(velocidade_negativa, len(particulas.corredores[i]) - 1))
 
             velocidade = velocidade_positiva | velocidade_negativa
             enxame[i]["Vt_1"] = velocidade
             enxame[i]["Vt"] = enxame[i]["Vt"] - enxame[i]["Vt_1"]
 
-        # Andando de acordo com as velocidades, corrigindo pedidos e atualizando universo.
+        # Andando de acordo com as velocidades e realocando os pedidos de todas as partículas de uma vez. Se o prazo acabar, as partículas restantes não são avaliadas.
         for i in range(tamanho_enxame):
-            # Modificando as posições.
-            for corredor in enxame[i]["Vt_1"]:
-                if corredor < 0:
-                    # Removendo corredor.
-                    Metodos.remove_corredor(problema, enxame[i]["solucao"], corredor * -1)
-                elif corredor == problema.a:
-                    # Removendo corredor 0.
-                    Metodos.remove_corredor(problema, enxame[i]["solucao"], 0)
-                else:
-                    # Adicionando corredor.
-                    Metodos.adiciona_corredor(problema, enxame[i]["solucao"], corredor)
-
-            # Adicionando novos pedidos usando cobertura.
-            enxame[i]["solucao"].universoC = enxame[i]["solucao"].itensC.copy()
-            enxame[i]["solucao"].pedidos = []
-            enxame[i]["solucao"].pedidosDisp = [0 for _ in range(problema.o)]
-            enxame[i]["solucao"].itensP = dict.fromkeys(range(problema.i), 0)
-            enxame[i]["solucao"].qntItens = 0
-            Metodos.adiciona_pedidos(problema, enxame[i]["solucao"])
+            particulas.move(i, enxame[i]["Vt_1"])
 
+        for i in particulas.avalia(orcamento):
             # Atualizando universo.
-            enxame[i]["Xt"] = set(enxame[i]["solucao"].corredores)
-            enxame[i]["solucao"].objetivo = Metodos.funcao_objetivo(problema, enxame[i]["solucao"].itensP, enxame[i]["solucao"].itensC) / enxame[i]["solucao"].qntCorredores
+            enxame[i]["Xt"] = set(particulas.corredores[i])
+            objetivo = particulas.objetivos[i]
 
-            if enxame[i]["solucao"].objetivo > enxame[i]["Op"]:
-                enxame[i]["Op"] = enxame[i]["solucao"].objetivo
+            if objetivo > enxame[i]["Op"]:
+                enxame[i]["Op"] = objetivo
                 enxame[i]["P"] = set(enxame[i]["Xt"])
 
-            if enxame[i]["solucao"].objetivo > melhor_particula.objetivo:
-                melhor_particula = enxame[i]["solucao"].clone()
+            if objetivo > melhor_particula.objetivo:
+                melhor_particula = particulas.solucao(i)
                 melhor_posicao = set(enxame[i]["Xt"])
 
                 melhora = True
 
-            objetivos[i] = enxame[i]["solucao"].objetivo
+            objetivos[i] = objetivo
 
         desvio = statistics.stdev(objetivos)
+        if rastro is not None:
+            rastro.registra("PSO", geracao_atual, statistics.fmean(objetivos), melhor_particula.objetivo, inercia)
         geracao_atual += 1
 
         if melhora == False:
@@ -290,83 +274,191 @@ def PSO(problema: Processa.Problema, tamanho_enxame: int, constante_cognitivo: i
 
     return melhor_particula
 
+def _inicializa_processos(problema: Processa.Problema):
+    global _problema_processos
+    _problema_processos = problema
+
+def _acumula_perfis(resultados: list):
+    # Soma aos contadores deste processo os perfis devolvidos pelos processos (None quando a instrumentação está desativada).
+    for _, perfil in resultados:
+        if perfil is not None:
+            Metodos.acumula_perfil(perfil)
+
+def _reinicia_perfil(instrumentar: bool):
+    # Cada tarefa devolve apenas os próprios contadores (processos com fork herdam os do processo principal).
+    if instrumentar:
+        Metodos.ativa_instrumentacao()
+        Metodos.reinicia_instrumentacao()
+
+def _constroi_flores(tarefa: tuple) -> tuple:
+    # Constrói uma parte da população inicial do FPA paralelo, com a semente de cada flor.
+    construcoes, orcamento, primeira, instrumentar = tarefa
+    _reinicia_perfil(instrumentar)
+    populacao = []
+    for gulosa, semente in construcoes:
+        if (populacao or not primeira) and orcamento.esgotado():
+            break
+        Metodos.define_semente(semente)
+        populacao.append(Metodos.gulosa(_problema_processos) if gulosa else Metodos.aleatorio(_problema_processos))
+    return populacao, Metodos.perfil_instrumentacao() if instrumentar else None
+
+def _poliniza_flores(tarefa: tuple) -> tuple:
+    # Poliniza uma parte da população do FPA paralelo, com a semente de cada flor, retornando apenas as flores que melhoraram.
+    indices, flores, objetivos, sementes, best, p, orcamento, instrumentar = tarefa
+    _reinicia_perfil(instrumentar)
+    fpa = FPA(_problema_processos)
+    fpa.population, fpa.objetivo, fpa.best, fpa.p = flores, objetivos, best, p
+    melhoradas = []
+    for k, (i, semente) in enumerate(zip(indices, sementes)):
+        if orcamento.esgotado():
+            break
+        Metodos.define_semente(semente)
+        nova_sol = fpa.poliniza(k)
+        if nova_sol is not None:
+            melhoradas.append((i, nova_sol))
+    return melhoradas, Metodos.perfil_instrumentacao() if instrumentar else None
+
+def _executa_cadeia(tarefa: tuple) -> tuple:
+    # Executa uma época de uma cadeia do ALNS paralelo, retornando o novo estado da cadeia.
+    (sol_atual, sol_melhor, peso_dest, peso_reco, temp), iteracoes, semente, taxa_resfriamento, orcamento, instrumentar = tarefa
+    _reinicia_perfil(instrumentar)
+    Metodos.define_semente(semente)
+    alns = ALNS(_problema_processos, sol_atual, temp, taxa_resfriamento)
+    alns.sol_melhor, alns.peso_dest, alns.peso_reco = sol_melhor, peso_dest, peso_reco
+    alns.itera(iteracoes, orcamento)
+    return (alns.sol_atual, alns.sol_melhor, alns.peso_dest, alns.peso_reco, alns.temp), Metodos.perfil_instrumentacao() if instrumentar else None
+
 class FPA:
-    def __init__(self, problema: Processa.Problema):
+    def __init__(self, problema: Processa.Problema, processos: int = None):
         """
         Construtor do FPA modificado.
 
         Agora utiliza a função construtiva híbrida para inicializar a população e operadores de refinamento para gerar vizinhos, manipulando corretamente o conjunto de dados.
+
+        Com processos > 1, a construção da população inicial e cada polinização são divididas entre processos. Cada flor recebe uma semente sorteada pelo gerador principal, então o resultado depende apenas da semente principal (e não da quantidade de processos), mas é diferente do resultado sequencial. Com a instrumentação ativa, os contadores dos processos são somados aos do processo principal.
+
+        Args:
+            problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+            processos (int | None): Quantidade de processos usados pela população (None ou 1 para a execução sequencial).
         """
 
         self.problema = problema
+        self.processos = processos
+        self.executor = None    # Processos usados durante o run paralelo.
         self.iterations_num = 800
         self.pop_size = int(problema.o / 200) + 50
         self.population = None  # lista de objetos Solucao
         self.best = None        # melhor solução encontrada
         self.p = 0.5            # probabilidade de aplicar refinamento global
         self.objetivo = np.zeros(self.pop_size)
-        self.plot = False
 
         # Para datasets menores, p = 0 garante mais velocidade e qualidade.
         # Para datasets maiores, valores de p menores garantem melhor qualidade mas perdem em tempo de execução
         if self.problema.ub < 500:
             self.p = 0.0
 
-    def run(self) -> Metodos.Solucao:
-        self.initialize_population()
+    def run(self, orcamento: Metodos.Orcamento = None, rastro: Metodos.Rastro = None) -> Metodos.Solucao:
+        """
+        Executa o FPA.
+
+        Args:
+            orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
+            rastro (Rastro | None): Registro da convergência, com a média da população, o melhor objetivo e a probabilidade p de cada polinização.
+
+        Returns:
+            best (Solucao): Dataclass representando a melhor solução da população, incluindo estruturas auxiliares.
+        """
+
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+        if self.processos is None or self.processos <= 1:
+            return self._run(orcamento, rastro)
+
+        # Criando os processos uma única vez para todo o run.
+        global _problema_processos
+        self.problema.compacta()
+        _problema_processos = self.problema
+        contexto = get_context("fork") if "fork" in get_all_start_methods() else None
+        try:
+            with ProcessPoolExecutor(max_workers=self.processos, mp_context=contexto, initializer=_inicializa_processos, initargs=(self.problema,)) as executor:
+                self.executor = executor
+                return self._run(orcamento, rastro)
+        finally:
+            self.executor = None
+            _problema_processos = None
+
+    def _run(self, orcamento: Metodos.Orcamento, rastro: Metodos.Rastro = None) -> Metodos.Solucao:
+        self.initialize_population(orcamento)
         # self.calcular_matriz_distancias_populacao(self)
         self.calculate_obj()
-        avg = []
-        bests = []
         inicio = perf_counter()
         iterations_without_improve = 0
         self.best = self.population[0]
+        current_best_val = self.best.objetivo
         for i in range(self.iterations_num):
-            current_best_val = self.best.objetivo
+            if orcamento.esgotado():
+                break
+            # O valor é guardado à parte, pois a melhor flor pode melhorar na própria solução durante a polinização.
             self.check_best()
             # Se há melhoria, reseta contador
             if self.best.objetivo > current_best_val:
                 iterations_without_improve = 0
             else:
                 iterations_without_improve += 1
+            current_best_val = self.best.objetivo
 
+            # A redução de p e a parada por estagnação aparecem no rastro (parâmetro e última iteração registrada).
             if iterations_without_improve > 0 and iterations_without_improve % 50 == 0:
                 if self.p > 1:
                     self.p -= 0.1
-                    print(f'p setado para {self.p} na iteração {i}/{self.iterations_num}')
                 if iterations_without_improve > 250:
-                    print(f'{iterations_without_improve} iterations without improve')
                     break
 
 
-            self.pollination()
-            if self.plot:
-                avg.append(np.mean(self.objetivo))
-                bests.append(max(self.objetivo))
+            self.pollination(orcamento)
+            if rastro is not None:
+                rastro.registra("FPA", i, float(np.mean(self.objetivo)), float(np.max(self.objetivo)), self.p)
 
         fim = perf_counter() - inicio
         # Adiciona o tempo à melhor solução
         self.best.tempo = fim
 
-        # Se habilitado plot o gráfico
-        if self.plot:
-            plt.plot(avg, label="avg")
-            plt.plot(bests, label="best")
-            plt.yscale('log')
-            plt.legend()
-            plt.show()
-
         return self.best
 
-    def initialize_population(self):
+    def initialize_population(self, orcamento: Metodos.Orcamento = None):
         # Utiliza a função construtiva híbrida para gerar a população inicial de soluções
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
         top10 = (int)(self.pop_size/10)
-        top90 = self.pop_size - top10
-        self.population = [Metodos.gulosa(self.problema) for _ in range(top10)] + [Metodos.aleatorio(self.problema) for _ in range(top90)]
+        if self.executor is not None:
+            self._initialize_population_paralela(top10, orcamento)
+            return
+        self.population = []
+        for k in range(self.pop_size):
+            # Se o prazo acabar, a população fica com os indivíduos gerados até o momento (pelo menos um).
+            if self.population and orcamento.esgotado():
+                self.pop_size = len(self.population)
+                self.objetivo = self.objetivo[:self.pop_size]
+                break
+            self.population.append(Metodos.gulosa(self.problema) if k < top10 else Metodos.aleatorio(self.problema))
         # self.population = [Metodos.hibrida(self.problema) for _ in range(self.pop_size)]
         for i in range(self.pop_size):
             self.objetivo[i] = self.population[i].objetivo
 
+    def _partes(self, total: int) -> list:
+        # Divide os índices da população em partes contíguas (algumas por processo, para equilibrar a carga).
+        return [parte.tolist() for parte in np.array_split(np.arange(total), min(total, self.processos * 4)) if len(parte)]
+
+    def _initialize_population_paralela(self, top10: int, orcamento: Metodos.Orcamento):
+        sementes = [getrandbits(32) for _ in range(self.pop_size)]
+        instrumentar = Metodos.instrumentacao_ativa()
+        tarefas = [([(k < top10, sementes[k]) for k in parte], orcamento, parte[0] == 0, instrumentar) for parte in self._partes(self.pop_size)]
+        resultados = list(self.executor.map(_constroi_flores, tarefas))
+        self.population = [flor for flores, _ in resultados for flor in flores]
+        _acumula_perfis(resultados)
+
+        # Se o prazo acabar, a população fica com os indivíduos gerados até o momento (pelo menos um).
+        self.pop_size = len(self.population)
+        self.objetivo = np.array([flor.objetivo for flor in self.population])
+
     def calculate_obj(self):
         for i in range(self.pop_size):
             self.objetivo[i] = self.population[i].objetivo
@@ -385,53 +477,90 @@ class FPA:
             self.best = self.population[best_idx]
 
 
-    def pollination(self) -> None:
+    def pollination(self, orcamento: Metodos.Orcamento = None) -> None:
+        if self.executor is not None:
+            self._pollination_paralela(orcamento)
+            return
         for i in range(self.pop_size):
-            # Com probabilidade p, aplica refinamento global; caso contrário, utiliza refinamento local
-            if random() < self.p:
-                nova_sol = self.global_pollination(i)
-            else:
-                nova_sol = self.local_pollination(i)
-            # Se o novo vizinho possui função objetivo melhor, substitui a solução atual
-            if nova_sol:
-                if nova_sol.qntCorredores:
-                    nova_sol.objetivo = Metodos.funcao_objetivo(self.problema, nova_sol.itensP, nova_sol.itensC)/nova_sol.qntCorredores
-                    if nova_sol.objetivo > self.objetivo[i]:
-                        self.population[i] = nova_sol
-                        self.objetivo[i] = nova_sol.objetivo
-                else:
-                    nova_sol.objetivo = 0
+            if orcamento is not None and orcamento.esgotado():
+                break
+            nova_sol = self.poliniza(i)
+            if nova_sol is not None:
+                self.population[i] = nova_sol
+                self.objetivo[i] = nova_sol.objetivo
+
+    def _pollination_paralela(self, orcamento: Metodos.Orcamento = None) -> None:
+        # As flores são independentes dentro de uma polinização (só dependem de si mesmas e da melhor, que não muda), então cada parte é polinizada em um processo.
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+        sementes = [getrandbits(32) for _ in range(self.pop_size)]
+        instrumentar = Metodos.instrumentacao_ativa()
+        tarefas = [(parte, [self.population[i] for i in parte], self.objetivo[parte], [sementes[i] for i in parte], self.best, self.p, orcamento, instrumentar) for parte in self._partes(self.pop_size)]
+        resultados = list(self.executor.map(_poliniza_flores, tarefas))
+        for melhoradas, _ in resultados:
+            for i, nova_sol in melhoradas:
+                self.population[i] = nova_sol
+                self.objetivo[i] = nova_sol.objetivo
+        _acumula_perfis(resultados)
+
+    def poliniza(self, i) -> Metodos.Solucao:
+        """
+        Args:
+            i: identificador da população
+
+        Returns:
+            nova_sol (Solucao | None): Vizinho da flor i gerado pela polinização global (com probabilidade p) ou local, se ele for melhor que a flor, ou None.
+        """
 
+        # O vizinho é gerado na própria flor e desfeito se não melhorar (a melhor flor também: a polinização só usa o objetivo dela, e ele só aumenta).
+        flor = self.population[i]
+        movimento = Metodos.Movimento(flor)
 
-    def local_pollination(self, i) -> Metodos.Solucao:
+        # Com probabilidade p, aplica refinamento global; caso contrário, utiliza refinamento local
+        if random() < self.p:
+            nova_sol = self.global_pollination(i, flor, movimento)
+        else:
+            nova_sol = self.local_pollination(i, flor, movimento)
+        # Se o novo vizinho possui função objetivo melhor, substitui a solução atual
+        if nova_sol.qntCorredores:
+            objetivo = Metodos.funcao_objetivo_incremental(self.problema, nova_sol)/nova_sol.qntCorredores
+            if objetivo > self.objetivo[i]:
+                nova_sol.objetivo = objetivo
+                return nova_sol
+        Metodos.desfaz_movimento(self.problema, nova_sol, movimento)
+        return None
+
+    def local_pollination(self, i, flor = None, movimento = None) -> Metodos.Solucao:
         """
         Args:
             i: identificador da população
+            flor (Solucao | None): Solução alterada (None altera a própria flor i).
+            movimento (Movimento | None): Registro em que as alterações são acumuladas, para desfazê-las (None cria um novo).
 
         Returns:
             solucao (Solucao): Dataclass representando a solução montada, incluindo estruturas auxiliares.
         """
 
-        populacao = self.population[i]
-        nova_sol = populacao.clone()
+        nova_sol = flor if flor is not None else self.population[i]
+        movimento = movimento if movimento is not None else Metodos.Movimento(nova_sol)
         tam = self.problema.a - 1
         escolhido = choice(range(tam))
 
         if nova_sol.corredoresDisp[escolhido] == 0:
-            Metodos.adiciona_corredor(self.problema, nova_sol, escolhido)
+            movimento = Metodos.adiciona_corredor_reversivel(self.problema, nova_sol, escolhido, movimento)
         else:
-            Metodos.remove_corredor(self.problema, nova_sol, escolhido)
+            movimento = Metodos.remove_corredor_reversivel(self.problema, nova_sol, escolhido, movimento)
 
-        Metodos.adiciona_pedidos(self.problema, nova_sol)
+        Metodos.adiciona_pedidos_reversivel(self.problema, nova_sol, movimento)
 
         return nova_sol
 
 
-    def global_pollination(self, i) -> Metodos.Solucao:
-        # Define o número de mudanças/ Força do polinizador
+    def global_pollination(self, i, flor = None, movimento = None) -> Metodos.Solucao:
+        # Define o número de mudanças/ Força do polinizador (as alterações são feitas na flor informada, ou na própria flor i, e acumuladas no movimento)
         num_levy = Metodos.get_levy_flight_array()
         diferencas = {}
-        copia_sol = self.population[i].clone()
+        copia_sol = flor if flor is not None else self.population[i]
+        movimento = movimento if movimento is not None else Metodos.Movimento(copia_sol)
         tam = self.problema.a-1
 
         for j in range(tam):
@@ -444,11 +573,11 @@ class FPA:
             # 70% de chance de aplicar a mudança
             if random() < 0.7:
                 if copia_sol.corredoresDisp[escolhidos[j]] == 0:
-                    Metodos.adiciona_corredor(self.problema, copia_sol, escolhidos[j])
+                    Metodos.adiciona_corredor_reversivel(self.problema, copia_sol, escolhidos[j], movimento)
                 else:
-                    Metodos.remove_corredor(self.problema, copia_sol, escolhidos[j])
+                    Metodos.remove_corredor_reversivel(self.problema, copia_sol, escolhidos[j], movimento)
 
-                Metodos.adiciona_pedidos(self.problema, copia_sol)
+                Metodos.adiciona_pedidos_reversivel(self.problema, copia_sol, movimento)
 
         return copia_sol
 
@@ -465,7 +594,9 @@ class ALNS:
         self.temp               = temperatura_inicial
         self.taxa_resf          = taxa_resfriamento
 
-    def destruidor_aleatorio(self, solucao, frac = 0.25):
+    def destruidor_aleatorio(self, solucao, frac = 0.25, movimento = None):
+        # As remoções são acumuladas no movimento, para a iteração poder desfazê-las (None cria um registro descartado).
+        movimento = movimento if movimento is not None else Metodos.Movimento(solucao)
         n = len(solucao.corredores)
         # se não houver corredores, nada a fazer
         if n == 0:
@@ -479,12 +610,15 @@ class ALNS:
 
         to_remove = sample(solucao.corredores, k)
         for corredor in to_remove:
-            Metodos.remove_corredor(self.problema, solucao, corredor)
+            Metodos.remove_corredor_reversivel(self.problema, solucao, corredor, movimento)
 
+        # Os pedidos que deixaram de caber foram removidos (os demais continuam), então o objetivo muda.
+        solucao.objetivo = Metodos.funcao_objetivo_incremental(self.problema, solucao) / solucao.qntCorredores if solucao.qntCorredores else 0.0
         return solucao
 
     # Se existirem itens no UniversoC, ranqueia os corredores selecionados que mais possuem eles, e removem os 10% piores corredores.
-    def destruidor_bx_prod(self, solucao, porcent = 0.25):
+    def destruidor_bx_prod(self, solucao, porcent = 0.25, movimento = None):
+        movimento = movimento if movimento is not None else Metodos.Movimento(solucao)
         k = max(1, int(porcent * len(solucao.corredores)))
 
         if not solucao.universoC or sum(solucao.universoC.values()) == 0:
@@ -499,161 +633,107 @@ class ALNS:
         piores = sorted(notas, key=notas.get)[:k]
 
         for corredor in piores:
-            Metodos.remove_corredor(self.problema, solucao, corredor)
+            Metodos.remove_corredor_reversivel(self.problema, solucao, corredor, movimento)
 
+        solucao.objetivo = Metodos.funcao_objetivo_incremental(self.problema, solucao) / solucao.qntCorredores if solucao.qntCorredores else 0.0
         return solucao
 
-    def construtor_guloso(self, solucao):
+    def construtor_guloso(self, solucao, movimento = None):
+        # Cada corredor é testado na própria solução e desfeito se ela não melhorar; os mantidos são acumulados no movimento (se houver).
         problema = self.problema
-        pedidos_ranqueados, corredores_ranqueados = Metodos.ranqueamento_guloso(self.problema, solucao)
-        tentativas_sem_melhora = 0
-
-        while tentativas_sem_melhora < 3 and corredores_ranqueados:
 
-            # Selecionando o corredor de maior nota
-            copiaSolucao = solucao.clone()
-            corredor = corredores_ranqueados.pop()
+        # Se nenhum corredor a mais pode melhorar o objetivo, o ranqueamento nem é construído.
+        if Metodos.poda_corredor(problema, solucao):
+            return solucao
 
-            # Atualizando universo dos corredores
-            if copiaSolucao.corredoresDisp[corredor] == 0:
-                copiaSolucao.corredores.append(corredor)
-                copiaSolucao.corredoresDisp[corredor] = 1
-                copiaSolucao.qntCorredores += 1
+        ranqueamento = Metodos.RanqueamentoGuloso(self.problema, solucao)
+        tamanho = problema.tamanho_pedidos.tolist()     # Quantidade total de itens de cada pedido.
+        tentativas_sem_melhora = 0
+        corredor = ranqueamento.melhor_corredor()
 
-                # Atualizando itens dos corredores selecionados
-                for item, qnt in problema.aisles[corredor].items():
-                    copiaSolucao.itensC[item] += qnt
-                    copiaSolucao.universoC[item] += qnt
+        while tentativas_sem_melhora < 3 and corredor >= 0 and not Metodos.poda_corredor(problema, solucao):
 
-            else:
-                continue
+            # Selecionando o corredor de maior nota e atualizando universo dos corredores (na própria solução, desfazendo se ela não melhorar)
+            inicio = len(solucao.pedidos)
+            passo = Metodos.adiciona_corredor_reversivel(problema, solucao, corredor)
 
             # Adicionando pedidos
-            pedidos_viaveis = []                        # Lista de pedidos viáveis com os corredores atualmente selecionados.
-            for indice in pedidos_ranqueados:
-                if not copiaSolucao.pedidosDisp[indice]:
-                    valida = True
-                    itens_totais = 0
-                    for item, qnt in problema.orders[indice].items():
-                        itens_totais += qnt
-                        if qnt > copiaSolucao.universoC[item]:
-                            valida = False
-                            break
-                    if valida:
-                        pedidos_viaveis.append([indice, itens_totais])
+            pedidos_viaveis = [[indice, tamanho[indice]] for indice in ranqueamento.ordena_pedidos(Metodos.pedidos_viaveis(problema, solucao))]     # Lista de pedidos viáveis com os corredores atualmente selecionados, na ordem do ranqueamento.
 
             for pedido in pedidos_viaveis:
-                valida = True
-                for item, qnt in problema.orders[pedido[0]].items():
-                    if qnt > copiaSolucao.universoC[item]:
-                        valida = False
-                        break
-                if valida and copiaSolucao.qntItens + pedido[1] <= problema.ub:
-                    copiaSolucao.qntItens += pedido[1]
-                    copiaSolucao.pedidosDisp[pedido[0]] = 1
-                    copiaSolucao.pedidos.append(pedido[0])
-                    for item, qnt in problema.orders[pedido[0]].items():
-                        copiaSolucao.universoC[item] -= qnt
-                        copiaSolucao.itensP[item] += qnt
-
-            # Comparando as soluções, e salvando a atual caso seja melhor
-            copiaSolucao.objetivo = Metodos.funcao_objetivo(problema, copiaSolucao.itensP, copiaSolucao.itensC) / copiaSolucao.qntCorredores
-            if copiaSolucao.objetivo > solucao.objetivo or copiaSolucao.qntItens < problema.lb:
-                solucao = copiaSolucao
+                if solucao.qntItens + pedido[1] <= problema.ub and Metodos.pedido_viavel(problema, solucao, pedido[0]):
+                    Metodos.adiciona_pedido_reversivel(problema, solucao, pedido[0], passo)
+
+            # Comparando as soluções, e mantendo a atual caso seja melhor
+            objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+            if objetivo > passo.objetivo or solucao.qntItens < problema.lb:
+                # Retirando o corredor e os novos pedidos do ranqueamento.
+                ranqueamento.remove_corredor(corredor)
+                ranqueamento.remove_pedidos(solucao.pedidos[inicio:])
+                solucao.objetivo = objetivo
                 tentativas_sem_melhora = 0
+                if movimento is not None:
+                    movimento.acumula(passo)
             else:
+                Metodos.desfaz_movimento(problema, solucao, passo)
                 tentativas_sem_melhora += 1
 
-            pedidos_ranqueados, corredores_ranqueados = Metodos.ranqueamento_guloso(self.problema, solucao)
+            corredor = ranqueamento.melhor_corredor()
 
         return solucao
 
-    def construtor_hibrido(self, solucao, alpha = 0.3):
-        # Calculando a demanda de cada item.
-        demanda_por_item = defaultdict(int)             # Dicionário da soma total da demanda de cada item em todos os pedidos.
-        for pedido in self.problema.orders:
-            for item, qtd in pedido.items():
-                demanda_por_item[item] += qtd
-
-        # Calculando o peso de cada corredor com base na demanda e na quantidade ofertada.
-        # Peso de cada corredor é calculado com base na demanda dos itens e na quantidade que ele oferece.
-        peso_corredores = {indice: sum(demanda_por_item[item] * qnt for item, qnt in self.problema.aisles[indice].items()) for indice in range(self.problema.a)}
+    def construtor_hibrido(self, solucao, alpha = 0.3, movimento = None):
+        # Roleta dos corredores, com o peso calculado com base na demanda dos itens e na quantidade que ele oferece (calculado uma única vez por problema).
+        roleta = Metodos.AmostradorPonderado(self.problema.peso_corredores.tolist())
 
         # Buscando a melhor solução até ficar 3 iterações seguidas sem encontrar uma melhor.
         tentativas_sem_melhora = 0
-        while tentativas_sem_melhora < 3 and peso_corredores:
-            copiaSol = solucao.clone()
-
+        while tentativas_sem_melhora < 3 and roleta.quantidade:
             # Selecionando um corredor ainda não utilizado.
             # Se todos os pesos forem zero, escolhe aleatoriamente. Caso contrário, utiliza seleção ponderada proporcional ao peso.
-            total = sum(peso_corredores.values())
-            if total == 0:
-                corredor = choice(list(peso_corredores.keys()))
-            else:
-                escolhas, prob = zip(*[(indice, peso / total) for indice, peso in peso_corredores.items()])
-                corredor = choices(escolhas, weights=prob, k=1)[0]
+            corredor = roleta.sorteia()
 
-            # Atualizando universo dos corredores.
-            if copiaSol.corredoresDisp[corredor] == 0:
-                copiaSol.corredores.append(corredor)
-                copiaSol.corredoresDisp[corredor] = 1
-                copiaSol.qntCorredores += 1
-
-                for item, qnt in self.problema.aisles[corredor].items():
-                    copiaSol.itensC[item] += qnt
-                    copiaSol.universoC[item] += qnt
+            # Atualizando universo dos corredores (na própria solução, desfazendo se ela não melhorar).
+            if solucao.corredoresDisp[corredor] == 0:
+                passo = Metodos.adiciona_corredor_reversivel(self.problema, solucao, corredor)
 
             else:
-                peso_corredores.pop(corredor)
+                roleta.remove(corredor)
                 continue
 
             # Adicionando pedidos se possível.
-            Metodos.adiciona_pedidos(self.problema, copiaSol)
+            Metodos.adiciona_pedidos_reversivel(self.problema, solucao, passo)
 
-            # Comparando as soluções, e salvando a atual caso seja melhor.
-            copiaSol.objetivo = Metodos.funcao_objetivo(self.problema, copiaSol.itensP, copiaSol.itensC) / copiaSol.qntCorredores
-            if copiaSol.objetivo > solucao.objetivo or copiaSol.qntItens < self.problema.lb or copiaSol.qntItens == 0:
-                solucao = copiaSol
-                peso_corredores.pop(corredor)
+            # Comparando as soluções, e mantendo a atual caso seja melhor.
+            objetivo = Metodos.funcao_objetivo_incremental(self.problema, solucao) / solucao.qntCorredores
+            if objetivo > passo.objetivo or solucao.qntItens < self.problema.lb or solucao.qntItens == 0:
+                solucao.objetivo = objetivo
+                roleta.remove(corredor)
                 tentativas_sem_melhora = 0
+                if movimento is not None:
+                    movimento.acumula(passo)
             else:
+                Metodos.desfaz_movimento(self.problema, solucao, passo)
                 tentativas_sem_melhora += 1
 
         return solucao
 
-    def construtor_aleatorio(self, solucao):
+    def construtor_aleatorio(self, solucao, movimento = None):
         corredores_selecionados = list(range(self.problema.a))       # Lista dos corredores embaralhados.
         shuffle(corredores_selecionados)
+        tamanho = self.problema.tamanho_pedidos.tolist()             # Quantidade total de itens de cada pedido.
 
             # Percorrendo os corredores.
         for corredor in corredores_selecionados:
-            nova_solucao = solucao.clone()
-
-            if nova_solucao.corredoresDisp[corredor] == 0:
-                # Atualizando universo dos corredores.
-                nova_solucao.corredores.append(corredor)
-                nova_solucao.corredoresDisp[corredor] = 1
-                nova_solucao.qntCorredores += 1
-
-                for item, qnt in self.problema.aisles[corredor].items():
-                    nova_solucao.itensC[item] += qnt
-                    nova_solucao.universoC[item] += qnt
+            if solucao.corredoresDisp[corredor] == 0:
+                # Atualizando universo dos corredores (na própria solução, desfazendo se ela não melhorar).
+                passo = Metodos.adiciona_corredor_reversivel(self.problema, solucao, corredor)
             else:
                 continue
 
             # Verificando os pedidos disponíveis.
-            pedidos_sorteados = []                              # Lista dos pedidos possíveis aleatórios.
-            quantidade = 0                                      # Quantidade de pedidos possíveis.
-            for indice in range(self.problema.o):
-                if not nova_solucao.pedidosDisp[indice]:
-                    valida = True
-                    for item, qnt in self.problema.orders[indice].items():
-                        if qnt > nova_solucao.universoC[item]:
-                            valida = False
-                            break
-                    if valida:
-                        pedidos_sorteados.append(indice)
-                        quantidade += 1
+            pedidos_sorteados = Metodos.pedidos_viaveis(self.problema, solucao)     # Lista dos pedidos possíveis aleatórios.
+            quantidade = len(pedidos_sorteados)                 # Quantidade de pedidos possíveis.
 
             # Adicionando os pedidos.
             if quantidade:
@@ -661,30 +741,20 @@ class ALNS:
                     shuffle(pedidos_sorteados)
 
                 # Define quantos pedidos tentar adicionar.
-                limite_pedidos = randint(1, quantidade) if nova_solucao.qntItens > self.problema.lb else quantidade
+                limite_pedidos = randint(1, quantidade) if solucao.qntItens > self.problema.lb else quantidade
 
                 for indice in pedidos_sorteados[:limite_pedidos]:
-                    if not nova_solucao.pedidosDisp[indice]:
-                        valida = True
-                        soma = 0
-                        for item, qnt in self.problema.orders[indice].items():
-                            soma += qnt
-                            if qnt > nova_solucao.universoC[item]:
-                                valida = False
-                                break
-                        if valida and nova_solucao.qntItens + soma <= self.problema.ub:
-                            nova_solucao.qntItens += soma
-                            nova_solucao.pedidosDisp[indice] = 1
-                            nova_solucao.pedidos.append(indice)
-                            for item, qnt in self.problema.orders[indice].items():
-                                nova_solucao.universoC[item] -= qnt
-                                nova_solucao.itensP[item] += qnt
+                    if not solucao.pedidosDisp[indice] and solucao.qntItens + tamanho[indice] <= self.problema.ub and Metodos.pedido_viavel(self.problema, solucao, indice):
+                        Metodos.adiciona_pedido_reversivel(self.problema, solucao, indice, passo)
 
             # Verificando a nova solução.
-            nova_solucao.objetivo = Metodos.funcao_objetivo(self.problema, nova_solucao.itensP, nova_solucao.itensC) / nova_solucao.qntCorredores
-            if nova_solucao.objetivo > solucao.objetivo or nova_solucao.qntItens < self.problema.lb or nova_solucao.qntItens == 0:
-                solucao = nova_solucao
+            objetivo = Metodos.funcao_objetivo_incremental(self.problema, solucao) / solucao.qntCorredores
+            if objetivo > passo.objetivo or solucao.qntItens < self.problema.lb or solucao.qntItens == 0:
+                solucao.objetivo = objetivo
+                if movimento is not None:
+                    movimento.acumula(passo)
             else:
+                Metodos.desfaz_movimento(self.problema, solucao, passo)
                 break
 
         return solucao
@@ -707,31 +777,108 @@ class ALNS:
             return True
         return random() < math.exp((obj_novo - obj_atual) / self.temp)
 
-    def run(self, iteracoes):
+    def run(self, iteracoes, orcamento: Metodos.Orcamento = None, rastro: Metodos.Rastro = None):
         tempo_inicio = perf_counter()
+        self.itera(iteracoes, orcamento, rastro)
+        self.sol_melhor.tempo += perf_counter() - tempo_inicio
+
+        return self.sol_melhor
+
+    def run_paralelo(self, iteracoes, cadeias, processos = None, epocas = 10, orcamento: Metodos.Orcamento = None, rastro: Metodos.Rastro = None):
+        """
+        Executa o ALNS com várias cadeias cooperativas em processos separados.
+
+        Todas as cadeias partem da solução atual, cada uma com a sua semente (sorteada pelo gerador principal a cada época), temperatura e pesos. As iterações são divididas em épocas; ao fim de cada época, a melhor solução global é atualizada, os pesos dos operadores (peso_dest e peso_reco) são substituídos pela média das cadeias, e as cadeias piores que a melhor global recomeçam a partir dela. Com a instrumentação ativa, os contadores das cadeias são somados aos deste processo.
+
+        Args:
+            iteracoes (int): Quantidade de iterações de cada cadeia.
+            cadeias (int): Quantidade de cadeias.
+            processos (int | None): Quantidade máxima de processos (None usa a quantidade de núcleos da máquina, 1 executa as cadeias no processo atual).
+            epocas (int): Quantidade de trocas de informação entre as cadeias.
+            orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
+            rastro (Rastro | None): Registro da convergência ao fim de cada época (iterações feitas, solução atual da melhor cadeia, melhor objetivo global e temperatura).
+
+        Returns:
+            sol_melhor (Solucao): Melhor solução encontrada entre todas as cadeias.
+        """
+
+        global _problema_processos
+        tempo_inicio = perf_counter()
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+        por_epoca = max(1, math.ceil(iteracoes / epocas))
+        # Cada cadeia altera a própria solução atual (ver itera), então elas não compartilham o objeto.
+        estados = [(self.sol_atual.clone(), self.sol_melhor, self.peso_dest[:], self.peso_reco[:], self.temp) for _ in range(cadeias)]
+
+        self.problema.compacta()
+        _problema_processos = self.problema
+        contexto = get_context("fork") if "fork" in get_all_start_methods() else None
+        try:
+            with ProcessPoolExecutor(max_workers=processos, mp_context=contexto, initializer=_inicializa_processos, initargs=(self.problema,)) if processos != 1 else nullcontext() as executor:
+                # Sem processos, as cadeias contam direto nos contadores deste processo.
+                instrumentar = executor is not None and Metodos.instrumentacao_ativa()
+                feitas = 0
+                while feitas < iteracoes and not orcamento.esgotado():
+                    quantidade = min(por_epoca, iteracoes - feitas)
+                    tarefas = [(estado, quantidade, getrandbits(32), self.taxa_resf, orcamento, instrumentar) for estado in estados]
+                    if executor is not None:
+                        resultados = list(executor.map(_executa_cadeia, tarefas))
+                    else:
+                        # As cadeias redefinem as sementes, então o estado dos geradores deste processo é restaurado depois delas.
+                        geradores = getstate(), np.random.get_state()
+                        resultados = [_executa_cadeia(tarefa) for tarefa in tarefas]
+                        setstate(geradores[0])
+                        np.random.set_state(geradores[1])
+                    estados = [estado for estado, _ in resultados]
+                    _acumula_perfis(resultados)
+                    feitas += quantidade
+
+                    # Atualizando a melhor solução global (empates ficam com a primeira cadeia).
+                    melhor = max(range(cadeias), key=lambda k: estados[k][1].objetivo)
+                    if estados[melhor][1].objetivo > self.sol_melhor.objetivo:
+                        self.sol_melhor = estados[melhor][1]
+                    self.sol_atual = estados[melhor][0]
+                    self.temp = estados[melhor][4]
+
+                    # Combinando os pesos dos operadores e reiniciando as cadeias piores a partir da melhor solução global.
+                    self.peso_dest = [statistics.fmean(pesos) for pesos in zip(*(estado[2] for estado in estados))]
+                    self.peso_reco = [statistics.fmean(pesos) for pesos in zip(*(estado[3] for estado in estados))]
+                    if rastro is not None:
+                        rastro.registra("ALNS", feitas, self.sol_atual.objetivo, self.sol_melhor.objetivo, self.temp)
+                    estados = [(atual if sol_melhor.objetivo >= self.sol_melhor.objetivo else self.sol_melhor.clone(), self.sol_melhor, self.peso_dest[:], self.peso_reco[:], temp) for atual, sol_melhor, _, _, temp in estados]
+        finally:
+            _problema_processos = None
+
+        self.sol_melhor.tempo += perf_counter() - tempo_inicio
+
+        return self.sol_melhor
+
+    def itera(self, iteracoes, orcamento: Metodos.Orcamento = None, rastro: Metodos.Rastro = None):
+        orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
         for i in range(iteracoes):
+            # Se o prazo acabar, retorna a melhor solução encontrada até o momento.
+            if orcamento.esgotado():
+                break
             i_des, des = self.seleciona_operador(self.destruidores, self.peso_dest)
             i_rec, rec = self.seleciona_operador(self.reconstrutores, self.peso_reco)
 
-            candidata = self.sol_atual.clone()
-            candidata = des(candidata)
-            candidata = rec(candidata)
-
+            # A candidata é montada na própria solução atual e desfeita se não for aceita; apenas uma nova melhor solução é clonada.
             obj_atual = self.sol_atual.objetivo
-            obj_novo = candidata.objetivo
+            movimento = Metodos.Movimento(self.sol_atual)
+            des(self.sol_atual, movimento=movimento)
+            rec(self.sol_atual, movimento=movimento)
+            obj_novo = self.sol_atual.objetivo
 
             if self.aceita_solucao(obj_atual, obj_novo):
 
-                self.sol_atual = candidata
                 recompensa = 1 + max(0, obj_novo - obj_atual)
                 self.atualiza_pesos(i_des, self.peso_dest, recompensa)
                 self.atualiza_pesos(i_rec, self.peso_reco, recompensa)
 
                 if obj_novo > self.sol_melhor.objetivo:
-                    self.sol_melhor = candidata.clone()
+                    self.sol_melhor = self.sol_atual.clone()
+            else:
+                Metodos.desfaz_movimento(self.problema, self.sol_atual, movimento)
 
             self.temp *= self.taxa_resf
-
-        self.sol_melhor.tempo += perf_counter() - tempo_inicio
-
-        return self.sol_melhor
\ No newline at end of file
+            if rastro is not None:
+                rastro.registra("ALNS", i, self.sol_atual.objetivo, self.sol_melhor.objetivo, self.temp)
\ No newline at end of file
@@ -0,0 +1,362 @@
+import Metodos
+import Processa
+
+# Tipos das alterações registradas em um Movimento.
+_ADICAO_CORREDOR = 0        # (tipo, corredor): corredor adicionado no fim da lista.
+_REMOCAO_CORREDOR = 1       # (tipo, corredor, posição): corredor removido da posição da lista.
+_SUBSTITUICAO_CORREDOR = 2  # (tipo, posição, corredor antigo, corredor novo).
+_ADICAO_PEDIDOS = 3         # (tipo, início): pedidos adicionados no fim da lista, a partir da posição início.
+_REMOCAO_PEDIDO = 4         # (tipo, pedido, posição): pedido removido da posição da lista.
+_SUBSTITUICAO_PEDIDO = 5    # (tipo, posição, pedido antigo, pedido novo).
+_REINICIO_PEDIDOS = 6       # (tipo, universoC, pedidos, pedidosDisp, itensP, qntItens, violados): estruturas substituídas pelo reinicia_pedidos.
+_PEDIDOS = (_ADICAO_PEDIDOS, _REMOCAO_PEDIDO, _SUBSTITUICAO_PEDIDO, _REINICIO_PEDIDOS)     # Alterações que só afetam as estruturas dos pedidos.
+
+class Movimento(list):
+    """
+    Registro das alterações feitas em uma solução pelas funções reversíveis (adiciona_corredor_reversivel, remove_corredor_reversivel, etc.), usado para desfazer o movimento com desfaz_movimento.
+
+    Cada entrada guarda apenas o que mudou (o corredor ou pedido e a posição dele na lista), sem clonar a solução. A reinicialização dos pedidos (usada pela remoção e troca de corredores apenas quando a solução já era inviável) guarda as estruturas antigas, que são substituídas e não alteradas. O objetivo da solução no início do movimento também é guardado e restaurado ao desfazer.
+
+    As alterações do índice incremental de viabilidade (faltantes) feitas pelo altera_corredor também são registradas, como pares (pedido, valor antigo), e restauradas no fim: desfazer uma alteração de corredor só percorre os itens dele e os pedidos cujo valor mudou, sem repetir as buscas binárias e sem copiar o índice.
+
+    Vários movimentos podem ser acumulados no mesmo registro, passando-o para as funções reversíveis (ou juntando registros com acumula), e são desfeitos em ordem inversa.
+
+    Args:
+        solucao (Solucao): Solução que será alterada.
+
+    Atributos:
+        objetivo (float): Objetivo da solução antes do movimento.
+        faltantes (List[Tuple[int, int]]): Pares (pedido, valor antigo) alterados no índice de viabilidade, na ordem das alterações (vazia se nenhum corredor foi alterado ou se o índice está desativado).
+    """
+
+    __slots__ = ("objetivo", "faltantes")
+
+    def __init__(self, solucao: Metodos.Solucao):
+        super().__init__()
+        self.objetivo = solucao.objetivo
+        self.faltantes = []
+
+    def acumula(self, movimento: "Movimento"):
+        """
+        Função responsável por acrescentar a este registro as alterações de um movimento feito depois dele, que passam a ser desfeitas junto com as deste (o objetivo guardado continua o deste).
+
+        Args:
+            movimento (Movimento): Registro das alterações seguintes (é esvaziado).
+        """
+
+        self.extend(movimento)
+        self.faltantes.extend(movimento.faltantes)
+        movimento.clear()
+        movimento.faltantes.clear()
+
+def _soma_pedido(problema: Processa.Problema, solucao: Metodos.Solucao, pedido: int, sinal: int):
+    # Soma (sinal = 1) ou subtrai (sinal = -1) os itens do pedido nos itens dos pedidos selecionados, mantendo o contador de itens violados. Não altera as listas de pedidos.
+    universoC, itensP = solucao.universoC, solucao.itensP
+    violados, total = solucao.violados, 0
+    for item, qnt in problema.orders[pedido].items():
+        disponivel = universoC[item]
+        universoC[item] = disponivel - sinal * qnt
+        itensP[item] += sinal * qnt
+        violados += (disponivel - sinal * qnt < 0) - (disponivel < 0)
+        total += qnt
+    solucao.violados = violados
+    solucao.qntItens += sinal * total
+
+def _remove_pedidos(problema: Processa.Problema, solucao: Metodos.Solucao, inicio: int):
+    # Desfaz a adição dos pedidos a partir da posição início da lista, removendo dos dicionários esparsos os itens que zeram (como no clone descartado, eles não ficam acumulados nas buscas).
+    universoC, itensP, itensC = solucao.universoC, solucao.itensP, solucao.itensC
+    pedidosDisp = solucao.pedidosDisp
+    violados, total = solucao.violados, 0
+    for pedido in solucao.pedidos[inicio:]:
+        pedidosDisp[pedido] = 0
+        for item, qnt in problema.orders[pedido].items():
+            disponivel = universoC[item]
+            universoC[item] = disponivel + qnt
+            violados -= disponivel < 0 <= disponivel + qnt
+            restante = itensP[item] - qnt
+            if restante:
+                itensP[item] = restante
+            else:
+                del itensP[item]
+                if not universoC[item] and not itensC[item]:
+                    del universoC[item]
+            total += qnt
+    del solucao.pedidos[inicio:]
+    solucao.violados = violados
+    solucao.qntItens -= total
+
+def _desfaz_corredor(problema: Processa.Problema, solucao: Metodos.Solucao, corredor: int, sinal: int):
+    # Versão do altera_corredor sem o índice de viabilidade (restaurado pelos pares registrados no movimento), removendo dos dicionários esparsos os itens que zeram.
+    itensC, universoC = solucao.itensC, solucao.universoC
+    violados = solucao.violados
+    for item, qnt in problema.aisles[corredor].items():
+        disponivel = universoC[item]
+        universoC[item] = disponivel + sinal * qnt
+        violados += (disponivel + sinal * qnt < 0) - (disponivel < 0)
+        restante = itensC[item] + sinal * qnt
+        if restante:
+            itensC[item] = restante
+        else:
+            del itensC[item]
+            if not universoC[item]:
+                del universoC[item]
+    solucao.violados = violados
+
+def _adiciona_corredor(problema: Processa.Problema, solucao: Metodos.Solucao, corredor: int, movimento: Movimento):
+    solucao.corredores.append(corredor)
+    solucao.corredoresDisp[corredor] = 1
+    solucao.qntCorredores += 1
+    Metodos.altera_corredor(problema, solucao, corredor, 1, movimento.faltantes)
+    movimento.append((_ADICAO_CORREDOR, corredor))
+
+def _remove_corredor(problema: Processa.Problema, solucao: Metodos.Solucao, corredor: int, movimento: Movimento):
+    posicao = solucao.corredores.index(corredor)
+    del solucao.corredores[posicao]
+    solucao.corredoresDisp[corredor] = 0
+    solucao.qntCorredores -= 1
+    Metodos.altera_corredor(problema, solucao, corredor, -1, movimento.faltantes)
+    movimento.append((_REMOCAO_CORREDOR, corredor, posicao))
+
+def _reinicia_pedidos(problema: Processa.Problema, solucao: Metodos.Solucao, movimento: Movimento):
+    movimento.append((_REINICIO_PEDIDOS, solucao.universoC, solucao.pedidos, solucao.pedidosDisp, solucao.itensP, solucao.qntItens, solucao.violados))
+    Metodos.reinicia_pedidos(problema, solucao)
+
+def _repara_pedidos(problema: Processa.Problema, solucao: Metodos.Solucao, itens: dict, movimento: Movimento):
+    # Versão reversível do repara_pedidos.
+    for pedido in Metodos.pedidos_removidos(problema, solucao, itens):
+        remove_pedido_reversivel(problema, solucao, pedido, movimento)
+    if solucao.violados:
+        _reinicia_pedidos(problema, solucao, movimento)
+
+def adiciona_corredor_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, corredor: int, movimento: Movimento = None) -> Movimento:
+    """
+    Versão reversível do adiciona_corredor: adiciona o corredor (se ele existir e não estiver na solução), sem adicionar pedidos.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        corredor (int): Índice do corredor que será inserido.
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    if corredor >= 0 and corredor < problema.a and not solucao.corredoresDisp[corredor]:
+        _adiciona_corredor(problema, solucao, corredor, movimento)
+    return movimento
+
+def remove_corredor_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, corredor: int, movimento: Movimento = None) -> Movimento:
+    """
+    Versão reversível do remove_corredor: remove o corredor (se a solução tiver mais de um) e os pedidos que deixam de caber nos corredores.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        corredor (int): Índice do corredor que será removido.
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    if solucao.qntCorredores > 1:
+        _remove_corredor(problema, solucao, corredor, movimento)
+        _repara_pedidos(problema, solucao, problema.aisles[corredor], movimento)
+    return movimento
+
+def troca_corredor_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, corredor_max: int, corredor_min: int, movimento: Movimento = None) -> Movimento:
+    """
+    Versão reversível do troca_corredor: troca os corredores (se o corredor inserido existir) e remove os pedidos que deixam de caber nos corredores.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        corredor_max (int): Índice do corredor que será inserido.
+        corredor_min (int): Índice do corredor que será removido.
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    if corredor_max >= 0 and corredor_max < problema.a:
+        _remove_corredor(problema, solucao, corredor_min, movimento)
+        _adiciona_corredor(problema, solucao, corredor_max, movimento)
+        _repara_pedidos(problema, solucao, problema.aisles[corredor_min], movimento)
+    return movimento
+
+def substitui_corredor_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, posicao: int, corredor: int, movimento: Movimento = None) -> Movimento:
+    """
+    Função responsável por substituir o corredor de uma posição da lista de corredores por um corredor fora da solução, mantendo os pedidos (que podem ficar inviáveis).
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        posicao (int): Posição do corredor substituído em solucao.corredores.
+        corredor (int): Índice do corredor que entra (não pode estar na solução).
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    antigo = solucao.corredores[posicao]
+    Metodos.altera_corredor(problema, solucao, antigo, -1, movimento.faltantes)
+    Metodos.altera_corredor(problema, solucao, corredor, 1, movimento.faltantes)
+    solucao.corredores[posicao] = corredor
+    solucao.corredoresDisp[antigo] = 0
+    solucao.corredoresDisp[corredor] = 1
+    movimento.append((_SUBSTITUICAO_CORREDOR, posicao, antigo, corredor))
+    return movimento
+
+def adiciona_pedido_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, pedido: int, movimento: Movimento = None) -> Movimento:
+    """
+    Versão reversível do adiciona_pedido: adiciona o pedido na solução, sem verificar a viabilidade.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        pedido (int): Índice do pedido que será inserido (não pode estar na solução).
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    # Adições seguidas de pedidos ficam na mesma entrada.
+    if not movimento or movimento[-1][0] != _ADICAO_PEDIDOS:
+        movimento.append((_ADICAO_PEDIDOS, len(solucao.pedidos)))
+    Metodos.adiciona_pedido(problema, solucao, pedido)
+    return movimento
+
+def adiciona_pedidos_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, movimento: Movimento = None) -> Movimento:
+    """
+    Versão reversível do adiciona_pedidos: adiciona os pedidos viáveis de forma gulosa. Como os pedidos são adicionados no fim da lista, o registro guarda apenas a posição do primeiro.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    inicio = len(solucao.pedidos)
+    Metodos.adiciona_pedidos(problema, solucao)
+    if len(solucao.pedidos) > inicio and (not movimento or movimento[-1][0] != _ADICAO_PEDIDOS):
+        movimento.append((_ADICAO_PEDIDOS, inicio))
+    return movimento
+
+def remove_pedido_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, pedido: int, movimento: Movimento = None) -> Movimento:
+    """
+    Função responsável por remover um pedido da solução, mantendo os demais.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        pedido (int): Índice do pedido que será removido (precisa estar na solução).
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    posicao = solucao.pedidos.index(pedido)
+    del solucao.pedidos[posicao]
+    solucao.pedidosDisp[pedido] = 0
+    _soma_pedido(problema, solucao, pedido, -1)
+    movimento.append((_REMOCAO_PEDIDO, pedido, posicao))
+    return movimento
+
+def substitui_pedido_reversivel(problema: Processa.Problema, solucao: Metodos.Solucao, posicao: int, pedido: int, movimento: Movimento = None) -> Movimento:
+    """
+    Função responsável por substituir o pedido de uma posição da lista de pedidos por um pedido fora da solução, sem verificar a viabilidade.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        posicao (int): Posição do pedido substituído em solucao.pedidos.
+        pedido (int): Índice do pedido que entra (não pode estar na solução).
+        movimento (Movimento | None): Registro em que a alteração é acumulada (None cria um novo).
+
+    Returns:
+        movimento (Movimento): Registro para desfazer a alteração.
+    """
+
+    movimento = movimento if movimento is not None else Movimento(solucao)
+    antigo = solucao.pedidos[posicao]
+    _soma_pedido(problema, solucao, antigo, -1)
+    _soma_pedido(problema, solucao, pedido, 1)
+    solucao.pedidos[posicao] = pedido
+    solucao.pedidosDisp[antigo] = 0
+    solucao.pedidosDisp[pedido] = 1
+    movimento.append((_SUBSTITUICAO_PEDIDO, posicao, antigo, pedido))
+    return movimento
+
+def desfaz_movimento(problema: Processa.Problema, solucao: Metodos.Solucao, movimento: Movimento):
+    """
+    Função responsável por desfazer as alterações registradas no movimento, em ordem inversa, restaurando também o objetivo. O registro é esvaziado.
+
+    A solução volta a ter os mesmos corredores e pedidos, nas mesmas posições das listas, e as mesmas quantidades nas estruturas auxiliares. Os itens que zeram ao desfazer adições são removidos dos dicionários esparsos.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Solução alterada pelo movimento (sem outras alterações depois dele).
+        movimento (Movimento): Registro das alterações.
+    """
+
+    # As alterações dos pedidos feitas depois da primeira reinicialização não precisam ser desfeitas, pois ela restaura as estruturas dos pedidos anteriores (apenas os corredores são desfeitos).
+    reinicio = next((posicao for posicao, entrada in enumerate(movimento) if entrada[0] == _REINICIO_PEDIDOS), len(movimento))
+    while movimento:
+        entrada = movimento.pop()
+        tipo = entrada[0]
+        if len(movimento) > reinicio and tipo in _PEDIDOS:
+            continue
+        if tipo == _ADICAO_PEDIDOS:
+            _remove_pedidos(problema, solucao, entrada[1])
+        elif tipo == _REINICIO_PEDIDOS:
+            _, solucao.universoC, solucao.pedidos, solucao.pedidosDisp, solucao.itensP, solucao.qntItens, solucao.violados = entrada
+        elif tipo == _ADICAO_CORREDOR:
+            corredor = solucao.corredores.pop()
+            solucao.corredoresDisp[corredor] = 0
+            solucao.qntCorredores -= 1
+            _desfaz_corredor(problema, solucao, corredor, -1)
+        elif tipo == _REMOCAO_CORREDOR:
+            _, corredor, posicao = entrada
+            solucao.corredores.insert(posicao, corredor)
+            solucao.corredoresDisp[corredor] = 1
+            solucao.qntCorredores += 1
+            _desfaz_corredor(problema, solucao, corredor, 1)
+        elif tipo == _SUBSTITUICAO_CORREDOR:
+            _, posicao, antigo, corredor = entrada
+            _desfaz_corredor(problema, solucao, corredor, -1)
+            _desfaz_corredor(problema, solucao, antigo, 1)
+            solucao.corredores[posicao] = antigo
+            solucao.corredoresDisp[corredor] = 0
+            solucao.corredoresDisp[antigo] = 1
+        elif tipo == _REMOCAO_PEDIDO:
+            _, pedido, posicao = entrada
+            solucao.pedidos.insert(posicao, pedido)
+            solucao.pedidosDisp[pedido] = 1
+            _soma_pedido(problema, solucao, pedido, 1)
+        else:
+            _, posicao, antigo, pedido = entrada
+            _soma_pedido(problema, solucao, pedido, -1)
+            _soma_pedido(problema, solucao, antigo, 1)
+            solucao.pedidos[posicao] = antigo
+            solucao.pedidosDisp[pedido] = 0
+            solucao.pedidosDisp[antigo] = 1
+    faltantes = solucao.faltantes
+    for pedido, valor in reversed(movimento.faltantes):
+        faltantes[pedido] = valor
+    movimento.faltantes.clear()
+    solucao.objetivo = movimento.objetivo
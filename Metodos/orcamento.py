@@ -0,0 +1,50 @@
+from math import inf
+from time import monotonic
+
+class Orcamento:
+    """
+    Orçamento de tempo de relógio (prazo) compartilhado pelos métodos. Os métodos verificam o prazo nos seus laços internos e, quando ele acaba, retornam a melhor solução encontrada até o momento.
+
+    O prazo é um instante absoluto do relógio monotônico do sistema, então o mesmo orçamento continua válido quando enviado para outros processos da mesma máquina.
+
+    Args:
+        segundos (float | None): Tempo disponível a partir de agora, em segundos (None para um orçamento ilimitado).
+
+    Atributos:
+        prazo (float): Instante (time.monotonic) em que o orçamento acaba.
+    """
+
+    def __init__(self, segundos: float = None):
+        self.prazo = inf if segundos is None else monotonic() + segundos
+
+    def restante(self) -> float:
+        """
+        Returns:
+            restante (float): Tempo restante, em segundos (0 se esgotado, inf se ilimitado).
+        """
+
+        return max(0.0, self.prazo - monotonic())
+
+    def esgotado(self) -> bool:
+        """
+        Returns:
+            esgotado (bool): True se o prazo já passou.
+        """
+
+        return monotonic() >= self.prazo
+
+    def fracao(self, proporcao: float) -> "Orcamento":
+        """
+        Função responsável por criar um orçamento com uma fração do tempo restante, usado para dividir o tempo entre etapas (por exemplo, construção e refinamento).
+
+        Args:
+            proporcao (float): Fração do tempo restante, entre 0 e 1.
+
+        Returns:
+            orcamento (Orcamento): Novo orçamento, que acaba antes (ou junto) deste.
+        """
+
+        parte = Orcamento()
+        if self.prazo != inf:
+            parte.prazo = monotonic() + self.restante() * proporcao
+        return parte
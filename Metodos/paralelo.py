@@ -0,0 +1,170 @@
+import Metodos
+import numpy as np
+import os
+import Processa
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from time import perf_counter
+from typing import List, Tuple
+
+_problema = None    # Problema compartilhado com os processos filhos (herdado pelo fork ou recebido uma única vez pelo inicializador).
+
+def define_semente(semente: float):
+    """
+    Função responsável por definir a semente dos geradores aleatórios usados pelos métodos (random e np.random, este último usado pelo voo de Lévy do FPA).
+
+    Args:
+        semente (float): Semente numérica.
+    """
+
+    random.seed(semente)
+    np.random.seed(hash(semente) % 2**32)
+
+def executa(problema: Processa.Problema, construtiva: str, refinamento: str, semente: float, orcamento: Metodos.Orcamento = None, fracao_construcao: float = 0.5, processos_metaheuristica: int = None, rastro: Metodos.Rastro = None, maximo_variaveis: int = Metodos.MAXIMO_VARIAVEIS_MILP) -> Metodos.Solucao:
+    """
+    Função responsável por executar o pipeline completo (heurística construtiva ou metaheurística, seguida do refinamento) para uma semente.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        construtiva (str): Heurística construtiva ou metaheurística: 0 (híbrida), 1 (aleatória), 2 (gulosa), 3 (PSO discreto), 4 (FPA), 5 (ALNS), 6 (paramétrica), 7 (Dinkelbach a partir da paramétrica), 8 (Dinkelbach exato com MILP, a partir da gulosa).
+        refinamento (str): Heurística de refinamento: 1 (melhor_vizinhanca), 2 (refinamento_cluster_vns), qualquer outro valor (nenhuma).
+        semente (float): Semente numérica para a aleatoriedade.
+        orcamento (Orcamento | None): Prazo de execução do pipeline completo (None para nenhum limite de tempo).
+        fracao_construcao (float): Fração do orçamento reservada para a heurística construtiva ou metaheurística, quando há refinamento. O refinamento usa o restante (incluindo o que sobrar da construção).
+        processos_metaheuristica (int | None): Quantidade de processos usados pela população do FPA ou pelas cadeias do ALNS (None para a execução sequencial).
+        rastro (Rastro | None): Registro da convergência do PSO, do FPA, do ALNS ou do Dinkelbach (as heurísticas construtivas e os refinamentos não registram nada).
+        maximo_variaveis (int): Quantidade máxima de pedidos + corredores para usar o modelo exato do MILP (ver dinkelbach_milp).
+
+    Returns:
+        solucao (Solucao): Dataclass representando a solução encontrada, incluindo estruturas auxiliares.
+    """
+
+    # Definindo a semente.
+    define_semente(semente)
+
+    # Dividindo o orçamento entre a construção e o refinamento.
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
+    construcao = orcamento.fracao(fracao_construcao) if refinamento in ("1", "2") else orcamento
+
+    # Construindo uma solução.
+    if construtiva == "0":
+        solucao = Metodos.hibrida(problema)
+    elif construtiva == "1":
+        solucao = Metodos.aleatorio(problema)
+    elif construtiva == "2":
+        solucao = Metodos.gulosa(problema)
+    elif construtiva == "3":
+        solucao = Metodos.PSO(problema, 30, 2, 2, 1, 1000, construcao, rastro)
+    elif construtiva == "4":
+        FPA_instance = Metodos.FPA(problema, processos_metaheuristica)
+        solucao = FPA_instance.run(construcao, rastro)
+    elif construtiva == "5":
+        solucao = Metodos.gulosa(problema)
+        ALNS = Metodos.ALNS(problema, solucao, 10, 0.999)
+        if processos_metaheuristica is not None and processos_metaheuristica > 1:
+            solucao = ALNS.run_paralelo(1000, processos_metaheuristica, processos_metaheuristica, orcamento=construcao, rastro=rastro)
+        else:
+            solucao = ALNS.run(1000, construcao, rastro)
+    elif construtiva == "6":
+        solucao = Metodos.parametrica(problema, construcao)
+    elif construtiva == "7":
+        solucao = Metodos.dinkelbach(problema, Metodos.parametrica(problema, construcao), construcao, rastro=rastro)
+    elif construtiva == "8":
+        solucao = Metodos.dinkelbach_milp(problema, Metodos.gulosa(problema), construcao, maximo_variaveis=maximo_variaveis, rastro=rastro)
+    else:
+        raise ValueError(f"Heurística construtiva inválida: {construtiva}")
+
+    # Refinando a solução.
+    if refinamento == "1":
+        solucao = Metodos.melhor_vizinhanca(problema, solucao, orcamento)
+    elif refinamento == "2":
+        solucao = Metodos.refinamento_cluster_vns(problema, solucao, orcamento)
+
+    return solucao
+
+def _inicializa_processo(problema: Processa.Problema):
+    global _problema
+    _problema = problema
+
+def _executa_semente(tarefa: tuple) -> Tuple[float, Metodos.Solucao, float, dict]:
+    construtiva, refinamento, semente, orcamento, fracao_construcao, instrumentar, rastro, maximo_variaveis = tarefa
+
+    # Cada semente devolve apenas os próprios contadores (processos com fork herdam os do processo principal).
+    if instrumentar:
+        Metodos.ativa_instrumentacao()
+        Metodos.reinicia_instrumentacao()
+
+    # Cada semente escreve o rastro no próprio arquivo.
+    if rastro is not None:
+        base, extensao = os.path.splitext(rastro)
+        rastro = Metodos.Rastro(f"{base}-{semente:g}{extensao}")
+
+    inicio = perf_counter()
+    try:
+        solucao = executa(_problema, construtiva, refinamento, semente, orcamento, fracao_construcao, rastro=rastro, maximo_variaveis=maximo_variaveis)
+    finally:
+        if rastro is not None:
+            rastro.fecha()
+    tempo_total = perf_counter() - inicio
+    return semente, solucao, tempo_total, Metodos.perfil_instrumentacao() if instrumentar else None
+
+def multi_inicio(problema: Processa.Problema, construtiva: str, refinamento: str, sementes: List[float], processos: int = None, orcamento: Metodos.Orcamento = None, fracao_construcao: float = 0.5, rastro: str = None, maximo_variaveis: int = Metodos.MAXIMO_VARIAVEIS_MILP) -> Tuple[Metodos.Solucao, List[dict]]:
+    """
+    Função responsável por executar o pipeline para várias sementes independentes em paralelo, mantendo a melhor solução.
+
+    O problema é lido uma única vez: em sistemas com fork, os processos filhos herdam o problema já carregado (e sua representação compacta); nos demais, ele é enviado uma vez para cada processo pelo inicializador.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        construtiva (str): Heurística construtiva ou metaheurística (ver executa).
+        refinamento (str): Heurística de refinamento (ver executa).
+        sementes (List[float]): Sementes que serão executadas.
+        processos (int | None): Quantidade máxima de processos (None usa a quantidade de núcleos da máquina).
+        orcamento (Orcamento | None): Prazo compartilhado por todas as sementes (ver executa).
+        fracao_construcao (float): Fração do orçamento de cada semente reservada para a construção (ver executa).
+        rastro (str | None): Arquivo do rastro de convergência (ver Rastro). Cada semente escreve em um arquivo próprio, com a semente antes da extensão (rastro.csv -> rastro-1.csv).
+        maximo_variaveis (int): Quantidade máxima de pedidos + corredores para usar o modelo exato do MILP (ver executa).
+
+    Com a instrumentação ativa, os contadores de todas as sementes são somados aos do processo principal (executa é chamado sem os processos internos do FPA e do ALNS; fora do multi_inicio, os contadores deles são somados pelos próprios métodos).
+
+    Returns:
+        melhor (Solucao): Melhor solução entre as sementes (empates ficam com a primeira semente).
+        registros (List[dict]): Semente, valor da função objetivo, tempo da heurística e tempo total de cada execução, na ordem das sementes.
+    """
+
+    global _problema
+    instrumentar = Metodos.instrumentacao_ativa()
+    tarefas = [(construtiva, refinamento, semente, orcamento, fracao_construcao, instrumentar, rastro, maximo_variaveis) for semente in sementes]
+    anterior = Metodos.perfil_instrumentacao() if instrumentar else None
+
+    # Construindo a representação compacta antes de dividir os processos, para ela ser compartilhada.
+    problema.compacta()
+    _problema = problema
+    try:
+        if processos == 1 or len(sementes) == 1:
+            resultados = [_executa_semente(tarefa) for tarefa in tarefas]
+        elif "fork" in get_all_start_methods():
+            with ProcessPoolExecutor(max_workers=processos, mp_context=get_context("fork")) as executor:
+                resultados = list(executor.map(_executa_semente, tarefas))
+        else:
+            with ProcessPoolExecutor(max_workers=processos, initializer=_inicializa_processo, initargs=(problema,)) as executor:
+                resultados = list(executor.map(_executa_semente, tarefas))
+    finally:
+        _problema = None
+
+    # Somando os contadores das sementes aos que o processo principal já tinha.
+    if instrumentar:
+        Metodos.reinicia_instrumentacao()
+        for perfil in [anterior] + [resultado[3] for resultado in resultados]:
+            Metodos.acumula_perfil(perfil)
+
+    # Selecionando a melhor solução.
+    melhor = None
+    registros = []
+    for semente, solucao, tempo_total, _ in resultados:
+        registros.append({"semente": semente, "objetivo": solucao.objetivo, "tempo": solucao.tempo, "tempo_total": tempo_total})
+        if melhor is None or solucao.objetivo > melhor.objetivo:
+            melhor = solucao
+
+    return melhor, registros
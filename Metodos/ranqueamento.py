@@ -0,0 +1,138 @@
+import heapq
+import Metodos
+import numpy as np
+import Processa
+from typing import List
+
+def _faixas(ptr: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Função responsável por concatenar as posições ptr[x] até ptr[x + 1] - 1 de cada índice x informado (as entradas de várias linhas de um CSR).
+
+    Args:
+        ptr (np.ndarray): Ponteiros do CSR.
+        indices (np.ndarray): Índices das linhas.
+
+    Returns:
+        posicoes (np.ndarray): Posições das entradas das linhas, linha por linha, na ordem do CSR.
+    """
+
+    inicios = ptr[indices].astype(np.int64)
+    tamanhos = ptr[indices + 1] - inicios
+    return np.repeat(inicios - np.cumsum(tamanhos) + tamanhos, tamanhos) + np.arange(tamanhos.sum())
+
+class RanqueamentoGuloso:
+    """
+    Ranqueamento dinâmico dos corredores e pedidos disponíveis (não selecionados), com base em uma concentração cruzada dos itens, usado pelos construtores gulosos que retiram corredores e pedidos do conjunto disponível a cada passo. A nota de um pedido soma a quantidade de cada item dele vezes a média da oferta desse item nos corredores disponíveis, e a de um corredor, a quantidade de cada item vezes a média da demanda nos pedidos disponíveis.
+
+    Mantém a concentração (total e contagem) de cada item nos corredores e pedidos disponíveis e as notas de todos os corredores e pedidos. Quando um corredor ou pedidos deixam o conjunto disponível, apenas os itens deles são atualizados, e apenas as linhas que contêm esses itens recebem uma nova nota (recalculada do zero, na mesma ordem de soma do cálculo inicial, então as notas são idênticas às de um ranqueamento completo). Os corredores ficam em um heap de máximo com invalidação preguiçosa (entradas com nota desatualizada ou de corredores já selecionados são descartadas ao chegar no topo).
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Solução cujos corredores e pedidos não selecionados formam o conjunto disponível inicial.
+    """
+
+    def __init__(self, problema: Processa.Problema, solucao: Metodos.Solucao):
+        self.problema = problema
+        self.livres_c = np.frombuffer(solucao.corredoresDisp, dtype=np.uint8) == 0
+        self.livres_p = np.frombuffer(solucao.pedidosDisp, dtype=np.uint8) == 0
+
+        itens_c, qnts_c, _ = problema.corredores_csr
+        itens_p, qnts_p, _ = problema.pedidos_csr
+        mascara_c = self.livres_c[problema.corredores_linha]
+        mascara_p = self.livres_p[problema.pedidos_linha]
+
+        # Concentração (total e contagem) de cada item nos corredores e pedidos disponíveis.
+        self.total_corredores = np.bincount(itens_c[mascara_c], weights=qnts_c[mascara_c], minlength=problema.i)
+        self.contagem_corredores = np.bincount(itens_c[mascara_c], minlength=problema.i)
+        self.total_pedidos = np.bincount(itens_p[mascara_p], weights=qnts_p[mascara_p], minlength=problema.i)
+        self.contagem_pedidos = np.bincount(itens_p[mascara_p], minlength=problema.i)
+
+        self.peso_pedidos = np.divide(self.total_corredores, self.contagem_corredores, out=np.zeros(problema.i), where=self.contagem_corredores != 0)
+        self.peso_corredores = np.divide(self.total_pedidos, self.contagem_pedidos, out=np.zeros(problema.i), where=self.contagem_pedidos != 0)
+
+        # Notas de todas as linhas e heap dos corredores disponíveis (maior nota, empates pelo maior índice).
+        self.notas_pedidos = np.bincount(problema.pedidos_linha, weights=self.peso_pedidos[itens_p] * qnts_p, minlength=problema.o)
+        self.notas_corredores = np.bincount(problema.corredores_linha, weights=self.peso_corredores[itens_c] * qnts_c, minlength=problema.a)
+        self.heap = [(-nota, -corredor) for corredor, nota in zip(np.flatnonzero(self.livres_c).tolist(), self.notas_corredores[self.livres_c].tolist())]
+        heapq.heapify(self.heap)
+
+    def melhor_corredor(self) -> int:
+        """
+        Returns:
+            corredor (int): Corredor disponível de maior nota (empates pelo maior índice), ou -1 se não houver nenhum.
+        """
+
+        while self.heap:
+            nota, corredor = self.heap[0]
+            if self.livres_c[-corredor] and -nota == self.notas_corredores[-corredor]:
+                return -corredor
+            heapq.heappop(self.heap)
+        return -1
+
+    def ordena_pedidos(self, pedidos: List[int]) -> List[int]:
+        """
+        Função responsável por ordenar os pedidos informados pela nota (crescente, empates pelo índice).
+
+        Args:
+            pedidos (List[int]): Índices dos pedidos.
+
+        Returns:
+            pedidos (List[int]): Índices dos pedidos ordenados.
+        """
+
+        pedidos = np.asarray(pedidos, dtype=np.int64)
+        return pedidos[np.lexsort((pedidos, self.notas_pedidos[pedidos]))].tolist()
+
+    def _renota(self, csr, pesos, notas, linhas):
+        # Recalcula a nota das linhas informadas, somando as entradas na ordem do CSR (a mesma do bincount do cálculo inicial).
+        itens, qnts, ptr = csr
+        posicoes = _faixas(ptr, linhas)
+        locais = np.repeat(np.arange(len(linhas)), np.diff(ptr)[linhas])
+        notas[linhas] = np.bincount(locais, weights=pesos[itens[posicoes]] * qnts[posicoes], minlength=len(linhas))
+
+    def remove_corredor(self, corredor: int):
+        """
+        Função responsável por retirar um corredor do conjunto disponível, atualizando as notas dos pedidos que compartilham itens com ele.
+
+        Args:
+            corredor (int): Índice do corredor.
+        """
+
+        problema = self.problema
+        self.livres_c[corredor] = False
+        itens_c, qnts_c, ptr_c = problema.corredores_csr
+        itens = itens_c[ptr_c[corredor]:ptr_c[corredor + 1]]
+        self.total_corredores[itens] -= qnts_c[ptr_c[corredor]:ptr_c[corredor + 1]]
+        self.contagem_corredores[itens] -= 1
+        self.peso_pedidos[itens] = np.divide(self.total_corredores[itens], self.contagem_corredores[itens], out=np.zeros(len(itens)), where=self.contagem_corredores[itens] != 0)
+
+        ptr_i, pedidos_i = problema.pedidos_por_item
+        afetados = np.unique(pedidos_i[_faixas(ptr_i, itens)])
+        self._renota(problema.pedidos_csr, self.peso_pedidos, self.notas_pedidos, afetados)
+
+    def remove_pedidos(self, pedidos: List[int]):
+        """
+        Função responsável por retirar pedidos do conjunto disponível, atualizando as notas dos corredores que compartilham itens com eles.
+
+        Args:
+            pedidos (List[int]): Índices dos pedidos.
+        """
+
+        if not pedidos:
+            return
+        problema = self.problema
+        pedidos = np.asarray(pedidos, dtype=np.int64)
+        self.livres_p[pedidos] = False
+        itens_p, qnts_p, ptr_p = problema.pedidos_csr
+        posicoes = _faixas(ptr_p, pedidos)
+        np.subtract.at(self.total_pedidos, itens_p[posicoes], qnts_p[posicoes])
+        np.subtract.at(self.contagem_pedidos, itens_p[posicoes], 1)
+        itens = np.unique(itens_p[posicoes])
+        self.peso_corredores[itens] = np.divide(self.total_pedidos[itens], self.contagem_pedidos[itens], out=np.zeros(len(itens)), where=self.contagem_pedidos[itens] != 0)
+
+        ptr_i, corredores_i = problema.corredores_por_item
+        afetados = np.unique(corredores_i[_faixas(ptr_i, itens)])
+        self._renota(problema.corredores_csr, self.peso_corredores, self.notas_corredores, afetados)
+        for corredor, nota in zip(afetados.tolist(), self.notas_corredores[afetados].tolist()):
+            if self.livres_c[corredor]:
+                heapq.heappush(self.heap, (-nota, -corredor))
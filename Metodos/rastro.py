@@ -0,0 +1,51 @@
+import json
+from time import perf_counter
+
+class Rastro:
+    """
+    Registro da convergência das metaheurísticas (PSO, FPA, ALNS e Dinkelbach). A cada iteração (geração do PSO, polinização do FPA, iteração ou época do ALNS, rodada do Dinkelbach), uma linha com o método, a iteração, o tempo decorrido, o objetivo atual, o melhor objetivo e o parâmetro adaptativo (inércia do PSO, probabilidade p do FPA, temperatura do ALNS, lambda do Dinkelbach) é escrita no arquivo.
+
+    O arquivo é escrito aos poucos (com o buffer do sistema), sem guardar o histórico em memória. Se o caminho terminar em .ndjson ou .jsonl, cada linha é um objeto json; caso contrário, o arquivo é um csv com cabeçalho. Os gráficos são gerados à parte, pelo plota_rastro.py.
+
+    Args:
+        caminho (str): Arquivo em que o rastro será escrito (sobrescrito se existir).
+
+    Atributos:
+        inicio (float): Instante (perf_counter) de criação do rastro, a partir do qual o tempo decorrido é medido.
+    """
+
+    CAMPOS = ("metodo", "iteracao", "tempo", "objetivo", "melhor", "parametro")
+
+    def __init__(self, caminho: str):
+        self.json = caminho.endswith((".ndjson", ".jsonl"))
+        self.file = open(caminho, "w")
+        if not self.json:
+            self.file.write(",".join(Rastro.CAMPOS) + "\n")
+        self.inicio = perf_counter()
+
+    def registra(self, metodo: str, iteracao: int, objetivo: float, melhor: float, parametro: float):
+        """
+        Função responsável por escrever uma linha do rastro.
+
+        Args:
+            metodo (str): Nome da metaheurística.
+            iteracao (int): Iteração (a partir de 0).
+            objetivo (float): Objetivo atual (solução atual do ALNS, média da população do PSO e do FPA, solução do subproblema do Dinkelbach).
+            melhor (float): Melhor objetivo encontrado até a iteração.
+            parametro (float): Inércia do PSO, probabilidade p do FPA, temperatura do ALNS ou lambda do Dinkelbach.
+        """
+
+        tempo = perf_counter() - self.inicio
+        if self.json:
+            self.file.write(json.dumps(dict(zip(Rastro.CAMPOS, (metodo, iteracao, tempo, objetivo, melhor, parametro)))) + "\n")
+        else:
+            self.file.write(f"{metodo},{iteracao},{tempo},{objetivo},{melhor},{parametro}\n")
+
+    def fecha(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fecha()
@@ -3,8 +3,8 @@ import numpy as np
 import Processa
 from collections import defaultdict
 from random import choice
-from sklearn.cluster import MiniBatchKMeans
 from time import perf_counter
+from typing import Tuple
 
 def construir_clusters_de_dicts(labels_pedidos, labels_corredores):
     """
@@ -24,76 +24,12 @@ def construir_clusters_de_dicts(labels_pedidos, labels_corredores):
     return clusters_ped, clusters_corr
 
 
-def atualizaCorredores(solucao: Metodos.Solucao, problema: Processa.Problema, sol_vizinha, novo_c, pos):
-    """
-    Args:
-        solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
-        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
-        sol_vizinha ():
-        novo_c: ID do corredor que entra
-        pos: posição na lista solucao.corredores onde trocamos o corredor
-    """
-
-    # 1) identifica IDs
-    corredor_antigo = solucao.corredores[pos]
-
-    # 2) subtrai as quantidades do corredor antigo
-    for item, qtd in problema.aisles[corredor_antigo].items():
-        sol_vizinha.universoC[item] -= qtd
-        sol_vizinha.itensC[item]   -= qtd
-
-    # 3) adiciona as quantidades do corredor novo
-    for item, qtd in problema.aisles[novo_c].items():
-        sol_vizinha.universoC[item] = sol_vizinha.universoC.get(item, 0) + qtd
-        sol_vizinha.itensC[item]   = sol_vizinha.itensC.get(item, 0)   + qtd
-
-    # 4) atualiza as listas de corredores
-    sol_vizinha.corredores[pos] = novo_c
-    sol_vizinha.corredoresDisp[corredor_antigo] = False
-    sol_vizinha.corredoresDisp[novo_c] = True
-
-    return sol_vizinha
-
-
-def atualizaPedidos(solucao: Metodos.Solucao, problema: Processa.Problema, sol_vizinha, novo_p, pos):
-    """
-    Args:
-        solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
-        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
-        sol_vizinha ():
-        novo_p: ID do pedido que entra
-        pos: posição na lista solucao.pedidos onde ocorre a troca
-    """
-
-    # 1) ID do pedido antigo
-    pedido_antigo = solucao.pedidos[pos]
-
-    # 2) subtrai as quantidades do pedido antigo
-    for item, qtd in problema.orders[pedido_antigo].items():
-        sol_vizinha.itensP[item] -= qtd
-        # se restar zero, podemos opcionalmente remover a chave:
-        if sol_vizinha.itensP[item] == 0:
-            del sol_vizinha.itensP[item]
-
-    # 3) adiciona as quantidades do novo pedido
-    for item, qtd in problema.orders[novo_p].items():
-        sol_vizinha.itensP[item] = sol_vizinha.itensP.get(item, 0) + qtd
-
-    # 4) atualiza a lista de pedidos e o vetor de disponibilidade
-    sol_vizinha.pedidos[pos]        = novo_p
-    sol_vizinha.pedidosDisp[pedido_antigo] = 0
-    sol_vizinha.pedidosDisp[novo_p]       = 1
-
-    # 5) recalcula qntItens como soma de todos os itens em itensP
-    sol_vizinha.qntItens = sum(sol_vizinha.itensP.values())
-
-    return sol_vizinha
-
-
-def gerar_sol_vizinha(solucao: Metodos.Solucao, problema: Processa.Problema, tipo: str, clusters_ped, clusters_corr, label_pedidos, label_corredores) -> Metodos.Solucao | None:
+def gerar_sol_vizinha(solucao: Metodos.Solucao, problema: Processa.Problema, tipo: str, clusters_ped, clusters_corr, label_pedidos, label_corredores) -> Metodos.Movimento | None:
     """
     Função responsável por gerar um vizinho da solução trocando ou um pedido ou um corredor dentro do mesmo cluster.
 
+    O vizinho é gerado na própria solução, e o movimento retornado permite desfazê-lo (desfaz_movimento). Se o vizinho for descartado, a solução é restaurada antes de retornar.
+
     Args:
         solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
@@ -104,66 +40,64 @@ def gerar_sol_vizinha(solucao: Metodos.Solucao, problema: Processa.Problema, tip
         label_corredores ():
 
     Returns:
-        sol_vizinho (Solucao | None):
+        movimento (Movimento | None): Registro da troca aplicada na solução `ou` None se nenhum vizinho válido foi gerado.
     """
 
-    sol_vizinha = solucao.clone()
-
     if tipo == 'pedido':
         # Criando lista com os índices dos label_pedidos utilizados na solução
-        ativos = list(range(len(sol_vizinha.pedidos)))
+        ativos = list(range(len(solucao.pedidos)))
         if not ativos:
             return None
         # Escolhendo um pedido ativo aleatoriamente para alterar
         i = choice(ativos)
         # id do pedido atual nessa posição
-        pedido_atual = sol_vizinha.pedidos[i]
+        pedido_atual = solucao.pedidos[i]
         # rótulo dele
         lab = label_pedidos[pedido_atual]
         # Criando lista de candidatos dentro do mesmo cluster
-        candidatos = [p for p in clusters_ped[lab] if p != sol_vizinha.pedidos[i]]
+        candidatos = [p for p in clusters_ped[lab] if p != solucao.pedidos[i]]
         if not candidatos:
             return None
         # Escolhendo um pedido candidato aleatoriamente
         novo_p = choice(candidatos)
+        if solucao.pedidosDisp[novo_p]:
+            return None
 
-        sol_vizinha = atualizaPedidos(solucao, problema, sol_vizinha, novo_p, i)
+        movimento = Metodos.substitui_pedido_reversivel(problema, solucao, i, novo_p)
 
-        # Verificando se o novo pedido não ultrapassa a capacidade do corredor
-        if sol_vizinha.qntItens > problema.ub or novo_p in solucao.pedidos or sol_vizinha.qntItens < problema.lb:
+        # Verificando se o novo pedido não ultrapassa os limites de itens
+        if solucao.qntItens > problema.ub or solucao.qntItens < problema.lb:
+            Metodos.desfaz_movimento(problema, solucao, movimento)
             return None
 
-        sol_vizinha.pedidos[i] = novo_p
-        sol_vizinha.qntItens = sum(sol_vizinha.itensP.values())
-
         # antes de trocar efetivamente o pedido, verifique viabilidade:
         for item, qtd in problema.orders[novo_p].items():
-            demanda_antes = sol_vizinha.itensP.get(item, 0)
-            capacidade   = sol_vizinha.itensC.get(item, 0)
+            demanda_antes = solucao.itensP[item]
+            capacidade   = solucao.itensC[item]
             if demanda_antes + qtd > capacidade:
                 # não cabe este pedido na oferta atual
+                Metodos.desfaz_movimento(problema, solucao, movimento)
                 return None
 
     else:
-        ativos = list(range(len(sol_vizinha.corredores)))
+        ativos = list(range(len(solucao.corredores)))
         if not ativos:
             return None
         i = choice(ativos)
-        pedido_atual = sol_vizinha.corredores[i]
-        lab = label_corredores[pedido_atual]
-        candidatos = [c for c in clusters_corr[lab] if c != sol_vizinha.corredores[i]]
+        corredor_atual = solucao.corredores[i]
+        lab = label_corredores[corredor_atual]
+        candidatos = [c for c in clusters_corr[lab] if c != solucao.corredores[i]]
         if not candidatos:
             return None
         novo_c = choice(candidatos)
-        if novo_c in solucao.corredores:
+        if solucao.corredoresDisp[novo_c]:
             return None
-        else:
-            sol_vizinha = atualizaCorredores(solucao, problema, sol_vizinha, novo_c, i)
+        movimento = Metodos.substitui_corredor_reversivel(problema, solucao, i, novo_c)
 
-    return sol_vizinha
+    return movimento
 
 
-def refinamento_cluster_vns(problema: Processa.Problema, solucao: Metodos.Solucao) -> Metodos.Solucao:
+def refinamento_cluster_vns(problema: Processa.Problema, solucao: Metodos.Solucao, orcamento: Metodos.Orcamento = None) -> Metodos.Solucao:
     """
     Função responsável por executar um VNS simples alternando entre vizinhança de pedidos e de corredores.
 
@@ -172,47 +106,54 @@ def refinamento_cluster_vns(problema: Processa.Problema, solucao: Metodos.Soluca
     Args:
         solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a melhor solução encontrada até o momento.
 
     Returns:
         best (Solucao): Dataclass representando a solução refinada, incluindo estruturas auxiliares.
     """
 
     inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
     best = solucao
     iter_sem_melhora = 0
     k = 1
 
     if problema.a < 10 or problema.o < 10:
         # print("Problema muito pequeno para clusterização.")
-        return melhor_vizinhanca(problema, solucao)
+        return melhor_vizinhanca(problema, solucao, orcamento)
+
+    # A clusterização não pode ser interrompida, então só é iniciada se ainda houver tempo.
+    if orcamento.esgotado():
+        return solucao
 
     pedidos, corredores = clusterizacao_MBKM(problema)
     clusters_ped, clusters_corr = construir_clusters_de_dicts(pedidos, corredores)
 
 
-    while iter_sem_melhora < 1000:
+    while iter_sem_melhora < 1000 and not orcamento.esgotado():
         if k%4 < 2:
             tipo = 'pedido'
         else:
             tipo = 'corredor'
-        # Gera uma solução vizinha
-        viz = gerar_sol_vizinha(best, problema, tipo, clusters_ped, clusters_corr, pedidos, corredores)
-        if viz is None:
+        # Gera uma solução vizinha (na própria best, desfazendo a troca se ela não melhorar)
+        movimento = gerar_sol_vizinha(best, problema, tipo, clusters_ped, clusters_corr, pedidos, corredores)
+        if movimento is None:
             k += 1
             iter_sem_melhora += 1
             continue
 
-        viz.objetivo = Metodos.funcao_objetivo(problema, viz.itensP, viz.itensC)/viz.qntCorredores
+        objetivo = Metodos.funcao_objetivo_incremental(problema, best)/best.qntCorredores
         k += 1
 
         # Se melhorou, aceite e reinicie vizinhança
-        if viz.objetivo > best.objetivo:
-            #print(f"Melhorou: {viz.objetivo:.2f} > {best.objetivo:.2f}")
-            best = viz
+        if objetivo > best.objetivo:
+            #print(f"Melhorou: {objetivo:.2f} > {best.objetivo:.2f}")
+            best.objetivo = objetivo
             clusters_ped, clusters_corr = construir_clusters_de_dicts(pedidos, corredores)
             iter_sem_melhora = 0
         else:
             # muda de vizinhançax'
+            Metodos.desfaz_movimento(problema, best, movimento)
             iter_sem_melhora += 1
 
     fim = perf_counter()
@@ -222,6 +163,9 @@ def refinamento_cluster_vns(problema: Processa.Problema, solucao: Metodos.Soluca
 
 
 def clusterizacao_MBKM(problema):
+    # O sklearn é importado apenas aqui, pois a importação é lenta e só o refinamento_cluster_vns o utiliza.
+    from sklearn.cluster import MiniBatchKMeans
+
     tam = problema.i + 1
     pedidos = []
     corredores = []
@@ -252,7 +196,26 @@ def clusterizacao_MBKM(problema):
     return labels_pedidos, labels_corredores
 
 
-def melhor_vizinhanca(problema: Processa.Problema, solucao: Metodos.Solucao) -> Metodos.Solucao:
+def _aplica_vizinho(problema: Processa.Problema, solucao: Metodos.Solucao, vizinhanca: int, corredor_max: int, corredor_min: int) -> Metodos.Movimento:
+    # Aplica na solução o vizinho da melhor_vizinhanca (0: adição do corredor_max, 1: troca do corredor_min pelo corredor_max, 2: remoção do corredor_min), com os pedidos realocados e o objetivo calculado.
+    if vizinhanca == 0:
+        movimento = Metodos.adiciona_corredor_reversivel(problema, solucao, corredor_max)
+    elif vizinhanca == 1:
+        movimento = Metodos.troca_corredor_reversivel(problema, solucao, corredor_max, corredor_min)
+    else:
+        movimento = Metodos.remove_corredor_reversivel(problema, solucao, corredor_min)
+    Metodos.adiciona_pedidos_reversivel(problema, solucao, movimento)
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+    return movimento
+
+def _avalia_vizinho(problema: Processa.Problema, solucao: Metodos.Solucao, vizinhanca: int, corredor_max: int, corredor_min: int) -> Tuple[float, int]:
+    # Objetivo e quantidade de itens do vizinho, desfazendo o movimento em seguida.
+    movimento = _aplica_vizinho(problema, solucao, vizinhanca, corredor_max, corredor_min)
+    avaliacao = solucao.objetivo, solucao.qntItens
+    Metodos.desfaz_movimento(problema, solucao, movimento)
+    return avaliacao
+
+def melhor_vizinhanca(problema: Processa.Problema, solucao: Metodos.Solucao, orcamento: Metodos.Orcamento = None) -> Metodos.Solucao:
     """
     Heurística de refinamento baseada em melhor vizinhança.
 
@@ -261,30 +224,25 @@ def melhor_vizinhanca(problema: Processa.Problema, solucao: Metodos.Solucao) ->
     Args:
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
         solucao (Solucao): Dataclass representando a solução inicial, incluindo estruturas auxiliares.
+        orcamento (Orcamento | None): Prazo de execução. Quando ele acaba, retorna a solução atual.
 
     Returns:
         solucao (Solucao): Dataclass representando a solução refinada, incluindo estruturas auxiliares.
     """
 
     inicio = perf_counter()
+    orcamento = orcamento if orcamento is not None else Metodos.Orcamento()
 
     # Removendo os corredores redundantes da solução inicial.
     Metodos.remove_redundantes(problema, solucao)
-    solucao.objetivo = Metodos.funcao_objetivo(problema, solucao.itensP, solucao.itensC) / solucao.qntCorredores
-
-    # Calculando a demanda de cada item.
-    demanda_por_item = defaultdict(int)             # Dicionário da soma total da demanda de cada item em todos os pedidos.
-    for pedido in problema.orders:
-        for item, qtd in pedido.items():
-            demanda_por_item[item] += qtd
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
 
-    # Calculando o peso de cada corredor com base na demanda e na quantidade ofertada.
-    # Peso de cada corredor é calculado com base na demanda dos itens e na quantidade que ele oferece.
-    peso_corredores = {indice: sum(demanda_por_item[item] * qnt for item, qnt in problema.aisles[indice].items()) for indice in range(problema.a)}
+    # Peso de cada corredor, calculado com base na demanda dos itens e na quantidade que ele oferece (calculado uma única vez por problema).
+    peso_corredores = problema.peso_corredores.tolist()
 
     # Explorando a vizinhança até não encontrar nenhuma melhor.
     vizinhanca_explorada = False                    # Condição de parada do loop, quanda a vizinhanca tiver sido explorada, o loop encerra.
-    while not vizinhanca_explorada:
+    while not vizinhanca_explorada and not orcamento.esgotado():
         # Pegando o indice do corredor de maior peso que ainda não está na solução.
         corredor_max = -1
         for indice in range(problema.a):
@@ -298,37 +256,46 @@ def melhor_vizinhanca(problema: Processa.Problema, solucao: Metodos.Solucao) ->
             if corredor_min == -1 or peso_corredores[indice] < peso_corredores[corredor_min]:
                 corredor_min = indice
 
-        # Explorando a vizinhança por meio da adição do novo corredor.
-        primeira_vizinhanca = solucao.clone()
-        Metodos.adiciona_corredor(problema, primeira_vizinhanca, corredor_max)
-        Metodos.adiciona_pedidos(problema, primeira_vizinhanca)
+        # Cada vizinho é aplicado na própria solução e desfeito após a avaliação (objetivo e quantidade de itens). A remoção, que normalmente é a escolhida, é avaliada por último e só é desfeita se não for escolhida.
+        objetivo = solucao.objetivo
+
+        # Explorando a vizinhança por meio da adição do novo corredor, a não ser que o limite superior prove que ela não pode ser aceita.
+        podada = Metodos.poda_corredor(problema, solucao)
+        if not podada:
+            primeira_vizinhanca = _avalia_vizinho(problema, solucao, 0, corredor_max, corredor_min)
 
         # Explorando a vizinhança por meio da troca de corredores, trocando o de menor peso selecionado com o de maior peso não selecionado.
-        segunda_vizinhanca = solucao.clone()
-        Metodos.troca_corredor(problema, segunda_vizinhanca, corredor_max, corredor_min)
-        Metodos.adiciona_pedidos(problema, segunda_vizinhanca)
+        segunda_vizinhanca = _avalia_vizinho(problema, solucao, 1, corredor_max, corredor_min)
 
         # Explorando a vizinhança por meio da remoção do corredor de menor peso.
-        terceira_vizinhanca = solucao.clone()
-        Metodos.remove_corredor(problema, terceira_vizinhanca, corredor_min)
-        Metodos.adiciona_pedidos(problema, terceira_vizinhanca)
-
-        # Comparando as soluções, e salvando a atual caso seja melhor.
-        primeira_vizinhanca.objetivo = Metodos.funcao_objetivo(problema, primeira_vizinhanca.itensP, primeira_vizinhanca.itensC) / primeira_vizinhanca.qntCorredores
-        segunda_vizinhanca.objetivo = Metodos.funcao_objetivo(problema, segunda_vizinhanca.itensP, segunda_vizinhanca.itensC) / segunda_vizinhanca.qntCorredores
-        terceira_vizinhanca.objetivo = Metodos.funcao_objetivo(problema, terceira_vizinhanca.itensP, terceira_vizinhanca.itensC) / terceira_vizinhanca.qntCorredores
-
-        melhor_vizinhanca = solucao
-        if primeira_vizinhanca.objetivo > segunda_vizinhanca.objetivo and primeira_vizinhanca.objetivo > terceira_vizinhanca.objetivo:
-            melhor_vizinhanca = primeira_vizinhanca
-        elif segunda_vizinhanca.objetivo > terceira_vizinhanca.objetivo:
-            melhor_vizinhanca = segunda_vizinhanca
-        else:
-            melhor_vizinhanca = terceira_vizinhanca
-
-        if melhor_vizinhanca.objetivo > solucao.objetivo or melhor_vizinhanca.qntItens < problema.lb:
-            solucao = melhor_vizinhanca
-        else:
+        remocao = _aplica_vizinho(problema, solucao, 2, corredor_max, corredor_min)
+        terceira_vizinhanca = solucao.objetivo, solucao.qntItens
+
+        # Com a adição podada, a escolha só depende dela se a melhor entre as outras duas não melhora o objetivo, mas seria aceita por estar abaixo do lb. Apenas nesse caso ela é avaliada.
+        if podada:
+            escolhida, melhor_vizinhanca = (1, segunda_vizinhanca) if segunda_vizinhanca[0] > terceira_vizinhanca[0] else (2, terceira_vizinhanca)
+            if melhor_vizinhanca[0] <= objetivo and melhor_vizinhanca[1] < problema.lb:
+                Metodos.desfaz_movimento(problema, solucao, remocao)
+                remocao = None
+                primeira_vizinhanca = _avalia_vizinho(problema, solucao, 0, corredor_max, corredor_min)
+                podada = False
+
+        # Comparando os vizinhos, e aplicando o melhor caso ele seja melhor que a solução atual.
+        if not podada:
+            if primeira_vizinhanca[0] > segunda_vizinhanca[0] and primeira_vizinhanca[0] > terceira_vizinhanca[0]:
+                escolhida, melhor_vizinhanca = 0, primeira_vizinhanca
+            elif segunda_vizinhanca[0] > terceira_vizinhanca[0]:
+                escolhida, melhor_vizinhanca = 1, segunda_vizinhanca
+            else:
+                escolhida, melhor_vizinhanca = 2, terceira_vizinhanca
+
+        aceita = melhor_vizinhanca[0] > objetivo or melhor_vizinhanca[1] < problema.lb
+        if not aceita or escolhida != 2 or remocao is None:
+            if remocao is not None:
+                Metodos.desfaz_movimento(problema, solucao, remocao)
+            if aceita:
+                _aplica_vizinho(problema, solucao, escolhida, corredor_max, corredor_min)
+        if not aceita:
             vizinhanca_explorada = True
 
     fim = perf_counter()
@@ -1,21 +1,55 @@
+import numpy as np
 import Processa
+from array import array
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+class ItensEsparsos(dict):
+    """
+    Dicionário esparso item -> quantidade. Itens ausentes valem 0 (sem serem inseridos), então apenas os itens tocados pelos corredores e pedidos da solução são armazenados, e a cópia custa O(itens tocados) em vez de O(problema.i).
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, item):
+        return 0
+
+    def copy(self):
+        return ItensEsparsos(self)
 
 @dataclass
 class Solucao:
-    universoC: Dict[int, int]     # Universo dos itens disponíveis nos corredores selecionados.
-    itensC: Dict[int, int]        # Universo dos itens totais nos corredores selecionados.
-    itensP: Dict[int, int]        # Universo dos itens totais nos pedidos selecionados.
+    universoC: Dict[int, int]     # Universo dos itens disponíveis nos corredores selecionados (esparso).
+    itensC: Dict[int, int]        # Universo dos itens totais nos corredores selecionados (esparso).
+    itensP: Dict[int, int]        # Universo dos itens totais nos pedidos selecionados (esparso).
     corredores: List[int]         # Índices dos corredores na solução.
-    corredoresDisp: List[int]     # Lista binária representando se o corredor da posição x foi selecionado (1) ou não (0).
+    corredoresDisp: bytearray     # Vetor binário representando se o corredor da posição x foi selecionado (1) ou não (0).
     pedidos: List[int]            # Índices dos pedidos na solução.
-    pedidosDisp: List[int]        # Lista binária representando se o pedido da posição x for selecionado (1) ou não (0).
+    pedidosDisp: bytearray        # Vetor binário representando se o pedido da posição x for selecionado (1) ou não (0).
     qntItens: int                 # Quantidade total de itens nos pedidos selecionados.
     qntCorredores: int            # Quantidade de corredores selecionados.
     objetivo: float               # Valor da função objetivo para a solução encontrada.
     tempo: float                  # Tempo de execução da heurística.
+    faltantes: Optional[array] = None    # Quantidade de itens de cada pedido que a capacidade dos corredores selecionados (itensC) não cobre. None desativa o índice incremental.
+    violados: int = 0             # Quantidade de itens com demanda dos pedidos maior que a capacidade dos corredores (universoC negativo).
+
+    @classmethod
+    def vazia(cls, problema: Processa.Problema, tempo: float = 0.0):
+        """
+        Cria uma solução sem corredores e sem pedidos, já com o índice incremental de viabilidade dos pedidos.
+
+        Args:
+            problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+            tempo (float): Valor inicial do campo tempo (normalmente o instante de início da heurística).
+
+        Returns:
+            solucao (Solucao): Solução vazia.
+        """
+
+        faltantes = array("i", np.diff(problema.pedidos_csr[2]).astype(np.intc).tobytes())
+        return cls(ItensEsparsos(), ItensEsparsos(), ItensEsparsos(), [], bytearray(problema.a), [], bytearray(problema.o), 0, 0, 0.0, tempo, faltantes)
 
     def clone(self):
         return Solucao(
@@ -29,9 +63,176 @@ class Solucao:
             self.qntItens,
             self.qntCorredores,
             self.objetivo,
-            self.tempo
+            self.tempo,
+            None if self.faltantes is None else self.faltantes[:],
+            self.violados
         )
 
+def vetor_itens(problema: Processa.Problema, itens: Dict[int, int]) -> np.ndarray:
+    """
+    Função responsável por converter um dicionário item -> quantidade em um array denso indexado pelo item.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        itens (dict): Dicionário mapeando os itens para suas quantidades.
+
+    Returns:
+        vetor (np.ndarray): Array de tamanho problema.i com a quantidade de cada item.
+    """
+
+    vetor = np.zeros(problema.i, dtype=np.int64)
+    vetor[np.fromiter(itens.keys(), dtype=np.int64, count=len(itens))] = np.fromiter(itens.values(), dtype=np.int64, count=len(itens))
+    return vetor
+
+def conta_faltantes(problema: Processa.Problema, itens: Dict[int, int]) -> np.ndarray:
+    """
+    Função responsável por contar, de forma vetorizada sobre a representação CSR, quantos itens de cada pedido não são cobertos pelas quantidades informadas.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        itens (dict): Dicionário mapeando os itens para a quantidade disponível.
+
+    Returns:
+        faltantes (np.ndarray): Array de inteiros de tamanho problema.o com a quantidade de itens faltantes de cada pedido.
+    """
+
+    itens_p, qnts, _ = problema.pedidos_csr
+    disponivel = vetor_itens(problema, itens)
+    return np.bincount(problema.pedidos_linha, weights=qnts > disponivel[itens_p], minlength=problema.o).astype(np.intc)
+
+def candidatos_pedidos(problema: Processa.Problema, solucao: Solucao) -> List[int]:
+    """
+    Função responsável por listar os pedidos não selecionados que cabem na capacidade dos corredores selecionados (itensC), em ordem crescente de índice.
+
+    Os candidatos são um superconjunto dos pedidos viáveis: a capacidade já consumida pelos pedidos selecionados não é considerada.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+
+    Returns:
+        candidatos (List[int]): Índices dos pedidos candidatos.
+    """
+
+    faltantes = np.frombuffer(solucao.faltantes, dtype=np.intc) if solucao.faltantes is not None else conta_faltantes(problema, solucao.itensC)
+    return np.flatnonzero((faltantes == 0) & (np.frombuffer(solucao.pedidosDisp, dtype=np.uint8) == 0)).tolist()
+
+def pedido_viavel(problema: Processa.Problema, solucao: Solucao, pedido: int) -> bool:
+    """
+    Função responsável por verificar se o universo atual dos corredores (universoC) atende um pedido.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        pedido (int): Índice do pedido.
+
+    Returns:
+        valido (bool): True se todos os itens do pedido estão disponíveis.
+    """
+
+    if solucao.faltantes is not None and solucao.faltantes[pedido]:
+        return False
+    for item, qnt in problema.orders[pedido].items():
+        if qnt > solucao.universoC[item]:
+            return False
+    return True
+
+def pedidos_viaveis(problema: Processa.Problema, solucao: Solucao) -> List[int]:
+    """
+    Função responsável por listar os pedidos não selecionados que podem ser atendidos pelo universo atual dos corredores, em ordem crescente de índice.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+
+    Returns:
+        viaveis (List[int]): Índices dos pedidos viáveis que ainda não estão na solução.
+    """
+
+    candidatos = candidatos_pedidos(problema, solucao)
+    # Sem pedidos selecionados, universoC e itensC são iguais e todo candidato é viável.
+    if not solucao.pedidos:
+        return candidatos
+    return [pedido for pedido in candidatos if pedido_viavel(problema, solucao, pedido)]
+
+def altera_corredor(problema: Processa.Problema, solucao: Solucao, corredor: int, sinal: int, alterados: Optional[list] = None) -> List[int]:
+    """
+    Função responsável por somar (sinal = 1) ou subtrair (sinal = -1) os itens de um corredor nos itens dos corredores selecionados (itensC e universoC), atualizando o índice incremental de viabilidade. Não altera as listas de corredores.
+
+    Para cada item do corredor, apenas os pedidos cuja quantidade pedida fica entre a capacidade antiga e a nova são revisitados (busca binária no índice invertido item -> pedidos, ordenado por quantidade).
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        corredor (int): Índice do corredor.
+        sinal (int): 1 para somar os itens do corredor, -1 para subtrair.
+        alterados (list | None): Lista em que os pares (pedido, valor antigo) alterados no índice de viabilidade são acumulados, na ordem das alterações, para desfazê-las (None não registra).
+
+    Returns:
+        cobertos (List[int]): Pedidos que zeraram a contagem de itens faltantes (apenas quando sinal = 1 e o índice está ativo).
+    """
+
+    itensC = solucao.itensC
+    universoC = solucao.universoC
+    faltantes = solucao.faltantes
+    violados = solucao.violados
+    cobertos = []
+
+    if faltantes is None:
+        for item, qnt in problema.aisles[corredor].items():
+            itensC[item] += sinal * qnt
+            disponivel = universoC[item]
+            universoC[item] = disponivel + sinal * qnt
+            violados += (disponivel + sinal * qnt < 0) - (disponivel < 0)
+        solucao.violados = violados
+        return cobertos
+
+    item_pedidos = problema.item_pedidos
+    for item, qnt in problema.aisles[corredor].items():
+        anterior = itensC[item]
+        atual = anterior + sinal * qnt
+        itensC[item] = atual
+        disponivel = universoC[item]
+        universoC[item] = disponivel + sinal * qnt
+        violados += (disponivel + sinal * qnt < 0) - (disponivel < 0)
+        qnts, pedidos = item_pedidos[item]
+        if sinal > 0:
+            afetados = pedidos[bisect_right(qnts, anterior):bisect_right(qnts, atual)]
+        else:
+            afetados = pedidos[bisect_right(qnts, atual):bisect_right(qnts, anterior)]
+        if alterados is not None:
+            alterados.extend(zip(afetados, map(faltantes.__getitem__, afetados)))
+        if sinal > 0:
+            for pedido in afetados:
+                faltantes[pedido] -= 1
+                if not faltantes[pedido]:
+                    cobertos.append(pedido)
+        else:
+            for pedido in afetados:
+                faltantes[pedido] += 1
+    solucao.violados = violados
+    return cobertos
+
+def adiciona_pedido(problema: Processa.Problema, solucao: Solucao, pedido: int):
+    """
+    Função responsável por adicionar um pedido na solução informada, sem verificar a viabilidade.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        pedido (int): Índice do pedido que será inserido.
+    """
+
+    solucao.pedidos.append(pedido)
+    solucao.pedidosDisp[pedido] = 1
+    for item, qnt in problema.orders[pedido].items():
+        solucao.qntItens += qnt
+        disponivel = solucao.universoC[item]
+        solucao.universoC[item] = disponivel - qnt
+        solucao.itensP[item] += qnt
+        if disponivel >= 0 and disponivel < qnt:
+            solucao.violados += 1
+
 def adiciona_pedidos(problema: Processa.Problema, solucao: Solucao):
     """
     Função responsável por adicionar os pedidos viáveis de forma gulosa, usando a estratégia da cobertura, na solução informada.
@@ -41,37 +242,17 @@ def adiciona_pedidos(problema: Processa.Problema, solucao: Solucao):
         solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
     """
 
-    # Filtrando os pedidos possíveis para os corredores selecionados.
-    pedidos_viaveis = []                        # Lista de pedidos viáveis com os corredores atualmente selecionados.
-    for indice in range(problema.o):
-        if not solucao.pedidosDisp[indice]:
-            valida = True
-            itens_totais = 0
-            for item, qnt in problema.orders[indice].items():
-                itens_totais += qnt
-                if qnt > solucao.universoC[item]:
-                    valida = False
-                    break
-            if valida:
-                pedidos_viaveis.append([indice, itens_totais])
+    # Filtrando os pedidos possíveis para os corredores selecionados. Os candidatos que não cabem no universo atual são descartados na seleção abaixo, já que o universo só diminui durante ela.
+    indices = candidatos_pedidos(problema, solucao)
+    viaveis = [[indice, total] for indice, total in zip(indices, problema.tamanho_pedidos[indices].tolist())]     # Lista de pedidos candidatos com os corredores atualmente selecionados.
 
     # Selecionando os melhores pedidos (os que tem mais itens e que não quebram a restrição de ub).
-    pedidos_viaveis.sort(key = lambda i: i[1], reverse = True)
-    for pedido in pedidos_viaveis:
-        valida = True
-        for item, qnt in problema.orders[pedido[0]].items():
-            if qnt > solucao.universoC[item]:
-                valida = False
-                break
-        if valida and solucao.qntItens + pedido[1] <= problema.ub:
-            solucao.qntItens += pedido[1]
-            solucao.pedidosDisp[pedido[0]] = 1
-            solucao.pedidos.append(pedido[0])
-            for item, qnt in problema.orders[pedido[0]].items():
-                solucao.universoC[item] -= qnt
-                solucao.itensP[item] += qnt
+    viaveis.sort(key = lambda i: i[1], reverse = True)
+    for pedido in viaveis:
+        if solucao.qntItens + pedido[1] <= problema.ub and pedido_viavel(problema, solucao, pedido[0]):
+            adiciona_pedido(problema, solucao, pedido[0])
 
-def adiciona_corredor(problema: Processa.Problema, solucao: Solucao, corredor_max: int):
+def adiciona_corredor(problema: Processa.Problema, solucao: Solucao, corredor_max: int) -> List[int]:
     """
     Função responsável por adicionar um novo corredor na solução informada. Não adiciona novos pedidos.
 
@@ -79,21 +260,135 @@ def adiciona_corredor(problema: Processa.Problema, solucao: Solucao, corredor_ma
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
         solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
         corredor_max (int): Índice do corredor que será inserido.
+
+    Returns:
+        novos_viaveis (List[int]): Pedidos não selecionados que se tornaram viáveis com o novo corredor (vazia se o índice incremental estiver desativado).
     """
 
     # Adicionando o novo corredor se ele existe.
+    cobertos = []
     if corredor_max >= 0 and corredor_max < problema.a:
         solucao.corredores.append(corredor_max)
         solucao.corredoresDisp[corredor_max] = 1
         solucao.qntCorredores += 1
+        cobertos = altera_corredor(problema, solucao, corredor_max, 1)
+
+    return [pedido for pedido in sorted(cobertos) if not solucao.pedidosDisp[pedido] and pedido_viavel(problema, solucao, pedido)]
+
+def remove_pedido(problema: Processa.Problema, solucao: Solucao, pedido: int):
+    """
+    Função responsável por remover um pedido da solução informada, mantendo os demais.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        pedido (int): Índice do pedido que será removido (precisa estar na solução).
+    """
 
-        for item, qnt in problema.aisles[corredor_max].items():
-            solucao.itensC[item] += qnt
-            solucao.universoC[item] += qnt
+    solucao.pedidos.remove(pedido)
+    solucao.pedidosDisp[pedido] = 0
+    for item, qnt in problema.orders[pedido].items():
+        solucao.qntItens -= qnt
+        disponivel = solucao.universoC[item]
+        solucao.universoC[item] = disponivel + qnt
+        solucao.itensP[item] -= qnt
+        if disponivel < 0 and disponivel + qnt >= 0:
+            solucao.violados -= 1
+
+def pedidos_removidos(problema: Processa.Problema, solucao: Solucao, itens: Dict[int, int]) -> List[int]:
+    """
+    Função responsável por escolher os pedidos que precisam deixar a solução para que os itens informados voltem a caber nos corredores selecionados (universoC não negativo), normalmente os itens de um corredor recém-removido.
+
+    Para cada item com capacidade negativa, os pedidos selecionados que o contêm (índice invertido item -> pedidos) são removidos pelo menor custo: a quantidade de itens perdida (tamanho do pedido) por unidade do déficit coberta por ele (a quantidade do item no pedido, limitada ao déficit restante), com empates pelo menor tamanho e pelo índice. A capacidade liberada por um pedido removido também vale para os próximos itens. O custo é proporcional aos pedidos que contêm os itens, e não ao total de pedidos da solução.
+
+    Os candidatos são ordenados uma única vez pelo custo: os que cobrem menos que o déficit têm custo fixo (tamanho / quantidade), e entre os que cobrem o déficit inteiro (que encerram o item ao serem escolhidos) basta o de menor tamanho. Como o déficit só diminui, os candidatos passam de um grupo para o outro em ordem decrescente de quantidade, e a escolha de cada item custa O(c log c) para c candidatos.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares (não é alterada).
+        itens (dict): Itens verificados (apenas as chaves são usadas).
+
+    Returns:
+        removidos (List[int]): Pedidos escolhidos, na ordem de escolha.
+    """
+
+    universoC = solucao.universoC
+    pedidosDisp = solucao.pedidosDisp
+    liberado = defaultdict(int)     # Capacidade devolvida por item pelos pedidos já escolhidos.
+    removidos = []                  # Pedidos escolhidos, na ordem de escolha.
+    escolhidos = set()              # Os mesmos pedidos, para a verificação em O(1).
+    for item in itens:
+        deficit = -universoC[item] - liberado[item]
+        if deficit <= 0:
+            continue
+
+        # Pedidos selecionados que contêm o item: (quantidade do item, tamanho, pedido).
+        qnts, pedidos = problema.item_pedidos[item]
+        candidatos = [(qnt, pedido) for qnt, pedido in zip(qnts, pedidos) if pedidosDisp[pedido] and pedido not in escolhidos]
+        tamanhos = problema.tamanho_pedidos[[pedido for _, pedido in candidatos]].tolist()
+        candidatos = [(qnt, tamanho, pedido) for (qnt, pedido), tamanho in zip(candidatos, tamanhos)]
+
+        ordem = sorted(candidatos, key=lambda candidato: (candidato[1] / candidato[0], candidato[1], candidato[2]))     # Custo dos que cobrem menos que o déficit.
+        i, j = 0, len(candidatos) - 1     # O índice invertido está em ordem crescente de quantidade, então os candidatos passam a cobrir o déficit inteiro de j para trás.
+        limitado = None     # Candidato de menor (tamanho, pedido) entre os que cobrem o déficit inteiro.
+        while deficit > 0:
+            while j >= 0 and candidatos[j][0] >= deficit:
+                candidato = candidatos[j]
+                j -= 1
+                if candidato[2] not in escolhidos and (limitado is None or candidato[1:] < limitado[1:]):
+                    limitado = candidato
+            while i < len(ordem) and (ordem[i][0] >= deficit or ordem[i][2] in escolhidos):
+                i += 1
+            parcial = ordem[i] if i < len(ordem) else None
+
+            if parcial is not None and (limitado is None or (parcial[1] / parcial[0], parcial[1], parcial[2]) < (limitado[1] / deficit, limitado[1], limitado[2])):
+                escolhido = parcial
+            elif limitado is not None:
+                escolhido = limitado
+            else:
+                break
+            escolhidos.add(escolhido[2])
+            removidos.append(escolhido[2])
+            for outro, qnt in problema.orders[escolhido[2]].items():
+                liberado[outro] += qnt
+            deficit -= escolhido[0]
+
+    return removidos
+
+def repara_pedidos(problema: Processa.Problema, solucao: Solucao, itens: Dict[int, int]):
+    """
+    Função responsável por remover da solução os pedidos escolhidos pelo pedidos_removidos, mantendo os demais. Se a solução continuar inviável (por itens fora dos informados), todos os pedidos são removidos.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+        itens (dict): Itens cuja capacidade diminuiu (apenas as chaves são usadas).
+    """
+
+    for pedido in pedidos_removidos(problema, solucao, itens):
+        remove_pedido(problema, solucao, pedido)
+    if solucao.violados:
+        reinicia_pedidos(problema, solucao)
+
+def reinicia_pedidos(problema: Processa.Problema, solucao: Solucao):
+    """
+    Função responsável por remover todos os pedidos da solução informada, mantendo os corredores.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+    """
+
+    solucao.universoC = solucao.itensC.copy()
+    solucao.pedidos = []
+    solucao.pedidosDisp = bytearray(problema.o)
+    solucao.itensP = ItensEsparsos()
+    solucao.qntItens = 0
+    solucao.violados = 0
 
 def troca_corredor(problema: Processa.Problema, solucao: Solucao, corredor_max: int, corredor_min: int):
     """
-    Função responsável por trocar dois corredores na solução informada. Também remove todos os pedidos da solução para eles serem adicionados novamente pela estratégia da cobertura.
+    Função responsável por trocar dois corredores na solução informada. Os pedidos que deixam de caber nos corredores são removidos (repara_pedidos), e os novos pedidos podem ser adicionados em seguida pela estratégia da cobertura.
 
     Args:
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
@@ -106,24 +401,18 @@ def troca_corredor(problema: Processa.Problema, solucao: Solucao, corredor_max:
     if corredor_max >= 0 and corredor_max < problema.a:
         solucao.corredores.remove(corredor_min)
         solucao.corredoresDisp[corredor_min] = 0
-        for item, qnt in problema.aisles[corredor_min].items():
-            solucao.itensC[item] -= qnt
+        altera_corredor(problema, solucao, corredor_min, -1)
 
         solucao.corredores.append(corredor_max)
         solucao.corredoresDisp[corredor_max] = 1
-        for item, qnt in problema.aisles[corredor_max].items():
-            solucao.itensC[item] += qnt
+        altera_corredor(problema, solucao, corredor_max, 1)
 
-        # Redefinindo solução para começar a inserir pedidos do 0.
-        solucao.universoC = solucao.itensC.copy()
-        solucao.pedidos = []
-        solucao.pedidosDisp = [0 for _ in range(problema.o)]
-        solucao.itensP = dict.fromkeys(range(problema.i), 0)
-        solucao.qntItens = 0
+        # Removendo apenas os pedidos que deixaram de caber nos corredores.
+        repara_pedidos(problema, solucao, problema.aisles[corredor_min])
 
 def remove_corredor(problema: Processa.Problema, solucao: Solucao, corredor_min: int):
     """
-    Função responsável por remover um corredor da solução informada. Também remove todos os pedidos da solução para eles serem adicionados novamente pela estratégia da cobertura.
+    Função responsável por remover um corredor da solução informada. Os pedidos que deixam de caber nos corredores são removidos (repara_pedidos), e os novos pedidos podem ser adicionados em seguida pela estratégia da cobertura.
 
     Args:
         problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
@@ -136,15 +425,10 @@ def remove_corredor(problema: Processa.Problema, solucao: Solucao, corredor_min:
         solucao.corredores.remove(corredor_min)
         solucao.corredoresDisp[corredor_min] = 0
         solucao.qntCorredores -= 1
-        for item, qnt in problema.aisles[corredor_min].items():
-            solucao.itensC[item] -= qnt
+        altera_corredor(problema, solucao, corredor_min, -1)
 
-        # Redefinindo solução para começar a inserir pedidos do 0.
-        solucao.universoC = solucao.itensC.copy()
-        solucao.pedidos = []
-        solucao.pedidosDisp = [0 for _ in range(problema.o)]
-        solucao.itensP = dict.fromkeys(range(problema.i), 0)
-        solucao.qntItens = 0
+        # Removendo apenas os pedidos que deixaram de caber nos corredores.
+        repara_pedidos(problema, solucao, problema.aisles[corredor_min])
 
 def remove_redundantes(problema: Processa.Problema, solucao: Solucao):
     """
@@ -186,9 +470,7 @@ def remove_redundantes(problema: Processa.Problema, solucao: Solucao):
             solucao.corredores.remove(indice)
             solucao.corredoresDisp[indice] = 0
             solucao.qntCorredores -= 1
-            for item, qnt in problema.aisles[indice].items():
-                solucao.universoC[item] -= qnt
-                solucao.itensC[item] -= qnt
+            altera_corredor(problema, solucao, indice, -1)
 
 def funcao_objetivo(problema: Processa.Problema, itensP: dict, itensC: dict) -> int:
     """
@@ -215,6 +497,66 @@ def funcao_objetivo(problema: Processa.Problema, itensP: dict, itensC: dict) ->
     # Retornando a soma.
     return soma
 
+def funcao_objetivo_incremental(problema: Processa.Problema, solucao: Solucao) -> int:
+    """
+    Versão O(1) da funcao_objetivo, usando a quantidade de itens (qntItens) e o contador de itens violados (violados) mantidos pelas funções que alteram a solução. Retorna o mesmo valor que funcao_objetivo(problema, solucao.itensP, solucao.itensC).
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+
+    Returns:
+        soma (int): Quantidade total de itens nos pedidos da solução `ou` 0 se alguma restrição foi violada.
+    """
+
+    if solucao.qntItens < problema.lb or solucao.qntItens > problema.ub or solucao.violados:
+        return 0
+    return solucao.qntItens
+
+
+def valida_solucao(problema: Processa.Problema, solucao: Solucao) -> Tuple[bool, str]:
+    """
+    Função responsável por verificar uma solução a partir dos dados do problema, sem usar as estruturas auxiliares da solução (que podem estar inconsistentes).
+
+    Verifica os índices (existentes e sem repetição), os limites lb e ub, a capacidade dos corredores para cada item e se o valor da função objetivo corresponde aos pedidos e corredores.
+
+    Args:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+        solucao (Solucao): Dataclass representando a solução, incluindo estruturas auxiliares.
+
+    Returns:
+        valida (bool): True se a solução é viável e o objetivo está correto.
+        motivo (str): Descrição da primeira violação encontrada (vazia se a solução for válida).
+    """
+
+    pedidos, corredores = solucao.pedidos, solucao.corredores
+    if not corredores:
+        return False, "nenhum corredor selecionado"
+    if len(set(pedidos)) != len(pedidos) or len(set(corredores)) != len(corredores):
+        return False, "pedidos ou corredores repetidos"
+    if any(pedido < 0 or pedido >= problema.o for pedido in pedidos) or any(corredor < 0 or corredor >= problema.a for corredor in corredores):
+        return False, "índice de pedido ou corredor inexistente"
+
+    # Somando a demanda dos pedidos e a oferta dos corredores selecionados.
+    demanda = defaultdict(int)
+    for pedido in pedidos:
+        for item, qnt in problema.orders[pedido].items():
+            demanda[item] += qnt
+    oferta = defaultdict(int)
+    for corredor in corredores:
+        for item, qnt in problema.aisles[corredor].items():
+            oferta[item] += qnt
+
+    total = sum(demanda.values())
+    if total < problema.lb or total > problema.ub:
+        return False, f"quantidade de itens {total} fora dos limites [{problema.lb}, {problema.ub}]"
+    for item, qnt in demanda.items():
+        if qnt > oferta[item]:
+            return False, f"item {item} com demanda {qnt} maior que a oferta {oferta[item]}"
+    if abs(solucao.objetivo - total / len(corredores)) > 1e-9:
+        return False, f"objetivo {solucao.objetivo} diferente de {total / len(corredores)}"
+
+    return True, ""
 
 def peso_aresta(problema: Processa.Problema, corredor_id: int, pedido_id: int) -> int:
     """
@@ -241,28 +583,76 @@ def peso_aresta(problema: Processa.Problema, corredor_id: int, pedido_id: int) -
     return faltantes
 
 
-def inicia_grafo(problema: Processa.Problema) -> Dict[int, List[tuple]]:
+def inicia_grafo(problema: Processa.Problema, top_k: Optional[int] = None, max_elementos: int = 1 << 24) -> Tuple[np.ndarray, np.ndarray]:
     """
     Inicializa o grafo bipartido que relaciona os corredores aos pedidos.
 
-    Para cada corredor, a função cria uma lista de arestas para os pedidos, onde cada aresta é representada por uma tupla (pedido, peso). O peso de cada aresta é determinado pela quantidade de itens faltantes para suprir o pedido com a oferta do corredor. A lista de arestas para cada corredor é ordenada em ordem crescente de peso.
+    O peso de cada aresta (corredor, pedido) é a quantidade de itens faltantes para suprir o pedido com a oferta do corredor (ver peso_aresta), calculado como tamanho do pedido - soma de min(demanda, oferta) sobre os itens em comum. A soma é feita de forma vetorizada, juntando as entradas CSR dos corredores com as entradas dos pedidos agrupadas por item, em blocos de corredores para limitar a memória. Para cada corredor, os pedidos são ordenados em ordem crescente de peso (empates pelo índice do pedido).
 
     Args:
         problema (Problema): Instância contendo os dados do problema, incluindo as estruturas 'aisles' (corredores) e 'orders' (pedidos).
+        top_k (int | None): Se informado, mantém apenas os top_k pedidos de menor peso de cada corredor.
+        max_elementos (int): Quantidade máxima aproximada de elementos das matrizes intermediárias de cada bloco de corredores.
 
     Returns:
-        grafo (dict): Um dicionário representando o grafo bipartido, onde a chave é o índice do corredor e o valor é uma lista de tuplas (índice do pedido, peso da aresta).
+        pedidos (np.ndarray): Matriz (problema.a, k) com os índices dos pedidos de cada corredor, ordenados pelo peso da aresta (k = problema.o ou top_k).
+        pesos (np.ndarray): Matriz (problema.a, k) com os pesos das arestas correspondentes.
     """
 
-    grafo = defaultdict(list)
-    for c_id in range(len(problema.aisles)):
-        for p_id in range(len(problema.orders)):
-            peso = peso_aresta(problema, c_id, p_id)
-            grafo[c_id].append((p_id, peso))
-
-        grafo[c_id].sort(key=lambda x: x[1])
-
-    return grafo
+    itens_p, qnts_p, _ = problema.pedidos_csr
+    itens_c, qnts_c, ptr_c = problema.corredores_csr
+    k = problema.o if top_k is None else max(0, min(top_k, problema.o))
+
+    # Entradas dos pedidos agrupadas por item (item -> posições em pedidos_csr).
+    por_item = np.argsort(itens_p, kind="stable")
+    qnt_item, pedido_item = qnts_p[por_item], problema.pedidos_linha[por_item]
+    cont_item = np.bincount(itens_p, minlength=problema.i)
+    inicio_item = np.zeros(problema.i + 1, dtype=np.int64)
+    np.cumsum(cont_item, out=inicio_item[1:])
+
+    # Quantidade de pares (entrada do corredor, entrada do pedido) gerados por cada corredor, usada para dividir os blocos.
+    pares = np.bincount(problema.corredores_linha, weights=cont_item[itens_c], minlength=problema.a).astype(np.int64).tolist()
+
+    pedidos = np.empty((problema.a, k), dtype=np.int32)
+    pesos = np.empty((problema.a, k), dtype=np.int32)
+    tamanho = problema.tamanho_pedidos.astype(np.int64)
+
+    inicio = 0
+    while inicio < problema.a:
+        # Montando o bloco de corredores [inicio, fim).
+        fim, total = inicio + 1, pares[inicio]
+        while fim < problema.a and total + pares[fim] <= max_elementos and (fim - inicio + 1) * problema.o <= max_elementos:
+            total += pares[fim]
+            fim += 1
+
+        # Expandindo cada entrada dos corredores do bloco para as entradas dos pedidos com o mesmo item.
+        entradas = slice(ptr_c[inicio], ptr_c[fim])
+        itens, ofertas = itens_c[entradas], qnts_c[entradas]
+        linhas = problema.corredores_linha[entradas] - inicio
+        repeticoes = cont_item[itens]
+        deslocamento = np.arange(repeticoes.sum()) - np.repeat(np.cumsum(repeticoes) - repeticoes, repeticoes)
+        posicoes = np.repeat(inicio_item[itens], repeticoes) + deslocamento
+        cobertura = np.minimum(qnt_item[posicoes], np.repeat(ofertas, repeticoes))
+
+        # Somando a cobertura de cada par (corredor, pedido) e calculando os pesos.
+        chaves = np.repeat(linhas.astype(np.int64), repeticoes) * problema.o + pedido_item[posicoes]
+        coberto = np.bincount(chaves, weights=cobertura, minlength=(fim - inicio) * problema.o).astype(np.int64)
+        bloco = tamanho - coberto.reshape(fim - inicio, problema.o)
+
+        if k == problema.o:
+            ordem = np.argsort(bloco, axis=1, kind="stable")
+        else:
+            ordem = np.empty((fim - inicio, k), dtype=np.int64)
+            if k:
+                limite = np.partition(bloco, k - 1, axis=1)[:, k - 1]
+                for linha in range(fim - inicio):
+                    candidatos = np.flatnonzero(bloco[linha] <= limite[linha])
+                    ordem[linha] = candidatos[np.argsort(bloco[linha, candidatos], kind="stable")[:k]]
+        pedidos[inicio:fim] = ordem
+        pesos[inicio:fim] = np.take_along_axis(bloco, ordem, axis=1)
+        inicio = fim
+
+    return pedidos, pesos
 
 
 def jaccard_distance(sol1: Solucao, sol2: Solucao) -> float:
@@ -299,42 +689,3 @@ def jaccard_distance(sol1: Solucao, sol2: Solucao) -> float:
 
     jaccard_index = intersect_count / union_count
     return 1.0 - jaccard_index
-
-def ranqueamento_guloso(problema: Processa.Problema, solucao: Solucao) -> tuple[List[int], List[int]]:
-    """
-    Ranqueia dinamicamente os pedidos e corredores que ainda não foram selecionados na solução, com base em uma concentração cruzada dos itens.
-
-    Args:
-        problema (Processa.Problema): Instância contendo os dados do problema, incluindo as estruturas 'aisles' (corredores) e 'orders' (pedidos).
-        solucao (Solucao): Dataclass representando o estado atual da solução, incluindo estruturas auxiliares.
-
-    Returns:
-        Tuple[List[int], List[int]]: lista contendo os índices dos pedidos ranqueados em ordem descrescente, lista contendo os índices dos corredores ranqueados em ordem descrescente, respectivamente.
-    """
-
-    corredores_disponiveis = [idx for idx, disp in enumerate(solucao.corredoresDisp) if disp == 0]
-    pedidos_disponiveis   = [idx for idx, disp in enumerate(solucao.pedidosDisp)   if disp == 0]
-
-    concentracao_corredores = defaultdict(lambda: {"total": 0, "contagem": 0})
-    concentracao_pedidos = defaultdict(lambda: {"total": 0, "contagem": 0})
-
-    for indice in corredores_disponiveis:
-        for item, qtd in problema.aisles[indice].items():
-            concentracao_corredores[item]["total"]   += qtd
-            concentracao_corredores[item]["contagem"] += 1
-
-    for indice in pedidos_disponiveis:
-        for item, qtd in problema.orders[indice].items():
-            concentracao_pedidos[item]["total"]   += qtd
-            concentracao_pedidos[item]["contagem"] += 1
-
-    peso_ponderado_pedidos = {}
-    peso_ponderado_corredores = {}
-    peso_ponderado_pedidos = {item: (concentracao_corredores[item]["total"] / concentracao_corredores[item]["contagem"] if concentracao_corredores[item]["contagem"] != 0 else 0) for item in range (problema.i)}
-    peso_ponderado_corredores = {item: (concentracao_pedidos[item]["total"] / concentracao_pedidos[item]["contagem"] if concentracao_pedidos[item]["contagem"] != 0 else 0) for item in range (problema.i)}
-
-    # Ranqueamento
-    pedidos_rankeados = sorted(pedidos_disponiveis, key = lambda idx: sum(peso_ponderado_pedidos[item] * qtd for item, qtd in problema.orders[idx].items()), reverse = False)
-    corredores_rankeados = sorted(corredores_disponiveis, key = lambda idx: sum(peso_ponderado_corredores[item] * qtd for item, qtd in problema.aisles[idx].items()), reverse = False)
-
-    return pedidos_rankeados, corredores_rankeados
\ No newline at end of file
@@ -1,12 +1,77 @@
+import json
+import numpy as np
 import os
+import zlib
+from functools import cached_property
+from itertools import islice
+from time import perf_counter
+from typing import List, Tuple
+
+def _monta_csr(linhas: List[dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Função responsável por converter uma lista de dicionários item -> quantidade para o formato CSR (linhas comprimidas).
+
+    Args:
+        linhas (List[Dict[int, int]]): Lista de dicionários (pedidos ou corredores).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: índices dos itens, quantidades e ponteiros das linhas (todos int32 e contíguos), respectivamente. Os itens da linha x estão nas posições ptr[x] até ptr[x + 1] - 1, na mesma ordem dos dicionários.
+    """
+
+    ptr = np.zeros(len(linhas) + 1, dtype=np.int32)
+    np.cumsum([len(linha) for linha in linhas], out=ptr[1:])
+    itens = np.fromiter((item for linha in linhas for item in linha.keys()), dtype=np.int32, count=ptr[-1])
+    qnts = np.fromiter((qnt for linha in linhas for qnt in linha.values()), dtype=np.int32, count=ptr[-1])
+    return itens, qnts, ptr
+
+def _monta_dicts(itens: np.ndarray, qnts: np.ndarray, ptr: np.ndarray) -> List[dict]:
+    """
+    Função responsável por converter linhas no formato CSR para uma lista de dicionários item -> quantidade (inversa de _monta_csr).
+
+    Args:
+        itens (np.ndarray): Índices dos itens.
+        qnts (np.ndarray): Quantidades.
+        ptr (np.ndarray): Ponteiros das linhas.
+
+    Returns:
+        linhas (List[Dict[int, int]]): Lista de dicionários, um por linha.
+    """
+
+    pares = zip(itens.tolist(), qnts.tolist())
+    return [dict(islice(pares, k)) for k in np.diff(ptr).tolist()]
+
+def _transpoe(itens: np.ndarray, linhas: np.ndarray, n_itens: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Função responsável por transpor uma representação CSR, agrupando as linhas (pedidos ou corredores) por item.
+
+    Args:
+        itens (np.ndarray): Índices dos itens de cada posição do CSR.
+        linhas (np.ndarray): Índice da linha de cada posição do CSR.
+        n_itens (int): Quantidade total de itens.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: ponteiros dos itens e linhas, respectivamente. As linhas que contêm o item x estão nas posições ptr[x] até ptr[x + 1] - 1, em ordem crescente.
+    """
+
+    ordem = np.argsort(itens, kind="stable")
+    ptr = np.zeros(n_itens + 1, dtype=np.int64)
+    np.cumsum(np.bincount(itens, minlength=n_itens), out=ptr[1:])
+    return ptr, linhas[ordem]
+
+_MAGICO = 0x4D4C5750     # Identificador do formato binário do dataset.
+_VERSAO = 1              # Versão do formato binário do dataset.
+_CABECALHO = 10          # Quantidade de inteiros do cabeçalho: mágico, versão, crc32 do .txt, o, i, a, lb, ub, itens dos pedidos, itens dos corredores.
 
 class Problema():
     """
     Realiza a leitura e o tratamento dos dados presentes em um arquivo de dataset. A classe carrega as informações referentes ao número de pedidos, itens e corredores, além dos detalhes de cada pedido e corredor, limites inferior e superior, e inicializa a estrutura que armazenará os resultados processados.
 
+    Na primeira leitura, o dataset também é salvo em formato binário ("<dataset>.npy" no diretório "Datasets"), com a representação compacta (CSR), os limites e o crc32 do .txt. Nas leituras seguintes, se o crc32 ainda confere, o arquivo binário é mapeado em memória (sem conversão do texto), e os processos que leem o mesmo dataset compartilham as mesmas páginas. Neste caso os dicionários orders e aisles só são montados no primeiro acesso.
+
     Args:
         dataset (str): Nome do dataset a ser tratado (espera-se que exista um arquivo com nome "<dataset>.txt" no diretório "Datasets").
         arquivo (str): Nome do arquivo onde os resultados serão salvos no formato CSV e TXT.
+        binario (bool): Se True (padrão), usa e mantém o arquivo binário do dataset.
 
     Atributos:
         o (int): Número total de pedidos presentes no dataset.
@@ -17,15 +82,31 @@ class Problema():
         lb (int): Valor do limite inferior definido no dataset.
         ub (int): Valor do limite superior definido no dataset.
         arquivo (str): Nome do arquivo onde os resultados processados serão gravados.
+        tempo_leitura (float): Tempo gasto na leitura do dataset, em segundos (não incluído no tempo das heurísticas).
         result (Dict[str, Any]): Dicionário que armazena os resultados finais, contendo o nome do dataset, listas de pedidos e corredores selecionados, valor da função objetivo e tempo de execução.
 
+    Representação compacta (construída sob demanda, no primeiro acesso):
+        pedidos_csr (Tuple[np.ndarray, np.ndarray, np.ndarray]): Pedidos no formato CSR (itens, quantidades, ponteiros), em arrays int32.
+        corredores_csr (Tuple[np.ndarray, np.ndarray, np.ndarray]): Corredores no formato CSR (itens, quantidades, ponteiros), em arrays int32.
+        pedidos_linha (np.ndarray): Índice do pedido de cada posição de pedidos_csr.
+        corredores_linha (np.ndarray): Índice do corredor de cada posição de corredores_csr.
+        tamanho_pedidos (np.ndarray): Quantidade total de itens de cada pedido.
+        demanda_por_item (np.ndarray): Soma da quantidade de cada item em todos os pedidos.
+        oferta_por_item (np.ndarray): Soma da quantidade de cada item em todos os corredores.
+        peso_corredores (np.ndarray): Peso de cada corredor, a soma de demanda_por_item[item] * quantidade sobre os itens do corredor.
+        item_pedidos (List[Tuple[List[int], List[int]]]): Índice invertido item -> (quantidades, pedidos), com os pedidos de cada item ordenados pela quantidade pedida.
+        pedidos_por_item (Tuple[np.ndarray, np.ndarray]): Índice invertido item -> pedidos em formato CSR (ponteiros, pedidos).
+        corredores_por_item (Tuple[np.ndarray, np.ndarray]): Índice invertido item -> corredores em formato CSR (ponteiros, corredores).
+
     Métodos:
+        compacta()
         imprimeProblema()
         imprimeResultados()
         salvaResultado()
+        salvaSementesCSV()
     """
 
-    def __init__(self, dataset: str, arquivo: str) -> None:
+    def __init__(self, dataset: str, arquivo: str, binario: bool = True) -> None:
         try:
             # Salvando o nome do arquivo de resultados.
             self.arquivo = arquivo
@@ -33,38 +114,212 @@ class Problema():
             # Pegando o diretório atual.
             base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             dataset_path = os.path.join(base_dir, "Datasets", f"{dataset}.txt")
+            binario_path = os.path.join(base_dir, "Datasets", f"{dataset}.npy")
 
-            # Lendo o dataset.
+            # Lendo o dataset (o crc32 do texto valida o arquivo binário).
+            inicio = perf_counter()
             with open(dataset_path, "rb") as data:
-                lines = data.readlines()
-                # Elementos o|i|a.
-                first_line = lines[0].strip().split()
-                self.o, self.i, self.a = int(first_line[0]), int(first_line[1]), int(first_line[2])
-
-                # Pedidos - 'o' linhas no formato k|i|q ..., sendo k a quantidade de itens no pedido, e i|q o par item|quantidade.
-                self.orders = []
-                for i in range(self.o):
-                    order_line = lines[i + 1].strip().split()
-                    order = {int(order_line[1 + k * 2]): int(order_line[2 + k * 2]) for k in range(int(order_line[0]))}
-                    self.orders.append(order)
-
-                # Corredores - 'a' linhas no formato k|i|q ..., sendo k a quantidade de itens no corredor, e i|q o par item|quantidade.
-                self.aisles = []
-                for i in range(self.a):
-                    aisle_line = lines[i + 1 + self.o].strip().split()
-                    aisle = {int(aisle_line[1 + k * 2]): int(aisle_line[2 + k * 2]) for k in range(int(aisle_line[0]))}
-                    self.aisles.append(aisle)
-
-                # Limite inferior e superior.
-                last_line = lines[self.o + self.a + 1].strip().split()
-                self.lb, self.ub = int(last_line[0]), int(last_line[1])
-
-                # Resultado base.
-                self.result = {"dataset": dataset, "orders": [], "aisles": [], "objective": 0, "time": 0}
+                conteudo = data.read()
+            crc = zlib.crc32(conteudo)
+            if not (binario and self._carregaBinario(binario_path, crc)):
+                self._converteTexto(conteudo)
+                if binario:
+                    self._salvaBinario(binario_path, crc)
+            self.tempo_leitura = perf_counter() - inicio
+
+            # Resultado base.
+            self.result = {"dataset": dataset, "orders": [], "aisles": [], "objective": 0, "time": 0}
         except FileNotFoundError:
             print("Dataset não existe.")
             exit()
 
+    def _converteTexto(self, conteudo: bytes) -> None:
+        """
+        Função responsável por converter o texto do dataset, preenchendo os atributos do problema.
+
+        Args:
+            conteudo (bytes): Conteúdo do arquivo .txt do dataset.
+        """
+
+        # Convertendo todos os números (separados por espaços ou quebras de linha) em um único array.
+        tokens = np.fromstring(conteudo, dtype=np.int64, sep=" ")
+        # Elementos o|i|a.
+        self.o, self.i, self.a = (int(token) for token in tokens[:3])
+
+        # Pedidos e corredores - 'o' + 'a' linhas no formato k|i|q ..., sendo k a quantidade de itens na linha, e i|q o par item|quantidade. Percorre apenas os k para achar o início de cada linha.
+        valores = tokens.tolist()
+        inicios = []
+        posicao = 3
+        for _ in range(self.o + self.a):
+            inicios.append(posicao)
+            posicao += 2 * valores[posicao] + 1
+        inicios = np.array(inicios, dtype=np.int64)
+
+        # Posição de cada par item|quantidade, linha por linha (formato CSR).
+        ks = tokens[inicios]
+        ptr = np.zeros(self.o + self.a + 1, dtype=np.int64)
+        np.cumsum(ks, out=ptr[1:])
+        pares = np.repeat(inicios + 1, ks) + 2 * (np.arange(ptr[-1]) - np.repeat(ptr[:-1], ks))
+        itens, qnts = tokens[pares].astype(np.int32), tokens[pares + 1].astype(np.int32)
+
+        # Montando os dicionários item -> quantidade de cada linha.
+        linhas = _monta_dicts(itens, qnts, ptr)
+        self.orders, self.aisles = linhas[:self.o], linhas[self.o:]
+
+        # Representação compacta já lida (apenas se nenhuma linha repete um item, caso em que o dicionário mantém só a última quantidade).
+        if sum(map(len, linhas)) == len(itens):
+            corte = int(ptr[self.o])
+            self.pedidos_csr = (itens[:corte], qnts[:corte], ptr[:self.o + 1].astype(np.int32))
+            self.corredores_csr = (itens[corte:], qnts[corte:], (ptr[self.o:] - corte).astype(np.int32))
+
+        # Limite inferior e superior.
+        self.lb, self.ub = int(tokens[posicao]), int(tokens[posicao + 1])
+
+    def _carregaBinario(self, caminho: str, crc: int) -> bool:
+        """
+        Função responsável por mapear em memória o arquivo binário do dataset, preenchendo os atributos do problema.
+
+        Formato (um único array int32 salvo com np.save): cabeçalho (ver _CABECALHO), seguido de ponteiros, itens e quantidades dos pedidos e de ponteiros, itens e quantidades dos corredores.
+
+        Args:
+            caminho (str): Caminho do arquivo binário.
+            crc (int): crc32 do .txt do dataset.
+
+        Returns:
+            carregado (bool): False se o arquivo não existe, é inválido ou foi gerado a partir de outro conteúdo do .txt.
+        """
+
+        try:
+            dados = np.load(caminho, mmap_mode="r", allow_pickle=False)
+        except (OSError, ValueError):
+            return False
+        if dados.dtype != np.int32 or dados.ndim != 1 or len(dados) < _CABECALHO:
+            return False
+        magico, versao, crc_salvo, o, i, a, lb, ub, n_pedidos, n_corredores = (int(valor) for valor in dados[:_CABECALHO])
+        if magico != _MAGICO or versao != _VERSAO or crc_salvo & 0xFFFFFFFF != crc or len(dados) != _CABECALHO + o + a + 2 + 2 * (n_pedidos + n_corredores):
+            return False
+
+        self.o, self.i, self.a, self.lb, self.ub = o, i, a, lb, ub
+        posicao = _CABECALHO
+        for nome, linhas, n in (("pedidos_csr", o, n_pedidos), ("corredores_csr", a, n_corredores)):
+            ptr = dados[posicao:posicao + linhas + 1]
+            itens = dados[posicao + linhas + 1:posicao + linhas + 1 + n]
+            qnts = dados[posicao + linhas + 1 + n:posicao + linhas + 1 + 2 * n]
+            setattr(self, nome, (itens, qnts, ptr))
+            posicao += linhas + 1 + 2 * n
+        return True
+
+    def _salvaBinario(self, caminho: str, crc: int) -> None:
+        """
+        Função responsável por salvar o arquivo binário do dataset (ver _carregaBinario). A escrita é feita em um arquivo temporário renomeado no final, para que processos lendo o mesmo dataset ao mesmo tempo nunca vejam um arquivo incompleto. Falhas de escrita são ignoradas.
+
+        Args:
+            caminho (str): Caminho do arquivo binário.
+            crc (int): crc32 do .txt do dataset.
+        """
+
+        if "pedidos_csr" not in self.__dict__:
+            return
+        itens_p, qnts_p, ptr_p = self.pedidos_csr
+        itens_c, qnts_c, ptr_c = self.corredores_csr
+        crc_int32 = int(np.array([crc], dtype=np.uint32).view(np.int32)[0])
+        cabecalho = np.array([_MAGICO, _VERSAO, crc_int32, self.o, self.i, self.a, self.lb, self.ub, len(itens_p), len(itens_c)], dtype=np.int32)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        try:
+            with open(temporario, "wb") as file:
+                np.save(file, np.concatenate((cabecalho, ptr_p, itens_p, qnts_p, ptr_c, itens_c, qnts_c)).astype(np.int32), allow_pickle=False)
+            os.replace(temporario, caminho)
+        except OSError:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    @cached_property
+    def orders(self) -> List[dict]:
+        return _monta_dicts(*self.pedidos_csr)
+
+    @cached_property
+    def aisles(self) -> List[dict]:
+        return _monta_dicts(*self.corredores_csr)
+
+    @cached_property
+    def pedidos_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _monta_csr(self.orders)
+
+    @cached_property
+    def corredores_csr(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return _monta_csr(self.aisles)
+
+    @cached_property
+    def pedidos_linha(self) -> np.ndarray:
+        ptr = self.pedidos_csr[2]
+        return np.repeat(np.arange(self.o, dtype=np.int32), np.diff(ptr))
+
+    @cached_property
+    def corredores_linha(self) -> np.ndarray:
+        ptr = self.corredores_csr[2]
+        return np.repeat(np.arange(self.a, dtype=np.int32), np.diff(ptr))
+
+    @cached_property
+    def tamanho_pedidos(self) -> np.ndarray:
+        _, qnts, _ = self.pedidos_csr
+        return np.bincount(self.pedidos_linha, weights=qnts, minlength=self.o).astype(np.int32)
+
+    @cached_property
+    def demanda_por_item(self) -> np.ndarray:
+        itens, qnts, _ = self.pedidos_csr
+        return np.bincount(itens, weights=qnts, minlength=self.i).astype(np.int64)
+
+    @cached_property
+    def oferta_por_item(self) -> np.ndarray:
+        itens, qnts, _ = self.corredores_csr
+        return np.bincount(itens, weights=qnts, minlength=self.i).astype(np.int64)
+
+    @cached_property
+    def peso_corredores(self) -> np.ndarray:
+        # Soma exata em int64 (acumulada e diferenciada nos ponteiros, o que também funciona para corredores vazios).
+        itens, qnts, ptr = self.corredores_csr
+        acumulado = np.concatenate(([0], np.cumsum(self.demanda_por_item[itens] * qnts, dtype=np.int64)))
+        return acumulado[ptr[1:]] - acumulado[ptr[:-1]]
+
+    @cached_property
+    def itens_maximos(self) -> np.ndarray:
+        # Posição k: soma, sobre os itens, da oferta dos k corredores com mais unidades do item, limitada pela demanda do item (cada entrada do CSR ordenada por item contribui na posição do seu ranque).
+        itens, qnts, _ = self.corredores_csr
+        ordem = np.lexsort((-qnts, itens))
+        itens, qnts = itens[ordem], qnts[ordem].astype(np.int64)
+        inicio = np.concatenate(([0], np.cumsum(np.bincount(itens, minlength=self.i))))[itens]
+        ranque = np.arange(len(itens)) - inicio
+        acumulado = np.cumsum(qnts)
+        acumulado = np.minimum(acumulado - (acumulado[inicio] - qnts[inicio]), self.demanda_por_item[itens])
+        anterior = np.where(ranque > 0, np.concatenate(([0], acumulado[:-1])), 0)
+        incremento = np.zeros(self.a + 1, dtype=np.int64)
+        np.add.at(incremento, ranque + 1, acumulado - anterior)
+        return np.cumsum(incremento)
+
+    @cached_property
+    def item_pedidos(self) -> List[Tuple[List[int], List[int]]]:
+        itens, qnts, _ = self.pedidos_csr
+        ordem = np.lexsort((qnts, itens))
+        ptr = np.concatenate(([0], np.cumsum(np.bincount(itens, minlength=self.i)))).tolist()
+        qnts, pedidos = qnts[ordem].tolist(), self.pedidos_linha[ordem].tolist()
+        return [(qnts[ptr[item]:ptr[item + 1]], pedidos[ptr[item]:ptr[item + 1]]) for item in range(self.i)]
+
+    @cached_property
+    def pedidos_por_item(self) -> Tuple[np.ndarray, np.ndarray]:
+        return _transpoe(self.pedidos_csr[0], self.pedidos_linha, self.i)
+
+    @cached_property
+    def corredores_por_item(self) -> Tuple[np.ndarray, np.ndarray]:
+        return _transpoe(self.corredores_csr[0], self.corredores_linha, self.i)
+
+    def compacta(self) -> None:
+        """
+        Função responsável por construir de uma vez toda a representação compacta (CSR) do problema. Sem ela, cada estrutura é construída no primeiro acesso.
+        """
+
+        self.pedidos_csr, self.corredores_csr, self.pedidos_linha, self.corredores_linha, self.tamanho_pedidos, self.item_pedidos, self.pedidos_por_item, self.corredores_por_item
+        self.demanda_por_item, self.oferta_por_item, self.peso_corredores, self.itens_maximos
+
     def imprimeProblema(self) -> None:
         """
         Função responsável por imprimir os dados tratados do dataset.
@@ -96,8 +351,39 @@ class Problema():
         Formato: dataset,pedidos (separados por -),corredores (separados por -),valor da função objetivo,tempo de execução.
         """
 
-        with open(f"./Resultados-csv/{self.arquivo}.csv", "+a") as file:
-            file.write(f"{self.result['dataset']},{'-'.join(map(str, self.result['orders']))},{'-'.join(map(str, self.result['aisles']))},{self.result['objective']},{self.result['time']}\n")
+        Problema.escreveResultadoCSV(self.arquivo, self.result)
+
+    @staticmethod
+    def escreveResultadoCSV(arquivo: str, result: dict) -> None:
+        """
+        Função responsável por acrescentar um resultado (no formato de Problema.result) ao arquivo csv informado, sem precisar da instância do problema.
+        """
+
+        with open(f"./Resultados-csv/{arquivo}.csv", "+a") as file:
+            file.write(f"{result['dataset']},{'-'.join(map(str, result['orders']))},{'-'.join(map(str, result['aisles']))},{result['objective']},{result['time']}\n")
+            file.close()
+
+    def salvaSementesCSV(self, registros: List[dict]) -> None:
+        """
+        Função responsável por salvar os tempos e valores da função objetivo de cada semente de uma execução com várias sementes.
+
+        Formato: dataset,semente,valor da função objetivo,tempo da heurística,tempo total da semente.
+        """
+
+        with open(f"./Resultados-csv/{self.arquivo}-sementes.csv", "+a") as file:
+            for registro in registros:
+                file.write(f"{self.result['dataset']},{registro['semente']},{registro['objetivo']},{registro['tempo']},{registro['tempo_total']}\n")
+            file.close()
+
+    def salvaPerfilJSON(self, perfil: dict) -> None:
+        """
+        Função responsável por salvar o perfil da instrumentação (ver Metodos.perfil_instrumentacao) junto do dataset e do tempo de leitura.
+
+        Formato: json com as chaves dataset, tempo_leitura, funcoes e operadores.
+        """
+
+        with open(f"./Resultados-csv/{self.arquivo}-perfil.json", "+w") as file:
+            json.dump({"dataset": self.result["dataset"], "tempo_leitura": self.tempo_leitura, **perfil}, file, indent=1)
             file.close()
 
     def salvaResultadoTXT(self) -> None:
@@ -111,11 +397,19 @@ class Problema():
             - Próximas m linhas: cada linha contém um inteiro representando o índice do corredor.
         """
 
-        with open(f"./Resultados-txt/{self.arquivo}.txt", "+w") as file:
-            file.write(str(len(self.result["orders"])) + "\n")
-            for o in self.result["orders"]:
+        Problema.escreveResultadoTXT(self.arquivo, self.result)
+
+    @staticmethod
+    def escreveResultadoTXT(arquivo: str, result: dict) -> None:
+        """
+        Função responsável por salvar um resultado (no formato de Problema.result) no arquivo txt informado, sem precisar da instância do problema.
+        """
+
+        with open(f"./Resultados-txt/{arquivo}.txt", "+w") as file:
+            file.write(str(len(result["orders"])) + "\n")
+            for o in result["orders"]:
                 file.write(str(o) + "\n")
-            file.write(str(len(self.result["aisles"])) + "\n")
-            for a in self.result["aisles"]:
+            file.write(str(len(result["aisles"])) + "\n")
+            for a in result["aisles"]:
                 file.write(str(a) + "\n")
             file.close()
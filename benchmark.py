@@ -0,0 +1,194 @@
+import argparse
+import contextlib
+import io
+import json
+import Metodos
+import os
+import Processa
+import resource
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_all_start_methods, get_context
+from time import perf_counter
+
+# Casos do benchmark: nome -> (construtiva, refinamento), com os mesmos códigos da main.py.
+CASOS = {
+    "hibrida": ("0", "0"),
+    "aleatorio": ("1", "0"),
+    "gulosa": ("2", "0"),
+    "PSO": ("3", "0"),
+    "FPA": ("4", "0"),
+    "ALNS": ("5", "0"),
+    "parametrica": ("6", "0"),
+    "dinkelbach": ("7", "0"),
+    "milp": ("8", "0"),
+    "melhor_vizinhanca": ("2", "1"),
+    "refinamento_cluster_vns": ("2", "2"),
+}
+DATASETS = ["instance_0020", "instance_0002", "instance_0001", "instance_0003", "instance_0009", "instance_0017", "instance_0016", "instance_0027"]
+SEMENTES = [1.0, 2.0]
+BASELINE = "benchmark-baseline.json"
+
+# Programa executado em um interpretador novo para medir a inicialização: importa os pacotes e, opcionalmente, executa a gulosa sem refinamento.
+INICIALIZACAO = """
+import json, sys
+from time import perf_counter
+inicio = perf_counter()
+import Metodos, Processa
+tempo_importacao = perf_counter() - inicio
+if len(sys.argv) > 1:
+    Metodos.executa(Processa.Problema(sys.argv[1], ""), "2", "0", 1)
+print(json.dumps({"importacao": tempo_importacao, "modulos": [modulo for modulo in ("numpy", "scipy", "sklearn", "matplotlib") if modulo in sys.modules]}))
+"""
+
+def executa_caso(tarefa: tuple) -> dict:
+    """
+    Função responsável por executar um caso do benchmark em um processo novo, medindo o tempo de relógio (sem a leitura do dataset) e o pico de memória do processo (incluindo o interpretador e as bibliotecas).
+
+    Args:
+        tarefa (tuple): Dataset, nome do caso e semente.
+
+    Returns:
+        resultado (dict): Tempo, pico de memória (MB), valor da função objetivo, validade da solução e motivo da invalidade.
+    """
+
+    dataset, caso, semente = tarefa
+    construtiva, refinamento = CASOS[caso]
+    problema = Processa.Problema(dataset, "")
+
+    # As mensagens dos métodos são descartadas para não misturar com a tabela.
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = perf_counter()
+        solucao = Metodos.executa(problema, construtiva, refinamento, semente)
+        tempo = perf_counter() - inicio
+
+    valida, motivo = Metodos.valida_solucao(problema, solucao)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != "darwin" else 1024 * 1024)
+    return {"tempo": tempo, "rss_mb": rss, "objetivo": solucao.objetivo, "valida": valida, "motivo": motivo}
+
+def chave(dataset: str, caso: str, semente: float) -> str:
+    return f"{dataset}/{caso}/{semente:g}"
+
+def compara(resultados: dict, baseline: dict, limite_tempo: float, limite_qualidade: float, tempo_minimo: float) -> dict:
+    """
+    Função responsável por comparar os resultados com o baseline.
+
+    Args:
+        resultados (dict): Resultados atuais, por chave dataset/caso/semente.
+        baseline (dict): Resultados do baseline, no mesmo formato.
+        limite_tempo (float): Aumento relativo de tempo tolerado (0.25 = 25%).
+        limite_qualidade (float): Queda relativa do objetivo tolerada (0 = qualquer queda é regressão).
+        tempo_minimo (float): Diferença absoluta de tempo, em segundos, abaixo da qual o tempo não é comparado (ruído de medição).
+
+    Returns:
+        regressoes (dict): Lista de regressões (INVÁLIDA, QUALIDADE, TEMPO) de cada chave com alguma regressão.
+    """
+
+    regressoes = {}
+    for nome, atual in resultados.items():
+        marcas = []
+        if not atual["valida"]:
+            marcas.append("INVÁLIDA")
+        base = baseline.get(nome)
+        if base is not None:
+            if atual["objetivo"] < base["objetivo"] * (1 - limite_qualidade) - 1e-9:
+                marcas.append("QUALIDADE")
+            if atual["tempo"] > base["tempo"] * (1 + limite_tempo) and atual["tempo"] - base["tempo"] > tempo_minimo:
+                marcas.append("TEMPO")
+        if marcas:
+            regressoes[nome] = marcas
+    return regressoes
+
+def benchmark(datasets, casos, sementes, caminho_baseline, salvar=False, limite_tempo=0.25, limite_qualidade=0.0, tempo_minimo=0.1, saida=None, repeticoes=3) -> int:
+    # Executando cada repetição de cada caso em um processo novo, para o pico de memória e os caches de um caso não influenciarem os outros. O menor tempo das repetições é o menos afetado pelo ruído da máquina.
+    contexto = get_context("fork") if "fork" in get_all_start_methods() else None
+    resultados = {}
+    inicio = perf_counter()
+    for dataset in datasets:
+        for caso in casos:
+            for semente in sementes:
+                execucoes = []
+                for _ in range(repeticoes):
+                    with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as executor:
+                        execucoes.append(executor.submit(executa_caso, (dataset, caso, semente)).result())
+                resultado = execucoes[0]
+                resultado["tempo"] = min(execucao["tempo"] for execucao in execucoes)
+                resultado["rss_mb"] = max(execucao["rss_mb"] for execucao in execucoes)
+                resultados[chave(dataset, caso, semente)] = resultado
+
+    # Comparando com o baseline.
+    baseline = {}
+    if os.path.exists(caminho_baseline):
+        with open(caminho_baseline) as file:
+            baseline = json.load(file)["resultados"]
+    regressoes = compara(resultados, baseline, limite_tempo, limite_qualidade, tempo_minimo)
+
+    # Imprimindo a tabela.
+    print(f"{'caso':<48} {'tempo (s)':>10} {'base (s)':>10} {'RSS (MB)':>9} {'objetivo':>12} {'base':>12}  regressões")
+    for nome, atual in resultados.items():
+        base = baseline.get(nome, {})
+        base_tempo = f"{base['tempo']:.3f}" if base else "-"
+        base_objetivo = f"{base['objetivo']:.4f}" if base else "-"
+        marcas = ", ".join(regressoes.get(nome, []))
+        if atual["motivo"]:
+            marcas += f" ({atual['motivo']})"
+        print(f"{nome:<48} {atual['tempo']:>10.3f} {base_tempo:>10} {atual['rss_mb']:>9.1f} {atual['objetivo']:>12.4f} {base_objetivo:>12}  {marcas}")
+    print(f"\n{len(resultados)} casos em {perf_counter() - inicio:.3f}s, {len(regressoes)} com regressão.")
+
+    # Salvando os resultados.
+    conteudo = {"config": {"datasets": datasets, "casos": casos, "sementes": sementes}, "resultados": resultados}
+    if saida:
+        with open(saida, "w") as file:
+            json.dump(conteudo, file, indent=1)
+    if salvar:
+        with open(caminho_baseline, "w") as file:
+            json.dump(conteudo, file, indent=1)
+        print(f"Baseline salvo em {caminho_baseline}.")
+
+    return 1 if regressoes else 0
+
+def inicializacao(datasets, repeticoes=5) -> int:
+    """
+    Função responsável por medir o tempo de inicialização da linha de comando: a importação dos pacotes Metodos e Processa e uma execução curta completa (gulosa, sem refinamento) em cada dataset, cada uma em um interpretador novo. O menor tempo das repetições é usado.
+    """
+
+    casos = [("importação", [])] + [(f"{dataset}/gulosa", [dataset]) for dataset in datasets]
+    print(f"{'caso':<48} {'importação (s)':>15} {'processo (s)':>13}  bibliotecas carregadas")
+    for nome, argumentos in casos:
+        execucoes = []
+        for _ in range(repeticoes):
+            inicio = perf_counter()
+            saida = subprocess.run([sys.executable, "-c", INICIALIZACAO] + argumentos, capture_output=True, text=True, check=True).stdout
+            resultado = json.loads(saida.splitlines()[-1])
+            resultado["processo"] = perf_counter() - inicio
+            execucoes.append(resultado)
+        importacao = min(execucao["importacao"] for execucao in execucoes)
+        processo = min(execucao["processo"] for execucao in execucoes)
+        print(f"{nome:<48} {importacao:>15.3f} {processo:>13.3f}  {', '.join(execucoes[0]['modulos'])}")
+    return 0
+
+# Verificando argumentos e chamando o benchmark.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa os métodos sobre um subconjunto fixo dos datasets, com sementes fixas, e compara tempo e qualidade com um baseline.")
+    parser.add_argument("--datasets", default=",".join(DATASETS), help="Datasets separados por vírgula (padrão: subconjunto fixo).")
+    parser.add_argument("--casos", default=",".join(CASOS), help=f"Casos separados por vírgula: {', '.join(CASOS)} (padrão: todos).")
+    parser.add_argument("--sementes", default=",".join(f"{semente:g}" for semente in SEMENTES), help="Sementes separadas por vírgula.")
+    parser.add_argument("--baseline", default=BASELINE, help=f"Arquivo json do baseline (padrão: {BASELINE}).")
+    parser.add_argument("--salvar", action="store_true", help="Salva os resultados desta execução como o novo baseline.")
+    parser.add_argument("--saida", default=None, help="Arquivo json em que os resultados desta execução são salvos.")
+    parser.add_argument("--limite-tempo", type=float, default=0.25, help="Aumento relativo de tempo considerado regressão (padrão: 0.25).")
+    parser.add_argument("--limite-qualidade", type=float, default=0.0, help="Queda relativa do objetivo considerada regressão (padrão: 0, qualquer queda).")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções de cada caso; o menor tempo é comparado (padrão: 3).")
+    parser.add_argument("--inicializacao", action="store_true", help="Mede apenas o tempo de inicialização (importação dos pacotes e execução curta da gulosa em cada dataset, em interpretadores novos).")
+    parser.add_argument("--tempo-minimo", type=float, default=0.1, help="Diferença de tempo, em segundos, abaixo da qual o tempo não é comparado (padrão: 0.1).")
+    args = parser.parse_args()
+
+    casos = args.casos.split(",")
+    for caso in casos:
+        if caso not in CASOS:
+            parser.error(f"caso inválido: {caso}")
+
+    if args.inicializacao:
+        sys.exit(inicializacao(args.datasets.split(","), args.repeticoes))
+    sys.exit(benchmark(args.datasets.split(","), casos, [float(semente) for semente in args.sementes.split(",")], args.baseline, args.salvar, args.limite_tempo, args.limite_qualidade, args.tempo_minimo, args.saida, args.repeticoes))
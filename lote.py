@@ -0,0 +1,141 @@
+import argparse
+import glob
+import Metodos
+import os
+import Processa
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_all_start_methods, get_context
+from time import perf_counter
+
+_cache = {}     # Último problema lido por cada processo, reaproveitado pelas tarefas seguintes do mesmo dataset.
+
+def carrega_problema(dataset: str) -> Processa.Problema:
+    """
+    Função responsável por ler o dataset, reaproveitando o último problema lido pelo processo.
+
+    Args:
+        dataset (str): Nome do dataset na pasta Datasets, sem o .txt.
+
+    Returns:
+        problema (Problema): Instância contendo os dados do problema (corredores, pedidos, limites).
+    """
+
+    if dataset not in _cache:
+        _cache.clear()
+        _cache[dataset] = Processa.Problema(dataset, "")
+    return _cache[dataset]
+
+def executa_tarefa(tarefa: tuple) -> dict:
+    """
+    Função responsável por executar uma tarefa do lote (um dataset com uma combinação de construtiva, refinamento e semente).
+
+    Args:
+        tarefa (tuple): Dataset, construtiva, refinamento, semente, tempo limite (ou None) e fração do tempo reservada para a construção.
+
+    Returns:
+        result (dict): Resultado no formato de Problema.result.
+    """
+
+    dataset, construtiva, refinamento, semente, tempo_limite, fracao_construcao = tarefa
+    problema = carrega_problema(dataset)
+    solucao = Metodos.executa(problema, construtiva, refinamento, semente, Metodos.Orcamento(tempo_limite), fracao_construcao)
+    return {"dataset": dataset, "orders": sorted(solucao.pedidos), "aisles": sorted(solucao.corredores), "objective": solucao.objetivo, "time": solucao.tempo}
+
+def nome_arquivo(prefixo: str, construtiva: str, refinamento: str, semente: float) -> str:
+    return f"{prefixo}-{construtiva}-{refinamento}-{semente:g}"
+
+def datasets_salvos(arquivo: str) -> set:
+    """
+    Função responsável por listar os datasets que já possuem resultado no arquivo csv informado.
+
+    Args:
+        arquivo (str): Nome do arquivo de resultados, sem o .csv.
+
+    Returns:
+        datasets (set): Nomes dos datasets presentes no arquivo.
+    """
+
+    caminho = f"./Resultados-csv/{arquivo}.csv"
+    if not os.path.exists(caminho):
+        return set()
+    with open(caminho) as file:
+        return {linha.split(",", 1)[0] for linha in file if linha.strip()}
+
+def monta_tarefas(padroes: list, construtivas: list, refinamentos: list, sementes: list, prefixo: str) -> list:
+    """
+    Função responsável por montar as tarefas do lote, ignorando as que já possuem resultado e ordenando dos maiores datasets para os menores.
+
+    Args:
+        padroes (list): Nomes ou padrões glob dos datasets (sem o .txt).
+        construtivas (list): Heurísticas construtivas ou metaheurísticas.
+        refinamentos (list): Heurísticas de refinamento.
+        sementes (list): Sementes numéricas.
+        prefixo (str): Prefixo dos arquivos de resultados.
+
+    Returns:
+        tarefas (list): Tuplas (dataset, construtiva, refinamento, semente).
+    """
+
+    # Encontrando os datasets.
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    caminhos = set()
+    for padrao in padroes:
+        caminhos.update(glob.glob(os.path.join(base_dir, "Datasets", f"{padrao}.txt")))
+    caminhos = sorted(caminhos, key=lambda caminho: (-os.path.getsize(caminho), caminho))
+    datasets = [os.path.splitext(os.path.basename(caminho))[0] for caminho in caminhos]
+
+    # Combinando os datasets com a matriz de métodos, pulando os resultados já salvos.
+    salvos = {}
+    tarefas = []
+    for dataset in datasets:
+        for construtiva in construtivas:
+            for refinamento in refinamentos:
+                for semente in sementes:
+                    arquivo = nome_arquivo(prefixo, construtiva, refinamento, semente)
+                    if arquivo not in salvos:
+                        salvos[arquivo] = datasets_salvos(arquivo)
+                    if dataset not in salvos[arquivo]:
+                        tarefas.append((dataset, construtiva, refinamento, semente))
+    return tarefas
+
+def lote(padroes, construtivas, refinamentos, sementes, prefixo, processos=None, tempo_limite=None, fracao_construcao=0.5):
+    tarefas = monta_tarefas(padroes, construtivas, refinamentos, sementes, prefixo)
+    print(f"{len(tarefas)} tarefas.")
+    if not tarefas:
+        return
+
+    # Executando as tarefas em paralelo. Apenas este processo escreve nos arquivos de resultados.
+    inicio = perf_counter()
+    contexto = get_context("fork") if "fork" in get_all_start_methods() else None
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto) as executor:
+        futuros = {executor.submit(executa_tarefa, tarefa + (tempo_limite, fracao_construcao)): tarefa for tarefa in tarefas}
+        for concluidas, futuro in enumerate(as_completed(futuros), start=1):
+            dataset, construtiva, refinamento, semente = futuros[futuro]
+            arquivo = nome_arquivo(prefixo, construtiva, refinamento, semente)
+            try:
+                result = futuro.result()
+            except Exception as erro:
+                print(f"[{concluidas}/{len(tarefas)}] {arquivo} {dataset}: ERRO {erro!r}", file=sys.stderr)
+                continue
+
+            Processa.Problema.escreveResultadoCSV(arquivo, result)
+            Processa.Problema.escreveResultadoTXT(f"{arquivo}-{dataset}", result)
+            print(f"[{concluidas}/{len(tarefas)}] {arquivo} {dataset}: objetivo {result['objective']} em {result['time']:.3f}s")
+
+    print(f"Lote concluído em {perf_counter() - inicio:.3f}s.")
+
+# Verificando argumentos e chamando o lote.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Executa uma matriz de métodos (construtiva x refinamento x semente) sobre vários datasets em paralelo.")
+    parser.add_argument("datasets", nargs="*", default=["instance_*"], help="Nomes ou padrões glob dos datasets na pasta Datasets, sem o .txt (padrão: instance_*).")
+    parser.add_argument("--construtivas", default="2", help="Heurísticas construtivas ou metaheurísticas separadas por vírgula (ver main.py).")
+    parser.add_argument("--refinamentos", default="0", help="Heurísticas de refinamento separadas por vírgula (ver main.py).")
+    parser.add_argument("--sementes", default="0", help="Sementes numéricas separadas por vírgula.")
+    parser.add_argument("--prefixo", default="lote", help="Prefixo dos arquivos de resultados: <prefixo>-<construtiva>-<refinamento>-<semente>.csv.")
+    parser.add_argument("--processos", type=int, default=None, help="Quantidade máxima de processos (padrão: número de núcleos).")
+    parser.add_argument("--tempo", type=float, default=None, help="Tempo limite de relógio de cada execução, em segundos (padrão: sem limite).")
+    parser.add_argument("--fracao-construcao", type=float, default=0.5, help="Fração do tempo limite reservada para a construção quando há refinamento (padrão: 0.5).")
+    args = parser.parse_args()
+
+    lote(args.datasets, args.construtivas.split(","), args.refinamentos.split(","), [float(semente) for semente in args.sementes.split(",")], args.prefixo, args.processos, args.tempo, args.fracao_construcao)
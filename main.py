@@ -1,63 +1,64 @@
+import argparse
 import Metodos
 import Processa
-import random
-import sys
+from contextlib import nullcontext
+from time import perf_counter
 
-def main(dataset, arquivo, construtiva, refinamento, semente):
-    # Definindo a semente.
-    random.seed(semente)
+def main(dataset, arquivo, construtiva, refinamento, semente, sementes=1, processos=None, tempo_limite=None, fracao_construcao=0.5, perfil=False, rastro=None, maximo_variaveis=Metodos.MAXIMO_VARIAVEIS_MILP):
+    # Ativando a instrumentação (contadores e tempos das funções mais chamadas).
+    if perfil:
+        Metodos.ativa_instrumentacao()
 
     # Instanciando problema.
     problema = Processa.Problema(dataset, arquivo)
 
-    # Construindo uma solução.
-    if construtiva == "0":
-        solucao = Metodos.hibrida(problema)
-    elif construtiva == "1":
-        solucao = Metodos.aleatorio(problema)
-    elif construtiva == "2":
-        solucao = Metodos.gulosa(problema)
-    elif construtiva == "3":
-        solucao = Metodos.PSO(problema, 30, 2, 2, 1, 1000)
-    elif construtiva == "4":
-        FPA_instance = Metodos.FPA(problema)
-        solucao = FPA_instance.run()
-    elif construtiva == "5":
-        solucao = Metodos.gulosa(problema)
-        ALNS = Metodos.ALNS(problema, solucao, 10, 0.999)
-        solucao = ALNS.run(1000)
-
-    # Refinando a solução.
-    if refinamento == "1":
-        solucao = Metodos.melhor_vizinhanca(problema, solucao)
-    elif refinamento == "2":
-        solucao = Metodos.refinamento_cluster_vns(problema, solucao)
+    # Definindo o prazo de execução (a leitura do dataset não é incluída).
+    orcamento = Metodos.Orcamento(tempo_limite)
+
+    # Construindo e refinando uma solução (ou várias, uma por semente, mantendo a melhor).
+    caminho_rastro = f"./Resultados-csv/{arquivo}-rastro.{rastro}" if rastro else None
+    if sementes <= 1:
+        with Metodos.Rastro(caminho_rastro) if caminho_rastro else nullcontext() as registro:
+            solucao = Metodos.executa(problema, construtiva, refinamento, semente, orcamento, fracao_construcao, processos, registro, maximo_variaveis)
+        tempo = solucao.tempo
+    else:
+        inicio = perf_counter()
+        solucao, registros = Metodos.multi_inicio(problema, construtiva, refinamento, [semente + k for k in range(sementes)], processos, orcamento, fracao_construcao, caminho_rastro, maximo_variaveis)
+        tempo = perf_counter() - inicio
+        problema.salvaSementesCSV(registros)
 
     # Salvando resultados.
     problema.result["orders"] = solucao.pedidos
     problema.result["aisles"] = solucao.corredores
     problema.result["objective"] = solucao.objetivo
-    problema.result["time"] = solucao.tempo
+    problema.result["time"] = tempo
 
     problema.result["orders"].sort()
     problema.result["aisles"].sort()
 
     # Imprimindo e salvando no arquivo.
     problema.imprimeResultados()
+    print(f"Tempo de leitura do dataset: {problema.tempo_leitura}")
     problema.salvaResultadoCSV()
     problema.salvaResultadoTXT()
+    if perfil:
+        problema.salvaPerfilJSON(Metodos.perfil_instrumentacao())
 
 # Verificando argumentos e chamando a main.
 if __name__ == "__main__":
-    if len(sys.argv) < 6:
-        print("Uso correto: python3 main.py <dataset> <nome_arquivo_resultados> <heurística_construtiva_metaheurística> <heurística_refinamento> <semente_aleatoria>")
-        print("Heurísticas construtivas e metaheurísticas: 0 (híbrida), 1 (aleatória), 2 (gulosa), 3 (PSO discreto), 4 (FPA), 5 (ALNS)")
-        print("Heurísticas de refinamento: 0 (nenhuma), 1 (melhor_vizinhanca), 2 (refinamento_cluster_vns)")
-    else:
-        try:
-            seed = float(sys.argv[5])
-        except (IndexError, ValueError):
-            print("ERRO: Semente deve ser numérica.")
-            exit(1)
+    parser = argparse.ArgumentParser(description="Heurísticas e metaheurísticas para o problema de wave picking (SBPO 2025).")
+    parser.add_argument("dataset", help="Nome do dataset na pasta Datasets, sem o .txt.")
+    parser.add_argument("arquivo", help="Nome do arquivo em que os resultados serão salvos, sem a extensão.")
+    parser.add_argument("construtiva", help=f"Heurística construtiva ou metaheurística: 0 (híbrida), 1 (aleatória), 2 (gulosa), 3 (PSO discreto), 4 (FPA), 5 (ALNS), 6 (paramétrica, gulosa com poda pelos limites superiores), 7 (Dinkelbach, a partir da paramétrica), 8 (MILP exato com HiGHS, a partir da gulosa, limitado a {Metodos.TEMPO_LIMITE_MILP:g} s e a instâncias com até --maximo-variaveis pedidos + corredores).")
+    parser.add_argument("refinamento", help="Heurística de refinamento: 0 (nenhuma), 1 (melhor_vizinhanca), 2 (refinamento_cluster_vns).")
+    parser.add_argument("semente", type=float, help="Semente numérica para a aleatoriedade.")
+    parser.add_argument("--sementes", type=int, default=1, help="Quantidade de sementes independentes (semente, semente + 1, ...) executadas em paralelo. Apenas a melhor solução é salva.")
+    parser.add_argument("--processos", type=int, default=None, help="Quantidade máxima de processos usados pelas sementes (padrão: número de núcleos). Com uma única semente, divide a população do FPA ou executa uma cadeia do ALNS por processo (padrão: sequencial).")
+    parser.add_argument("--tempo", type=float, default=None, help="Tempo limite de relógio, em segundos. Os métodos param ao atingi-lo e retornam a melhor solução encontrada (padrão: sem limite).")
+    parser.add_argument("--fracao-construcao", type=float, default=0.5, help="Fração do tempo limite reservada para a heurística construtiva ou metaheurística quando há refinamento (padrão: 0.5).")
+    parser.add_argument("--perfil", action="store_true", help="Conta as chamadas e o tempo das funções mais chamadas e a taxa de aceitação dos operadores do ALNS, salvando o perfil em Resultados-csv/<arquivo>-perfil.json.")
+    parser.add_argument("--rastro", choices=["csv", "ndjson"], default=None, help="Salva a convergência do PSO, FPA, ALNS ou Dinkelbach (iteração, tempo, objetivo atual, melhor objetivo e inércia, p, temperatura ou lambda) em Resultados-csv/<arquivo>-rastro.<formato> (com --sementes, um arquivo por semente: <arquivo>-rastro-<semente>.<formato>).")
+    parser.add_argument("--maximo-variaveis", type=int, default=Metodos.MAXIMO_VARIAVEIS_MILP, help=f"Quantidade máxima de pedidos + corredores para o MILP exato (8); instâncias maiores usam apenas a gulosa (padrão: {Metodos.MAXIMO_VARIAVEIS_MILP}).")
+    args = parser.parse_args()
 
-        main(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4], seed)
\ No newline at end of file
+    main(args.dataset, args.arquivo, args.construtiva, args.refinamento, args.semente, args.sementes, args.processos, args.tempo, args.fracao_construcao, args.perfil, args.rastro, args.maximo_variaveis)
@@ -0,0 +1,67 @@
+import argparse
+import csv
+import json
+import matplotlib.pyplot as plt
+import os
+
+def le_rastro(caminho: str) -> list:
+    """
+    Função responsável por ler um rastro de convergência (csv ou ndjson, ver Metodos.Rastro).
+
+    Args:
+        caminho (str): Arquivo do rastro.
+
+    Returns:
+        linhas (List[dict]): Linhas do rastro, com os valores numéricos convertidos.
+    """
+
+    with open(caminho) as file:
+        if caminho.endswith((".ndjson", ".jsonl")):
+            return [json.loads(linha) for linha in file if linha.strip()]
+        return [{campo: valor if campo == "metodo" else float(valor) for campo, valor in linha.items()} for linha in csv.DictReader(file)]
+
+def plota(caminhos: list, eixo: str, log: bool, saida: str = None):
+    """
+    Função responsável por plotar o objetivo atual e o melhor objetivo de um ou mais rastros, com o parâmetro adaptativo em um segundo gráfico.
+
+    Args:
+        caminhos (List[str]): Arquivos dos rastros.
+        eixo (str): Campo do eixo x (iteracao ou tempo).
+        log (bool): Usa escala logarítmica no eixo do objetivo.
+        saida (str | None): Arquivo da imagem (None mostra o gráfico na tela).
+    """
+
+    figura, (objetivos, parametros) = plt.subplots(2, 1, sharex=True, figsize=(10, 7), height_ratios=(3, 1))
+    for caminho in caminhos:
+        linhas = le_rastro(caminho)
+        if not linhas:
+            continue
+        nome = f"{os.path.basename(caminho)} ({linhas[0]['metodo']})"
+        x = [linha[eixo] for linha in linhas]
+        objetivos.plot(x, [linha["objetivo"] for linha in linhas], alpha=0.6, label=f"{nome} atual")
+        objetivos.plot(x, [linha["melhor"] for linha in linhas], label=f"{nome} melhor")
+        parametros.plot(x, [linha["parametro"] for linha in linhas], label=nome)
+
+    if log:
+        objetivos.set_yscale("log")
+    objetivos.set_ylabel("objetivo")
+    objetivos.legend()
+    parametros.set_ylabel("inércia / p / temperatura / lambda")
+    parametros.set_xlabel(eixo)
+    figura.tight_layout()
+
+    if saida:
+        figura.savefig(saida)
+    else:
+        plt.show()
+
+# Verificando argumentos e chamando o plot.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plota os rastros de convergência salvos com a opção --rastro da main.py.")
+    parser.add_argument("rastros", nargs="+", help="Arquivos de rastro (.csv ou .ndjson).")
+    parser.add_argument("--eixo", choices=["iteracao", "tempo"], default="iteracao", help="Eixo x do gráfico (padrão: iteracao).")
+    parser.add_argument("--log", action="store_true", help="Usa escala logarítmica no eixo do objetivo.")
+    parser.add_argument("--saida", default=None, help="Arquivo da imagem (padrão: mostra o gráfico na tela).")
+    args = parser.parse_args()
+
+    plota(args.rastros, args.eixo, args.log, args.saida)
@@ -0,0 +1,14 @@
+import os
+import sys
+
+import pytest
+
+# Os testes importam os pacotes da raiz do repositório, como a main.py.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Metodos
+import Processa
+
+@pytest.fixture(scope="session", params=["instance_0020", "instance_0001"])
+def problema(request) -> Processa.Problema:
+    return Processa.Problema(request.param, "")
@@ -0,0 +1,30 @@
+import Metodos
+import pytest
+
+def objetivo_esperado(problema, solucao) -> float:
+    return Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores if solucao.qntCorredores else 0.0
+
+@pytest.mark.parametrize("destruidor", ["destruidor_aleatorio", "destruidor_bx_prod"])
+@pytest.mark.parametrize("reconstrutor", ["construtor_guloso", "construtor_hibrido", "construtor_aleatorio"])
+def test_objetivo_apos_destruir_e_reconstruir(problema, destruidor, reconstrutor):
+    Metodos.define_semente(1)
+    alns = Metodos.ALNS(problema, Metodos.gulosa(problema), 10, 0.999)
+    solucao = alns.sol_atual
+
+    getattr(alns, destruidor)(solucao)
+    assert solucao.objetivo == objetivo_esperado(problema, solucao)
+    assert Metodos.funcao_objetivo(problema, solucao.itensP, solucao.itensC) == Metodos.funcao_objetivo_incremental(problema, solucao)
+
+    getattr(alns, reconstrutor)(solucao)
+    assert solucao.objetivo == objetivo_esperado(problema, solucao)
+    if solucao.objetivo:
+        assert Metodos.valida_solucao(problema, solucao) == (True, "")
+
+def test_objetivo_da_solucao_atual_ao_longo_das_iteracoes(problema):
+    Metodos.define_semente(1)
+    alns = Metodos.ALNS(problema, Metodos.gulosa(problema), 10, 0.999)
+    for _ in range(30):
+        alns.itera(1)
+        assert alns.sol_atual.objetivo == objetivo_esperado(problema, alns.sol_atual)
+    assert Metodos.valida_solucao(problema, alns.sol_melhor) == (True, "")
+    assert alns.sol_melhor.objetivo >= alns.sol_atual.objetivo
@@ -0,0 +1,76 @@
+import Metodos
+from random import Random
+
+def solucao_cheia(problema) -> Metodos.Solucao:
+    # Gulosa mais metade dos corredores e os pedidos que couberem, para a remoção de corredores forçar a saída de pedidos.
+    solucao = Metodos.gulosa(problema)
+    for corredor in range(0, problema.a, 2):
+        Metodos.adiciona_corredor_reversivel(problema, solucao, corredor)
+    Metodos.adiciona_pedidos_reversivel(problema, solucao)
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+    return solucao
+
+def estado(solucao: Metodos.Solucao) -> tuple:
+    # Os dicionários esparsos são comparados sem as chaves zeradas, que valem o mesmo que as ausentes.
+    esparso = lambda itens: {item: qnt for item, qnt in itens.items() if qnt}
+    return (esparso(solucao.universoC), esparso(solucao.itensC), esparso(solucao.itensP), list(solucao.corredores), bytes(solucao.corredoresDisp), list(solucao.pedidos),
+            bytes(solucao.pedidosDisp), solucao.qntItens, solucao.qntCorredores, solucao.objetivo, list(solucao.faltantes), solucao.violados)
+
+def verifica(problema, solucao):
+    # As estruturas auxiliares correspondem às recalculadas do zero, e a solução é válida sempre que o objetivo é positivo.
+    assert solucao.violados == 0 and all(qnt >= 0 for qnt in solucao.universoC.values())
+    assert solucao.qntItens == sum(problema.tamanho_pedidos[solucao.pedidos])
+    assert list(solucao.faltantes) == list(Metodos.conta_faltantes(problema, solucao.itensC))
+    solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+    assert Metodos.funcao_objetivo(problema, solucao.itensP, solucao.itensC) == Metodos.funcao_objetivo_incremental(problema, solucao)
+    if solucao.objetivo:
+        assert Metodos.valida_solucao(problema, solucao) == (True, "")
+
+def test_remove_corredor_mantem_solucao_valida(problema):
+    base = solucao_cheia(problema)
+    for corredor in base.corredores[:30]:
+        solucao = base.clone()
+        Metodos.remove_corredor(problema, solucao, corredor)
+        assert not solucao.corredoresDisp[corredor]
+        verifica(problema, solucao)
+
+def test_troca_corredor_mantem_solucao_valida(problema):
+    base = solucao_cheia(problema)
+    livres = [corredor for corredor in range(problema.a) if not base.corredoresDisp[corredor]]
+    gerador = Random(0)
+    for corredor in base.corredores[:30]:
+        solucao = base.clone()
+        novo = gerador.choice(livres)
+        Metodos.troca_corredor(problema, solucao, novo, corredor)
+        assert solucao.corredoresDisp[novo] and not solucao.corredoresDisp[corredor]
+        verifica(problema, solucao)
+
+def test_remove_corredor_reversivel_equivale_ao_original(problema):
+    base = solucao_cheia(problema)
+    for corredor in base.corredores[:30]:
+        original, solucao = base.clone(), base.clone()
+        Metodos.remove_corredor(problema, original, corredor)
+        Metodos.remove_corredor_reversivel(problema, solucao, corredor)
+        assert estado(solucao) == estado(original)
+
+def test_desfaz_movimento_restaura_estado(problema):
+    solucao = solucao_cheia(problema)
+    gerador = Random(0)
+    for _ in range(100):
+        antes = estado(solucao)
+        movimento = Metodos.Movimento(solucao)
+        for _ in range(gerador.randint(1, 4)):
+            livres = [corredor for corredor in range(problema.a) if not solucao.corredoresDisp[corredor]]
+            sorteio = gerador.random()
+            if sorteio < 0.4:
+                Metodos.remove_corredor_reversivel(problema, solucao, gerador.choice(solucao.corredores), movimento)
+            elif sorteio < 0.7 and livres:
+                Metodos.troca_corredor_reversivel(problema, solucao, gerador.choice(livres), gerador.choice(solucao.corredores), movimento)
+            elif livres:
+                Metodos.adiciona_corredor_reversivel(problema, solucao, gerador.choice(livres), movimento)
+                Metodos.adiciona_pedidos_reversivel(problema, solucao, movimento)
+            solucao.objetivo = Metodos.funcao_objetivo_incremental(problema, solucao) / solucao.qntCorredores
+        verifica(problema, solucao)
+        Metodos.desfaz_movimento(problema, solucao, movimento)
+        assert estado(solucao) == antes
+        assert not movimento and not movimento.faltantes